@@ -10,6 +10,7 @@ Component design guidelines:
 import logging
 
 from homeassistant.core import split_entity_id
+from homeassistant.helpers.group import expand_entity_ids
 
 # mypy: allow-untyped-defs
 
@@ -22,7 +23,7 @@ def is_on(hass, entity_id=None):
     If there is no entity id given we will check all.
     """
     if entity_id:
-        entity_ids = hass.components.group.expand_entity_ids([entity_id])
+        entity_ids = expand_entity_ids(hass, [entity_id])
     else:
         entity_ids = hass.states.entity_ids()
 
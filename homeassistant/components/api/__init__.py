@@ -34,7 +34,7 @@ from homeassistant.const import (
 import homeassistant.core as ha
 from homeassistant.exceptions import ServiceNotFound, TemplateError, Unauthorized
 from homeassistant.helpers import template
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_array
 from homeassistant.helpers.network import NoURLAvailableError, get_url
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.state import AsyncTrackStates
@@ -230,7 +230,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            body = json_array(state.as_json() for state in states)
+        except (ValueError, TypeError):
+            # Fall back to the regular path so the error gets logged
+            return self.json(states)
+        return self.json_encoded(body.encode("UTF-8"))
 
 
 class APIEntityStateView(HomeAssistantView):
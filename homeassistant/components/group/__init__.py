@@ -7,7 +7,6 @@ from typing import Any, Dict, Iterable, List, Optional, Set, cast
 
 import voluptuous as vol
 
-from homeassistant import core as ha
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
     ATTR_ENTITY_ID,
@@ -16,8 +15,6 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_ICON,
     CONF_NAME,
-    ENTITY_MATCH_ALL,
-    ENTITY_MATCH_NONE,
     EVENT_HOMEASSISTANT_START,
     SERVICE_RELOAD,
     STATE_OFF,
@@ -28,6 +25,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.event import async_track_state_change_event
+import homeassistant.helpers.group as group_helper
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
@@ -133,40 +131,7 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
 
     Async friendly.
     """
-    found_ids: List[str] = []
-    for entity_id in entity_ids:
-        if not isinstance(entity_id, str) or entity_id in (
-            ENTITY_MATCH_NONE,
-            ENTITY_MATCH_ALL,
-        ):
-            continue
-
-        entity_id = entity_id.lower()
-
-        try:
-            # If entity_id points at a group, expand it
-            domain, _ = ha.split_entity_id(entity_id)
-
-            if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id
-                    for ent_id in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids
-                )
-
-            else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
-
-        except AttributeError:
-            # Raised by split_entity_id if entity_id is not a string
-            pass
-
-    return found_ids
+    return group_helper.expand_entity_ids(hass, entity_ids)
 
 
 @bind_hass
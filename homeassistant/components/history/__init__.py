@@ -4,6 +4,7 @@ from datetime import datetime as dt, timedelta
 from itertools import groupby
 import json
 import logging
+import math
 import time
 from typing import Iterable, Optional, cast
 
@@ -12,9 +13,10 @@ from sqlalchemy import and_, bindparam, func, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
 
-from homeassistant.components import recorder
+from homeassistant.components import recorder, websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -79,14 +81,34 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    # States recorded before the attributes were moved to
+    # the shared state_attributes table have them inline
+    func.coalesce(StateAttributes.shared_attrs, States.attributes).label("attributes"),
     States.last_changed,
     States.last_updated,
 ]
 
+QUERY_STATE_COLUMNS = [
+    States.entity_id,
+    States.state,
+    States.last_updated,
+]
+
 HISTORY_BAKERY = "history_bakery"
 
 
+def _query_states(session):
+    """Return a query for QUERY_STATES with the shared attributes joined in."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
+
+def _query_state_columns(session):
+    """Return a query for QUERY_STATE_COLUMNS."""
+    return session.query(*QUERY_STATE_COLUMNS)
+
+
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
     with session_scope(hass=hass) as session:
@@ -113,9 +135,7 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
     if significant_changes_only:
         baked_query += lambda q: q.filter(
@@ -167,9 +187,7 @@ def _get_significant_states(
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -182,7 +200,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -203,13 +223,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -255,9 +275,24 @@ def _get_states_with_session(
     hass, session, utc_point_in_time, entity_ids=None, run=None, filters=None
 ):
     """Return the states at a specific point in time."""
+    return [
+        LazyState(row)
+        for row in _get_state_rows_with_session(
+            hass, session, utc_point_in_time, entity_ids, run, filters, _query_states
+        )
+    ]
+
+
+def _get_state_rows_with_session(
+    hass, session, utc_point_in_time, entity_ids, run, filters, query_states
+):
+    """Return the rows of the states at a specific point in time.
+
+    query_states returns the query selecting the columns of the rows.
+    """
     if entity_ids and len(entity_ids) == 1:
-        return _get_single_entity_states_with_session(
-            hass, session, utc_point_in_time, entity_ids[0]
+        return _get_single_entity_state_rows_with_session(
+            hass, session, utc_point_in_time, entity_ids[0], query_states
         )
 
     if run is None:
@@ -270,7 +305,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -312,15 +347,15 @@ def _get_states_with_session(
         if filters:
             query = filters.apply(query)
 
-    return [LazyState(row) for row in execute(query)]
+    return execute(query)
 
 
-def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
+def _get_single_entity_state_rows_with_session(
+    hass, session, utc_point_in_time, entity_id, query_states
+):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -332,7 +367,7 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
         utc_point_in_time=utc_point_in_time, entity_id=entity_id
     )
 
-    return [LazyState(row) for row in execute(query)]
+    return execute(query)
 
 
 def _sorted_states_to_json(
@@ -424,6 +459,126 @@ def _sorted_states_to_json(
     return {key: val for key, val in result.items() if val}
 
 
+def get_state_columns_during_period(
+    hass, start_time, end_time, entity_ids, max_points=None
+):
+    """Return the state changes of entities as parallel arrays.
+
+    This avoids building State objects and JSON dicts for every row, which
+    is what graphs need for long periods of frequently updating sensors.
+
+    The result is {entity_id: {"timestamps": [...], "states": [...]}} where
+    timestamps are UTC epoch floats and states are floats if numeric. When
+    max_points is given, entities with more numeric states are downsampled
+    into max_points time buckets of {"timestamps", "min", "max", "mean"}
+    and their non numeric states are left out.
+    """
+    timer_start = time.perf_counter()
+    start_timestamp = start_time.timestamp()
+    columns = {entity_id: ([], []) for entity_id in entity_ids}
+
+    with session_scope(hass=hass) as session:
+        run = recorder.run_information_from_instance(hass, start_time)
+        # Only the entity ID and state are needed of the states at the start
+        for row in _get_state_rows_with_session(
+            hass, session, start_time, entity_ids, run, None, _query_state_columns
+        ):
+            timestamps, states = columns[row.entity_id]
+            timestamps.append(start_timestamp)
+            states.append(_state_column_value(row.state))
+
+        baked_query = hass.data[HISTORY_BAKERY](
+            lambda session: session.query(*QUERY_STATE_COLUMNS)
+        )
+        baked_query += lambda q: q.filter(
+            (States.last_changed == States.last_updated)
+            & (States.last_updated > bindparam("start_time"))
+            & (States.last_updated < bindparam("end_time"))
+            & States.entity_id.in_(bindparam("entity_ids", expanding=True))
+        )
+        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+
+        rows = execute(
+            baked_query(session).params(
+                start_time=start_time, end_time=end_time, entity_ids=entity_ids
+            )
+        )
+
+    # Called in a tight loop so cache the functions here
+    _process_timestamp = process_timestamp
+    _state_value = _state_column_value
+
+    for ent_id, group in groupby(rows, lambda row: row.entity_id):
+        timestamps, states = columns[ent_id]
+        for row in group:
+            timestamps.append(_process_timestamp(row.last_updated).timestamp())
+            states.append(_state_value(row.state))
+
+    result = {}
+    for entity_id, (timestamps, states) in columns.items():
+        if not timestamps:
+            continue
+        if max_points is not None and len(timestamps) > max_points:
+            downsampled = _downsample_state_columns(
+                timestamps, states, start_timestamp, end_time.timestamp(), max_points
+            )
+            if downsampled is not None:
+                result[entity_id] = downsampled
+                continue
+        result[entity_id] = {"timestamps": timestamps, "states": states}
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_state_columns_during_period took %fs", elapsed)
+
+    return result
+
+
+def _state_column_value(state):
+    """Return the state as float if it is numeric."""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return state
+    # NaN and infinity can not be represented in JSON
+    return value if math.isfinite(value) else state
+
+
+def _downsample_state_columns(timestamps, states, start_ts, end_ts, max_points):
+    """Aggregate numeric states into max_points buckets of equal duration.
+
+    Returns None if there are no numeric states.
+    """
+    bucket_size = (end_ts - start_ts) / max_points
+    buckets = {}
+    for timestamp, state in zip(timestamps, states):
+        if isinstance(state, str):
+            continue
+        index = min(max(int((timestamp - start_ts) / bucket_size), 0), max_points - 1)
+        bucket = buckets.get(index)
+        if bucket is None:
+            buckets[index] = [state, state, state, 1]
+            continue
+        if state < bucket[0]:
+            bucket[0] = state
+        elif state > bucket[1]:
+            bucket[1] = state
+        bucket[2] += state
+        bucket[3] += 1
+
+    if not buckets:
+        return None
+
+    downsampled = {"timestamps": [], "min": [], "max": [], "mean": []}
+    for index in sorted(buckets):
+        minimum, maximum, total, count = buckets[index]
+        downsampled["timestamps"].append(start_ts + index * bucket_size)
+        downsampled["min"].append(minimum)
+        downsampled["max"].append(maximum)
+        downsampled["mean"].append(total / count)
+    return downsampled
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
@@ -441,6 +596,7 @@ async def async_setup(hass, config):
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    hass.components.websocket_api.async_register_command(ws_get_columns_during_period)
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
     )
@@ -448,6 +604,55 @@ async def async_setup(hass, config):
     return True
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/columns_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Required("entity_ids"): vol.All(cv.ensure_list, [cv.entity_id]),
+        vol.Optional("max_points"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+@websocket_api.async_response
+async def ws_get_columns_during_period(hass, connection, msg):
+    """Handle history columns during period websocket command."""
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_INVALID_FORMAT, "Invalid start_time"
+        )
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    end_time_str = msg.get("end_time")
+    if end_time_str:
+        end_time = dt_util.parse_datetime(end_time_str)
+        if end_time is None:
+            connection.send_error(
+                msg["id"], websocket_api.const.ERR_INVALID_FORMAT, "Invalid end_time"
+            )
+            return
+        end_time = dt_util.as_utc(end_time)
+    else:
+        end_time = start_time + timedelta(days=1)
+
+    if start_time >= end_time:
+        connection.send_result(msg["id"], {})
+        return
+
+    connection.send_result(
+        msg["id"],
+        await hass.async_add_executor_job(
+            get_state_columns_during_period,
+            hass,
+            start_time,
+            end_time,
+            msg["entity_ids"],
+            msg.get("max_points"),
+        ),
+    )
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -687,8 +892,6 @@ class LazyState(State):
 
     __slots__ = [
         "_row",
-        "entity_id",
-        "state",
         "_attributes",
         "_last_changed",
         "_last_updated",
@@ -704,6 +907,8 @@ class LazyState(State):
         self._last_changed = None
         self._last_updated = None
         self._context = None
+        self._domain = None
+        self._as_json = None
 
     @property  # type: ignore
     def attributes(self):
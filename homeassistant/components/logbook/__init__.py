@@ -1,19 +1,26 @@
 """Event parser and human readable log generator."""
+import asyncio
+from collections import OrderedDict
 from datetime import timedelta
-from itertools import groupby
+from itertools import groupby, islice
 import json
+import logging
 import re
+import threading
 
+from aiohttp import web
 import sqlalchemy
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -26,6 +33,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    CONTENT_TYPE_JSON,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -44,7 +52,9 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.json import json_bytes
 from homeassistant.loader import bind_hass
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 ENTITY_ID_JSON_TEMPLATE = '"entity_id": "{}"'
@@ -52,6 +62,8 @@ ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": "([^"]+)"')
 DOMAIN_JSON_EXTRACT = re.compile('"domain": "([^"]+)"')
 ICON_JSON_EXTRACT = re.compile('"icon": "([^"]+)"')
 
+_LOGGER = logging.getLogger(__name__)
+
 ATTR_MESSAGE = "message"
 
 CONTINUOUS_DOMAINS = ["proximity", "sensor"]
@@ -60,6 +72,16 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+# Number of logbook entries serialized and written per chunk
+# when the response is streamed
+STREAM_PAGE_SIZE = 500
+
+# Events are only looked up as the context of later events this long
+# after they were fired, it must cover the GROUP_BY_MINUTES buffering
+CONTEXT_LOOKUP_WINDOW = timedelta(hours=1)
+
+DATA_FILTERS = "logbook_filters"
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
@@ -159,7 +181,9 @@ async def async_setup(hass, config):
         filters = None
         entities_filter = None
 
+    hass.data[DATA_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    hass.components.websocket_api.async_register_command(ws_get_events)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -179,6 +203,87 @@ async def _process_logbook_platform(hass, domain, platform):
     platform.async_describe_events(hass, _async_describe_event)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/get_events",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): vol.All(cv.ensure_list, [cv.entity_id]),
+        vol.Optional("entity_matches_only", default=False): bool,
+        vol.Optional("page_size", default=STREAM_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+    }
+)
+@websocket_api.async_response
+async def ws_get_events(hass, connection, msg):
+    """Handle logbook get events websocket command.
+
+    After the result, the entries are sent as event messages of up to
+    page_size entries. The last page has done set. Unsubscribing stops
+    sending pages.
+    """
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time is None:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_INVALID_FORMAT, "Invalid start_time"
+        )
+        return
+    start_time = dt_util.as_utc(start_time)
+
+    end_time_str = msg.get("end_time")
+    if end_time_str:
+        end_time = dt_util.parse_datetime(end_time_str)
+        if end_time is None:
+            connection.send_error(
+                msg["id"], websocket_api.const.ERR_INVALID_FORMAT, "Invalid end_time"
+            )
+            return
+        end_time = dt_util.as_utc(end_time)
+    else:
+        end_time = start_time + timedelta(days=1)
+
+    filters, entities_filter = hass.data[DATA_FILTERS]
+    page_size = msg["page_size"]
+    cancelled = threading.Event()
+
+    def send_pages():
+        """Fetch events and send them page by page."""
+        entries = _iter_events(
+            hass,
+            start_time,
+            end_time,
+            msg.get("entity_ids"),
+            filters,
+            entities_filter,
+            msg["entity_matches_only"],
+        )
+        try:
+            page = list(islice(entries, page_size))
+            while not cancelled.is_set():
+                next_page = list(islice(entries, page_size))
+                message = websocket_api.messages.message_to_json(
+                    websocket_api.event_message(
+                        msg["id"], {"events": page, "done": not next_page}
+                    )
+                )
+                run_callback_threadsafe(
+                    hass.loop, connection.send_message, message
+                ).result()
+                if not next_page:
+                    break
+                page = next_page
+        finally:
+            entries.close()
+
+    connection.subscriptions[msg["id"]] = cancelled.set
+    connection.send_result(msg["id"])
+    try:
+        await hass.async_add_executor_job(send_pages)
+    finally:
+        connection.subscriptions.pop(msg["id"], None)
+
+
 class LogbookView(HomeAssistantView):
     """Handle logbook view requests."""
 
@@ -232,6 +337,16 @@ class LogbookView(HomeAssistantView):
 
         entity_matches_only = "entity_matches_only" in request.query
 
+        if "stream" in request.query:
+            return await self._stream_events(
+                request,
+                hass,
+                start_day,
+                end_day,
+                entity_ids,
+                entity_matches_only,
+            )
+
         def json_events():
             """Fetch events and generate JSON."""
             return self.json(
@@ -248,6 +363,68 @@ class LogbookView(HomeAssistantView):
 
         return await hass.async_add_executor_job(json_events)
 
+    async def _stream_events(
+        self, request, hass, start_day, end_day, entity_ids, entity_matches_only
+    ):
+        """Stream logbook entries as a chunked JSON array.
+
+        Entries are fetched, humanified and serialized one page at a time,
+        so memory use is bounded by STREAM_PAGE_SIZE instead of the period.
+        """
+        response = web.StreamResponse(headers={"Content-Type": CONTENT_TYPE_JSON})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+
+        def write(data):
+            """Write a chunk from the executor, waiting for it to be sent."""
+            asyncio.run_coroutine_threadsafe(response.write(data), hass.loop).result()
+
+        def stream_events():
+            """Fetch events and write them out page by page."""
+            _write_json_pages(
+                _iter_events(
+                    hass,
+                    start_day,
+                    end_day,
+                    entity_ids,
+                    self.filters,
+                    self.entities_filter,
+                    entity_matches_only,
+                ),
+                write,
+                STREAM_PAGE_SIZE,
+            )
+
+        try:
+            await hass.async_add_executor_job(stream_events)
+        except ConnectionResetError:
+            _LOGGER.debug("Client disconnected while streaming the logbook")
+            return response
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error streaming the logbook")
+            # The status is already sent, so close the connection without
+            # ending the body to show the client the entries are incomplete
+            response.force_close()
+            request.transport.close()
+            return response
+
+        await response.write_eof()
+        return response
+
+
+def _write_json_pages(entries, write, page_size):
+    """Write entries as a JSON array, serializing page_size entries at a time."""
+    entries = iter(entries)
+    separator = b"["
+    while True:
+        page = list(islice(entries, page_size))
+        if not page:
+            break
+        # Drop the brackets of the encoded page to join it to the array
+        write(separator + json_bytes(page)[1:-1])
+        separator = b","
+    write(b"[]" if separator == b"[" else b"]")
+
 
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
@@ -415,14 +592,50 @@ def _get_events(
     entity_matches_only=False,
 ):
     """Get events for a period of time."""
+    return list(
+        _iter_events(
+            hass,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+        )
+    )
+
+
+def _iter_events(
+    hass,
+    start_day,
+    end_day,
+    entity_ids=None,
+    filters=None,
+    entities_filter=None,
+    entity_matches_only=False,
+):
+    """Yield humanified events for a period of time.
+
+    The database session stays open until the generator is exhausted or closed.
+    """
     entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
+    # Oldest first, as the events are queried in the order they were fired
+    context_lookup = OrderedDict()
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
         for row in query.yield_per(1000):
             event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
+            # Forget the contexts too old to be looked up so memory use
+            # does not grow with the period
+            lookup_after = row.time_fired - CONTEXT_LOOKUP_WINDOW
+            while (
+                context_lookup
+                and next(iter(context_lookup.values()))._row.time_fired < lookup_after
+            ):
+                context_lookup.popitem(last=False)
+            if event.context_id is not None:
+                context_lookup.setdefault(event.context_id, event)
             if event.event_type == EVENT_CALL_SERVICE:
                 continue
             if event.event_type == EVENT_STATE_CHANGED or _keep_event(
@@ -468,8 +681,8 @@ def _get_events(
 
         query = query.order_by(Events.time_fired)
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+        yield from humanify(
+            hass, yield_events(query), entity_attr_cache, context_lookup
         )
 
 
@@ -479,10 +692,16 @@ def _generate_events_query(session):
         States.state,
         States.entity_id,
         States.domain,
-        States.attributes,
+        _state_attributes().label("attributes"),
     )
 
 
+def _state_attributes():
+    # States recorded before the attributes were moved to
+    # the shared state_attributes table have them inline
+    return sqlalchemy.func.coalesce(StateAttributes.shared_attrs, States.attributes)
+
+
 def _generate_events_query_without_states(session):
     return session.query(
         *EVENT_COLUMNS,
@@ -498,6 +717,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -512,6 +734,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -541,7 +766,7 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(_state_attributes().contains(UNIT_OF_MEASUREMENT_JSON)),
     )
 
 
@@ -1,14 +1,17 @@
 """Support for MQTT message handling."""
 import asyncio
-from functools import lru_cache, partial, wraps
+from collections import deque
+from datetime import datetime
+from functools import partial, wraps
 import inspect
 from itertools import groupby
 import logging
-from operator import attrgetter
+from operator import attrgetter, itemgetter
 import os
 import ssl
+import threading
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 import uuid
 
 import attr
@@ -82,6 +85,7 @@ CONF_CLIENT_KEY = "client_key"
 CONF_CLIENT_CERT = "client_cert"
 CONF_TLS_INSECURE = "tls_insecure"
 CONF_TLS_VERSION = "tls_version"
+CONF_MESSAGE_BATCH_SIZE = "message_batch_size"
 
 CONF_COMMAND_TOPIC = "command_topic"
 CONF_TOPIC = "topic"
@@ -92,6 +96,7 @@ DEFAULT_PORT = 1883
 DEFAULT_KEEPALIVE = 60
 DEFAULT_PROTOCOL = PROTOCOL_311
 DEFAULT_TLS_PROTOCOL = "auto"
+DEFAULT_MESSAGE_BATCH_SIZE = 100
 
 ATTR_PAYLOAD_TEMPLATE = "payload_template"
 
@@ -104,6 +109,10 @@ CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 DISCOVERY_COOLDOWN = 2
 TIMEOUT_ACK = 10
 
+# Number of received messages waiting to be handled
+# at which a warning about the backlog is logged
+PENDING_MESSAGES_WARNING = 10000
+
 PLATFORMS = [
     "alarm_control_panel",
     "binary_sensor",
@@ -182,6 +191,9 @@ CONFIG_SCHEMA = vol.Schema(
                         CONF_BIRTH_MESSAGE, default=DEFAULT_BIRTH
                     ): MQTT_WILL_BIRTH_SCHEMA,
                     vol.Optional(CONF_DISCOVERY, default=DEFAULT_DISCOVERY): cv.boolean,
+                    vol.Optional(
+                        CONF_MESSAGE_BATCH_SIZE, default=DEFAULT_MESSAGE_BATCH_SIZE
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
                     # discovery_prefix must be a valid publish topic because if no
                     # state topic is specified, it will be created with the given prefix.
                     vol.Optional(
@@ -529,12 +541,100 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str = attr.ib(default="utf-8")
 
 
+class _TopicNode:
+    """Node in a SubscriptionTrie for a single topic level."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, "_TopicNode"] = {}
+        # Subscriptions with the sequence number they were added with
+        self.subscriptions: List[Tuple[int, Subscription]] = []
+
+
+class SubscriptionTrie:
+    """Index subscriptions by topic level to match topics against them.
+
+    Matching follows the MQTT wildcard rules: ``+`` matches a single level,
+    ``#`` matches the remaining levels, including none, and wildcards in the
+    first level do not match topics starting with ``$``. The cost of a lookup
+    depends on the depth of the topic, not on the number of subscriptions.
+    Matching subscriptions are returned in the order they were added.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root = _TopicNode()
+        self._added = 0
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription."""
+        node = self._root
+        for level in subscription.topic.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.subscriptions.append((self._added, subscription))
+        self._added += 1
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription, pruning nodes left without subscriptions."""
+        path = [self._root]
+        levels = subscription.topic.split("/")
+        for level in levels:
+            node = path[-1].children.get(level)
+            if node is None:
+                raise KeyError(subscription.topic)
+            path.append(node)
+
+        subscriptions = path[-1].subscriptions
+        for idx, (_, added) in enumerate(subscriptions):
+            if added == subscription:
+                del subscriptions[idx]
+                break
+        else:
+            raise KeyError(subscription.topic)
+
+        for level, parent, node in zip(
+            reversed(levels), reversed(path[:-1]), reversed(path)
+        ):
+            if node.subscriptions or node.children:
+                break
+            del parent.children[level]
+
+    def matches(self, topic: str) -> List[Subscription]:
+        """Return the subscriptions matching a topic."""
+        levels = topic.split("/")
+        wildcards = not topic.startswith("$")
+        matches: List[Tuple[int, Subscription]] = []
+        num_levels = len(levels)
+
+        def match(node: _TopicNode, index: int) -> None:
+            children = node.children
+            if index == num_levels:
+                matches.extend(node.subscriptions)
+            else:
+                child = children.get(levels[index])
+                if child is not None:
+                    match(child, index + 1)
+                if "+" in children and (wildcards or index > 0):
+                    match(children["+"], index + 1)
+            if "#" in children and (wildcards or index > 0):
+                matches.extend(children["#"].subscriptions)
+
+        match(self._root, 0)
+        if len(matches) > 1:
+            matches.sort(key=itemgetter(0))
+        return [subscription for _, subscription in matches]
+
+
 class MQTT:
     """Home Assistant MQTT client."""
 
@@ -553,6 +653,7 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self._subscription_trie = SubscriptionTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -561,6 +662,17 @@ class MQTT:
 
         self._pending_operations = {}
 
+        # Messages are buffered by the paho thread and handled in batches
+        # in the event loop, so bursts don't need a loop wakeup per message
+        self._pending_messages: Deque[Tuple[Any, datetime]] = deque()
+        self._pending_messages_lock = threading.Lock()
+        self._drain_scheduled = False
+        self._backlog_warned = False
+        self._messages_received = 0
+        self._messages_handled = 0
+        self._message_batches = 0
+        self._max_pending_messages = 0
+
         if self.hass.state == CoreState.running:
             self._ha_started.set()
         else:
@@ -739,11 +851,9 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        self._subscription_trie.add(subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -756,7 +866,7 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
+            self._subscription_trie.remove(subscription)
 
             if any(other.topic == topic for other in self.subscriptions):
                 # Other subscriptions on topic remaining - don't unsubscribe.
@@ -845,29 +955,94 @@ class MQTT:
                 publish_birth_message(birth_message), self.hass.loop
             )
 
+    def message_stats(self) -> Dict[str, int]:
+        """Return counters about received messages and the backlog."""
+        return {
+            "received": self._messages_received,
+            "handled": self._messages_handled,
+            "batches": self._message_batches,
+            "pending": len(self._pending_messages),
+            "max_pending": self._max_pending_messages,
+        }
+
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
         """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        timestamp = dt_util.utcnow()
+        warn_backlog = False
+        with self._pending_messages_lock:
+            self._pending_messages.append((msg, timestamp))
+            self._messages_received += 1
+            pending = len(self._pending_messages)
+            if pending > self._max_pending_messages:
+                self._max_pending_messages = pending
+            if pending >= PENDING_MESSAGES_WARNING and not self._backlog_warned:
+                self._backlog_warned = warn_backlog = True
+            schedule_drain = not self._drain_scheduled
+            self._drain_scheduled = True
+
+        if warn_backlog:
+            _LOGGER.warning(
+                "%s MQTT messages are waiting to be handled, "
+                "the event loop is not keeping up with the broker",
+                pending,
+            )
+        if schedule_drain:
+            self.hass.loop.call_soon_threadsafe(self._async_drain_messages)
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+    @callback
+    def _async_drain_messages(self) -> None:
+        """Handle a batch of buffered messages.
+
+        If more messages are waiting, the next batch is handled in a later
+        iteration of the event loop so other work is not starved.
+        """
+        batch_size = self.conf.get(CONF_MESSAGE_BATCH_SIZE, DEFAULT_MESSAGE_BATCH_SIZE)
+        with self._pending_messages_lock:
+            pending_messages = self._pending_messages
+            msgs = [
+                pending_messages.popleft()
+                for _ in range(min(batch_size, len(pending_messages)))
+            ]
+            remaining = len(pending_messages)
+            if not remaining:
+                self._drain_scheduled = False
+                self._backlog_warned = False
+
+        self._message_batches += 1
+        try:
+            self._mqtt_handle_messages(msgs)
+        finally:
+            if remaining:
+                self.hass.loop.call_soon(self._async_drain_messages)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
-        _LOGGER.debug(
-            "Received message on %s%s: %s",
-            msg.topic,
-            " (retained)" if msg.retain else "",
-            msg.payload[0:8192],
-        )
-        timestamp = dt_util.utcnow()
+        self._mqtt_handle_messages([(msg, dt_util.utcnow())])
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+    @callback
+    def _mqtt_handle_messages(self, msgs) -> None:
+        """Handle messages with the time they were received."""
+        debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+
+        for msg, timestamp in msgs:
+            if debug_enabled:
+                _LOGGER.debug(
+                    "Received message on %s%s: %s",
+                    msg.topic,
+                    " (retained)" if msg.retain else "",
+                    msg.payload[0:8192],
+                )
+            try:
+                self._mqtt_dispatch_message(msg, timestamp)
+            except Exception:  # pylint: disable=broad-except
+                # Keep handling the rest of the batch
+                _LOGGER.exception("Error handling MQTT message on %s", msg.topic)
+
+        self._messages_handled += len(msgs)
+
+    @callback
+    def _mqtt_dispatch_message(self, msg, timestamp) -> None:
+        subscriptions = self._subscription_trie.matches(msg.topic)
 
         for subscription in subscriptions:
 
@@ -967,16 +1142,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/debug_info", vol.Required("device_id"): str}
 )
@@ -985,6 +1150,7 @@ async def websocket_mqtt_info(hass, connection, msg):
     """Get MQTT debug info for device."""
     device_id = msg["device_id"]
     mqtt_info = await debug_info.info_for_device(hass, device_id)
+    mqtt_info["message_stats"] = hass.data[DATA_MQTT].message_stats()
 
     connection.send_result(msg["id"], mqtt_info)
 
@@ -1,6 +1,6 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime
 import logging
@@ -25,7 +25,7 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
@@ -37,7 +37,7 @@ import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import (
     dburl_to_path,
     move_away_broken_database,
@@ -65,12 +65,20 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_BATCH_SIZE = 0
+DEFAULT_BATCH_MAX_LATENCY = 1
 KEEPALIVE_TIME = 30
 
 # Controls how often we clean up
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# The number of most recently used state attributes
+# to keep the attributes_id of in memory
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+# Rows per multi-row insert that returns the assigned primary keys
+INSERT_RETURNING_CHUNK_SIZE = 500
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -79,6 +87,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BATCH_SIZE = "batch_size"
+CONF_BATCH_MAX_LATENCY = "batch_max_latency"
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -103,6 +113,12 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_BATCH_SIZE, default=DEFAULT_BATCH_SIZE
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_BATCH_MAX_LATENCY, default=DEFAULT_BATCH_MAX_LATENCY
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -167,6 +183,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    batch_size = conf[CONF_BATCH_SIZE]
+    batch_max_latency = conf[CONF_BATCH_MAX_LATENCY]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
@@ -181,6 +199,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         auto_purge=auto_purge,
         keep_days=keep_days,
         commit_interval=commit_interval,
+        batch_size=batch_size,
+        batch_max_latency=batch_max_latency,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
@@ -218,6 +238,8 @@ class Recorder(threading.Thread):
         auto_purge: bool,
         keep_days: int,
         commit_interval: int,
+        batch_size: int,
+        batch_max_latency: float,
         uri: str,
         db_max_retries: int,
         db_retry_wait: int,
@@ -232,6 +254,8 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
+        self.batch_size = batch_size
+        self.batch_max_latency = batch_max_latency
         self.queue: Any = queue.SimpleQueue()
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -251,6 +275,9 @@ class Recorder(threading.Thread):
         self._keepalive_count = 0
         self._old_states = {}
         self._pending_expunge = []
+        self._old_state_ids = {}
+        self._state_attributes_ids = OrderedDict()
+        self._pending_state_attributes = {}
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = None
@@ -345,13 +372,23 @@ class Recorder(threading.Thread):
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed. This reduces the disk io.
+        pending_events = []
         while True:
-            event = self.queue.get()
+            if pending_events:
+                event = pending_events.pop()
+            else:
+                event = self.queue.get()
 
             if event is None:
                 self._shutdown()
                 return
 
+            if self.batch_size and self._is_batchable(event):
+                self._process_event_batch(
+                    self._collect_event_batch(event, pending_events)
+                )
+                continue
+
             self._process_one_event(event)
 
     def _setup_recorder(self) -> bool:
@@ -394,9 +431,14 @@ class Recorder(threading.Thread):
     def _process_one_event(self, event):
         """Process one event."""
         if isinstance(event, PurgeTask):
+            # Make sure all states referencing shared attributes are
+            # visible to the purge before unused attributes are deleted
+            self._commit_event_session_or_recover()
             # Schedule a new purge task if this one didn't finish
             if not purge.purge_old_data(self, event.keep_days, event.repack):
                 self.queue.put(PurgeTask(event.keep_days, event.repack))
+            # The purge may have removed state attributes that are cached
+            self._state_attributes_ids.clear()
             return
         if isinstance(event, WaitTask):
             self._queue_watch.set()
@@ -431,7 +473,25 @@ class Recorder(threading.Thread):
         if event.event_type == EVENT_STATE_CHANGED:
             try:
                 dbstate = States.from_event(event)
+                shared_attrs = StateAttributes.shared_attrs_from_event(event)
                 has_new_state = event.data.get("new_state")
+                if shared_attrs in self._pending_state_attributes:
+                    dbstate.state_attributes = self._pending_state_attributes[
+                        shared_attrs
+                    ]
+                else:
+                    attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+                    attributes_id = self._get_attributes_id(shared_attrs, attr_hash)
+                    if attributes_id is not None:
+                        dbstate.attributes_id = attributes_id
+                    else:
+                        dbstate_attributes = StateAttributes(
+                            hash=attr_hash, shared_attrs=shared_attrs
+                        )
+                        dbstate.state_attributes = dbstate_attributes
+                        self._pending_state_attributes[
+                            shared_attrs
+                        ] = dbstate_attributes
                 if dbstate.entity_id in self._old_states:
                     old_state = self._old_states.pop(dbstate.entity_id)
                     if old_state.state_id:
@@ -460,6 +520,224 @@ class Recorder(threading.Thread):
         if not self.commit_interval:
             self._commit_event_session_or_recover()
 
+    @staticmethod
+    def _is_batchable(event):
+        """Return if a queue item can be written as part of a batch."""
+        return isinstance(event, Event) and event.event_type != EVENT_TIME_CHANGED
+
+    def _collect_event_batch(self, event, pending_events):
+        """Collect events from the queue until the batch is full.
+
+        Stops early once batch_max_latency has passed since the first event
+        of the batch was taken from the queue. An item taken from the queue
+        that can not be batched ends the batch and is added to pending_events.
+        """
+        batch = [event]
+        deadline = time.monotonic() + self.batch_max_latency
+
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                event = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if not self._is_batchable(event):
+                pending_events.append(event)
+                break
+            batch.append(event)
+
+        return batch
+
+    def _process_event_batch(self, events):
+        """Write a batch of events with multi-row inserts.
+
+        The database assigns the primary keys. They are fetched with
+        RETURNING where the database supports it, and per row otherwise, so
+        the states can reference their event, their attributes and the
+        previous state of the same entity in the batch.
+        """
+        event_rows = []
+        # Per event row, the state row and its shared attributes or None
+        state_entries = []
+
+        for event in events:
+            try:
+                if event.event_type == EVENT_STATE_CHANGED:
+                    event_row = Events.row_from_event(event, event_data="{}")
+                else:
+                    event_row = Events.row_from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                continue
+            except Exception as err:  # pylint: disable=broad-except
+                # Must catch the exception to prevent the loop from collapsing
+                _LOGGER.exception("Error adding event: %s", err)
+                continue
+
+            event_row["created"] = event.time_fired
+            event_rows.append(event_row)
+
+            if event.event_type != EVENT_STATE_CHANGED:
+                state_entries.append(None)
+                continue
+
+            try:
+                state_row = States.row_from_event(event)
+                shared_attrs = StateAttributes.shared_attrs_from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s",
+                    event.data.get("new_state"),
+                )
+                state_entries.append(None)
+                continue
+            except Exception as err:  # pylint: disable=broad-except
+                # Must catch the exception to prevent the loop from collapsing
+                _LOGGER.exception("Error adding state change: %s", err)
+                state_entries.append(None)
+                continue
+
+            state_row["created"] = event.time_fired
+            if not event.data.get("new_state"):
+                state_row["state"] = None
+            state_entries.append((state_row, shared_attrs))
+
+        try:
+            self._insert_event_batch(event_rows, state_entries)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error saving event batch: %s", err)
+            self._reopen_event_session()
+            return
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_recover()
+
+    def _insert_event_batch(self, event_rows, state_entries):
+        """Insert the rows of a batch of events and their states."""
+        if not any(state_entries):
+            if event_rows:
+                self.event_session.execute(Events.__table__.insert(), event_rows)
+            return
+
+        event_ids = self._insert_rows(Events.__table__, event_rows)
+
+        state_rows = []
+        new_attributes = {}
+        for event_id, entry in zip(event_ids, state_entries):
+            if entry is None:
+                continue
+            state_row, shared_attrs = entry
+            state_row["event_id"] = event_id
+            state_rows.append(state_row)
+
+            attributes_id = None
+            if shared_attrs not in new_attributes:
+                attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+                attributes_id = self._get_attributes_id(shared_attrs, attr_hash)
+                if attributes_id is None:
+                    new_attributes[shared_attrs] = attr_hash
+            state_row["attributes_id"] = attributes_id
+
+        if new_attributes:
+            attributes_ids = dict(
+                zip(
+                    new_attributes,
+                    self._insert_rows(
+                        StateAttributes.__table__,
+                        [
+                            {"hash": attr_hash, "shared_attrs": shared_attrs}
+                            for shared_attrs, attr_hash in new_attributes.items()
+                        ],
+                    ),
+                )
+            )
+            for state_row, shared_attrs in filter(None, state_entries):
+                if state_row["attributes_id"] is None:
+                    state_row["attributes_id"] = attributes_ids[shared_attrs]
+            for shared_attrs, attributes_id in attributes_ids.items():
+                self._cache_attributes_id(shared_attrs, attributes_id)
+
+        # A state can only reference the previous state of its entity once
+        # that one has an id, so the states are inserted in runs that hold
+        # each entity at most once
+        run = []
+        for state_row in state_rows:
+            if any(row["entity_id"] == state_row["entity_id"] for row in run):
+                self._insert_state_rows(run)
+                run = []
+            run.append(state_row)
+        self._insert_state_rows(run)
+
+    def _insert_state_rows(self, state_rows):
+        """Insert state rows of distinct entities and remember their ids."""
+        old_state_ids = self._old_state_ids
+        for state_row in state_rows:
+            state_row["old_state_id"] = old_state_ids.pop(state_row["entity_id"], None)
+
+        state_ids = self._insert_rows(States.__table__, state_rows)
+
+        for state_row, state_id in zip(state_rows, state_ids):
+            if state_row["state"] is not None:
+                old_state_ids[state_row["entity_id"]] = state_id
+
+    def _insert_rows(self, table, rows):
+        """Insert rows and return the primary keys the database assigned."""
+        primary_key = table.primary_key.columns.values()[0]
+
+        if self.engine.dialect.name != "postgresql":
+            insert = table.insert()
+            return [
+                self.event_session.execute(insert, row).inserted_primary_key[0]
+                for row in rows
+            ]
+
+        ids = []
+        for idx in range(0, len(rows), INSERT_RETURNING_CHUNK_SIZE):
+            result = self.event_session.execute(
+                table.insert()
+                .values(rows[idx : idx + INSERT_RETURNING_CHUNK_SIZE])
+                .returning(primary_key)
+            )
+            # The serial keys are assigned in the order of the rows,
+            # RETURNING does not promise to keep that order
+            ids.extend(sorted(row[0] for row in result))
+        return ids
+
+    def _get_attributes_id(self, shared_attrs, attr_hash):
+        """Return the id of a stored state attributes row or None.
+
+        Recently used attributes are served from memory so unchanged
+        attributes never need a database round trip.
+        """
+        attributes_id = self._state_attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._state_attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        with self.event_session.no_autoflush:
+            attributes_id = (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(StateAttributes.hash == attr_hash)
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .limit(1)
+                .scalar()
+            )
+        if attributes_id is not None:
+            self._cache_attributes_id(shared_attrs, attributes_id)
+        return attributes_id
+
+    def _cache_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of a stored state attributes row."""
+        self._state_attributes_ids[shared_attrs] = attributes_id
+        self._state_attributes_ids.move_to_end(shared_attrs)
+        if len(self._state_attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids.popitem(last=False)
+
     def _commit_event_session_or_recover(self):
         """Commit changes to the database and recover if the database fails when possible."""
         try:
@@ -516,6 +794,10 @@ class Recorder(threading.Thread):
             self._pending_expunge = []
         self.event_session.commit()
 
+        for shared_attrs, dbstate_attributes in self._pending_state_attributes.items():
+            self._cache_attributes_id(shared_attrs, dbstate_attributes.attributes_id)
+        self._pending_state_attributes = {}
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -532,6 +814,7 @@ class Recorder(threading.Thread):
     def _reopen_event_session(self):
         """Rollback the event session and reopen it after a failure."""
         self._old_states = {}
+        self._old_state_ids = {}
 
         try:
             self.event_session.rollback()
@@ -546,6 +829,9 @@ class Recorder(threading.Thread):
 
     def _open_event_session(self):
         """Open the event session."""
+        self._state_attributes_ids.clear()
+        self._pending_state_attributes = {}
+
         try:
             self.event_session = self.get_session()
             self.event_session.expire_on_commit = False
@@ -564,6 +850,15 @@ class Recorder(threading.Thread):
             )
             self._reopen_event_session()
 
+    def evict_purged_states(self, state_ids):
+        """Forget the purged states so new states do not reference them."""
+        for entity_id, dbstate in list(self._old_states.items()):
+            if dbstate.state_id in state_ids:
+                self._old_states.pop(entity_id)
+        for entity_id, state_id in list(self._old_state_ids.items()):
+            if state_id in state_ids:
+                self._old_state_ids.pop(entity_id)
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
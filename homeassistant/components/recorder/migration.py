@@ -1,7 +1,19 @@
 """Schema migration helpers."""
 import logging
-
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, text
+import zlib
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ForeignKeyConstraint,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    bindparam,
+    select,
+    text,
+)
 from sqlalchemy.engine import reflection
 from sqlalchemy.exc import (
     InternalError,
@@ -12,11 +24,22 @@ from sqlalchemy.exc import (
 from sqlalchemy.schema import AddConstraint, DropConstraint
 
 from .const import DOMAIN
-from .models import SCHEMA_VERSION, TABLE_STATES, Base, SchemaChanges
+from .models import (
+    SCHEMA_VERSION,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES,
+    Base,
+    SchemaChanges,
+)
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of states moved to the state_attributes table per transaction
+MIGRATE_ATTRIBUTES_BATCH_SIZE = 10000
+# Number of distinct attributes remembered to share rows while migrating
+MIGRATE_ATTRIBUTES_CACHE_SIZE = 100000
+
 
 def migrate_schema(instance):
     """Check if the schema needs to be upgraded."""
@@ -243,6 +266,101 @@ def _update_states_table_with_foreign_key_options(engine):
             )
 
 
+def _add_foreign_key_constraint(engine, table_name, column):
+    """Add the foreign key constraint of a column as defined by the models."""
+    inspector = reflection.Inspector.from_engine(engine)
+    if any(
+        foreign_key["constrained_columns"] == [column]
+        for foreign_key in inspector.get_foreign_keys(table_name)
+    ):
+        return
+
+    for fkc in Base.metadata.tables[table_name].foreign_key_constraints:
+        if fkc.column_keys != [column]:
+            continue
+        try:
+            engine.execute(AddConstraint(fkc))
+        except (InternalError, OperationalError):
+            _LOGGER.exception(
+                "Could not add foreign key constraint for %s to %s table",
+                column,
+                table_name,
+            )
+
+
+def _state_attributes_table_v12(metadata):
+    """Return the state_attributes table as it was added in version 12."""
+    return Table(
+        TABLE_STATE_ATTRIBUTES,
+        metadata,
+        Column("attributes_id", Integer, primary_key=True),
+        Column("hash", BigInteger, index=True),
+        Column("shared_attrs", Text),
+        mysql_default_charset="utf8mb4",
+        mysql_collate="utf8mb4_unicode_ci",
+    )
+
+
+def _migrate_state_attributes(engine):
+    """Move the attributes of existing states to the state_attributes table.
+
+    The states are migrated in batches of MIGRATE_ATTRIBUTES_BATCH_SIZE, each
+    in its own transaction, so an interrupted migration keeps its progress.
+    """
+    metadata = MetaData()
+    state_attributes = _state_attributes_table_v12(metadata)
+    states = Table(
+        TABLE_STATES,
+        metadata,
+        Column("state_id", Integer, primary_key=True),
+        Column("attributes", Text),
+        Column("attributes_id", Integer),
+    )
+    select_states = (
+        select([states.c.state_id, states.c.attributes])
+        .where(states.c.attributes_id.is_(None))
+        .where(states.c.attributes.isnot(None))
+        .order_by(states.c.state_id)
+        .limit(MIGRATE_ATTRIBUTES_BATCH_SIZE)
+    )
+    insert_attributes = state_attributes.insert()
+    update_states = (
+        states.update()
+        .where(states.c.state_id == bindparam("b_state_id"))
+        .values(attributes_id=bindparam("b_attributes_id"), attributes=None)
+    )
+    attributes_ids = {}
+    migrated = 0
+
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(select_states).fetchall()
+            if not rows:
+                break
+
+            updates = []
+            for state_id, shared_attrs in rows:
+                attributes_id = attributes_ids.get(shared_attrs)
+                if attributes_id is None:
+                    if len(attributes_ids) >= MIGRATE_ATTRIBUTES_CACHE_SIZE:
+                        attributes_ids.clear()
+                    attributes_id = attributes_ids[shared_attrs] = connection.execute(
+                        insert_attributes,
+                        {
+                            "hash": zlib.crc32(shared_attrs.encode("utf-8")),
+                            "shared_attrs": shared_attrs,
+                        },
+                    ).inserted_primary_key[0]
+                updates.append(
+                    {"b_state_id": state_id, "b_attributes_id": attributes_id}
+                )
+
+            connection.execute(update_states, updates)
+
+        migrated += len(rows)
+        _LOGGER.info("Moved the attributes of %s states", migrated)
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -321,6 +439,21 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 11:
         _create_index(engine, "states", "ix_states_old_state_id")
         _update_states_table_with_foreign_key_options(engine)
+    elif new_version == 12:
+        # Attributes are moved to the shared state_attributes table
+        _state_attributes_table_v12(MetaData()).create(engine, checkfirst=True)
+        if engine.dialect.name == "sqlite":
+            # SQLite can only add a foreign key together with the column
+            _add_columns(
+                engine,
+                "states",
+                ["attributes_id INTEGER REFERENCES state_attributes(attributes_id)"],
+            )
+        else:
+            _add_columns(engine, "states", ["attributes_id INTEGER"])
+            _add_foreign_key_constraint(engine, TABLE_STATES, "attributes_id")
+        _create_index(engine, "states", "ix_states_attributes_id")
+        _migrate_state_attributes(engine)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -3,66 +3,71 @@ from datetime import timedelta
 import logging
 import time
 
+from sqlalchemy import func
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import Events, RecorderRuns, StateAttributes, States
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of consecutive state and event ids deleted per batch
+MAX_ROWS_TO_PURGE = 10000
+
+# SQLite limits the number of bind parameters of a query to 999,
+# stay below it when filtering rows by a list of ids
+SQLITE_MAX_BIND_VARS = 998
+
 
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Cleans up at most MAX_ROWS_TO_PURGE consecutive state and event ids per
+    call, deleted by primary key range, so the recorder can keep processing
+    new events between batches. Returns False if there are more rows to purge.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
-                )
+            timer_start = time.perf_counter()
 
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
+            state_range = _select_state_range_to_purge(session, purge_before)
+            if state_range:
+                _purge_state_range(instance, session, *state_range)
 
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            event_range = _select_event_range_to_purge(session, purge_before)
+            if event_range:
+                _purge_event_range(instance, session, *event_range)
 
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            if state_range or event_range:
+                elapsed = time.perf_counter() - timer_start
+                remaining_states = (
+                    session.query(func.count(States.state_id))
+                    .filter(States.last_updated < purge_before)
+                    .scalar()
+                )
+                remaining_events = (
+                    session.query(func.count(Events.event_id))
+                    .filter(Events.time_fired < purge_before)
+                    .scalar()
+                )
+                _LOGGER.info(
+                    "Purged states %s to %s and events %s to %s in %.3fs, "
+                    "%s states and %s events left to purge",
+                    *(state_range or (None, None)),
+                    *(event_range or (None, None)),
+                    elapsed,
+                    remaining_states,
+                    remaining_events,
+                )
 
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
-                return False
+                # Return false, as we are not done yet
+                if remaining_states or remaining_events:
+                    return False
 
             # Recorder runs is small, no need to batch run it
             deleted_rows = (
@@ -81,7 +86,9 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, recorder_runs"
+                )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -101,3 +108,152 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def _select_state_range_to_purge(session, purge_before):
+    """Return the first and last id of a range of states to purge.
+
+    The range starts at the oldest state and ends before the first state
+    in it that is not old enough, so every state in the range is purged.
+    """
+    first = (
+        session.query(States.state_id)
+        .filter(States.last_updated < purge_before)
+        .order_by(States.last_updated)
+        .limit(1)
+        .scalar()
+    )
+    if first is None:
+        return None
+    last = first + MAX_ROWS_TO_PURGE - 1
+    keep = (
+        session.query(func.min(States.state_id))
+        .filter(States.state_id.between(first, last))
+        .filter(States.last_updated >= purge_before)
+        .scalar()
+    )
+    return first, last if keep is None else keep - 1
+
+
+def _select_event_range_to_purge(session, purge_before):
+    """Return the first and last id of a range of events to purge."""
+    first = (
+        session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.time_fired)
+        .limit(1)
+        .scalar()
+    )
+    if first is None:
+        return None
+    last = first + MAX_ROWS_TO_PURGE - 1
+    keep = (
+        session.query(func.min(Events.event_id))
+        .filter(Events.event_id.between(first, last))
+        .filter(Events.time_fired >= purge_before)
+        .scalar()
+    )
+    return first, last if keep is None else keep - 1
+
+
+def _purge_state_range(instance, session, first, last):
+    """Delete the states with ids from first to last."""
+    _purge_states(
+        instance,
+        session,
+        lambda column: column.between(first, last),
+        range(first, last + 1),
+    )
+
+
+def _purge_states(instance, session, state_id_filter, state_ids):
+    """Delete states and clear the references to them.
+
+    state_id_filter returns the filter matching the purged states for a
+    column referencing them.
+    """
+    attributes_ids = {
+        attributes_id
+        for (attributes_id,) in session.query(States.attributes_id)
+        .filter(state_id_filter(States.state_id))
+        .filter(States.attributes_id.isnot(None))
+        .distinct()
+    }
+
+    # Clear the old_state_id of newer states explicitly instead of relying
+    # on ON DELETE SET NULL, which not all databases enforce.
+    disconnected_rows = (
+        session.query(States)
+        .filter(state_id_filter(States.old_state_id))
+        .update({"old_state_id": None}, synchronize_session=False)
+    )
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+
+    deleted_rows = (
+        session.query(States)
+        .filter(state_id_filter(States.state_id))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+
+    instance.evict_purged_states(state_ids)
+
+    for attributes_ids_chunk in _chunked(attributes_ids):
+        _purge_unused_attributes_ids(session, attributes_ids_chunk)
+
+
+def _purge_unused_attributes_ids(session, attributes_ids):
+    """Delete the state attributes of purged states no other state uses."""
+    # State attributes are shared between states so they
+    # can only be removed once no state references them
+    attributes_ids = set(attributes_ids) - {
+        attributes_id
+        for (attributes_id,) in session.query(States.attributes_id)
+        .filter(States.attributes_id.in_(attributes_ids))
+        .distinct()
+    }
+    if not attributes_ids:
+        return
+
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state_attributes", deleted_rows)
+
+
+def _purge_event_range(instance, session, first, last):
+    """Delete the events with ids from first to last and their states."""
+    # Delete the states explicitly instead of relying
+    # on ON DELETE CASCADE, which not all databases enforce.
+    # Most of them are already gone as states are purged first.
+    state_ids = [
+        state_id
+        for (state_id,) in session.query(States.state_id).filter(
+            States.event_id.between(first, last)
+        )
+    ]
+    for state_ids_chunk in _chunked(state_ids):
+        _purge_states(
+            instance,
+            session,
+            lambda column, chunk=state_ids_chunk: column.in_(chunk),
+            set(state_ids_chunk),
+        )
+
+    deleted_rows = (
+        session.query(Events)
+        .filter(Events.event_id.between(first, last))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+
+
+def _chunked(ids):
+    """Split ids in lists that fit in the bind parameters of a query."""
+    ids = list(ids)
+    return [
+        ids[idx : idx + SQLITE_MAX_BIND_VARS]
+        for idx in range(0, len(ids), SQLITE_MAX_BIND_VARS)
+    ]
@@ -15,6 +15,7 @@ from homeassistant.exceptions import (
 )
 from homeassistant.helpers import config_validation as cv, entity
 from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+from homeassistant.helpers.json import json_array
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
@@ -40,6 +41,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_supported_features)
 
 
 def pong_message(iden):
@@ -70,12 +72,14 @@ def handle_subscribe_events(hass, connection, msg):
         @callback
         def forward_events(event):
             """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
-                event.data["entity_id"], POLICY_READ
-            ):
+            entity_id = event.data["entity_id"]
+            if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
                 return
 
-            connection.send_message(messages.cached_event_message(msg["id"], event))
+            connection.send_message(
+                messages.cached_event_message(msg["id"], event),
+                (msg["id"], entity_id),
+            )
 
     else:
 
@@ -188,7 +192,14 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    try:
+        states_json = json_array(state.as_json() for state in states)
+    except (ValueError, TypeError):
+        # Let the writer report which state holds the unserializable data
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(messages.result_message_json(msg["id"], states_json))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -416,3 +427,16 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting the features supported by the client."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
@@ -2,7 +2,7 @@
 import asyncio
 from contextlib import suppress
 import logging
-from typing import Optional
+from typing import Dict, Hashable, Optional
 
 from aiohttp import WSMsgType, web
 import async_timeout
@@ -11,11 +11,13 @@ from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import callback
 from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_array
 
 from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -50,6 +52,17 @@ class WebSocketAdapter(logging.LoggerAdapter):
         return f'[{self.extra["connid"]}] {msg}', kwargs
 
 
+class _CollapsibleMessage:
+    """Queued message that can be replaced by a newer message for the same key."""
+
+    __slots__ = ("key", "message")
+
+    def __init__(self, key: Hashable, message: str) -> None:
+        """Initialize the message."""
+        self.key = key
+        self.message = message
+
+
 class WebSocketHandler:
     """Handle an active websocket client connection."""
 
@@ -61,38 +74,89 @@ class WebSocketHandler:
         self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
         self._handle_task = None
         self._writer_task = None
+        self._connection = None
+        self._collapsible: Dict[Hashable, _CollapsibleMessage] = {}
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub = None
 
     async def _writer(self):
         """Write outgoing messages."""
+        to_write = self._to_write
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
+                message = await to_write.get()
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
+                if to_write.empty() or not self._can_coalesce:
+                    message = self._message_to_json(message)
+                    self._logger.debug("Sending %s", message)
+                    await self.wsock.send_str(message)
+                    continue
 
-                if not isinstance(message, str):
-                    message = message_to_json(message)
+                # Send everything that is queued up as a single frame
+                messages = [message]
+                while not to_write.empty():
+                    message = to_write.get_nowait()
+                    if message is None:
+                        break
+                    messages.append(message)
 
-                await self.wsock.send_str(message)
+                frame = json_array(map(self._message_to_json, messages))
+                self._logger.debug("Sending %s", frame)
+                await self.wsock.send_str(frame)
+
+                if message is None:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    def _message_to_json(self, message) -> str:
+        """Return the JSON for a message taken off the queue."""
+        if isinstance(message, _CollapsibleMessage):
+            if self._collapsible.get(message.key) is message:
+                del self._collapsible[message.key]
+            return message.message
+        if isinstance(message, str):
+            return message
+        return message_to_json(message)
+
+    @property
+    def _can_coalesce(self) -> bool:
+        """Return if the client accepts multiple messages in a single frame."""
+        return self._connection is not None and bool(
+            self._connection.supported_features.get(FEATURE_COALESCE_MESSAGES)
+        )
+
     @callback
-    def _send_message(self, message):
+    def _send_message(self, message, collapse_key: Optional[Hashable] = None):
         """Send a message to the client.
 
         Closes connection if the client is not reading the messages.
 
+        If the client accepts coalesced messages and is behind, a message with
+        a collapse_key replaces a queued message with the same key that has
+        not been sent yet, instead of growing the queue.
+
         Async friendly.
         """
+        if (
+            collapse_key is not None
+            and self._to_write.qsize() >= PENDING_MSG_PEAK
+            and self._can_coalesce
+        ):
+            queued = self._collapsible.get(collapse_key)
+            if queued is not None:
+                queued.message = message
+                return
+            message = self._collapsible[collapse_key] = _CollapsibleMessage(
+                collapse_key, message
+            )
+
         try:
             self._to_write.put_nowait(message)
         except asyncio.QueueFull:
@@ -121,6 +185,16 @@ class WebSocketHandler:
         if self._to_write.qsize() < PENDING_MSG_PEAK:
             return
 
+        if self._can_coalesce:
+            # Superseded state changes are collapsed while the client is
+            # behind, so only disconnect it when the queue is full.
+            self._logger.debug(
+                "Client stayed over %s pending messages for %s seconds",
+                PENDING_MSG_PEAK,
+                PENDING_MSG_PEAK_TIME,
+            )
+            return
+
         self._logger.error(
             "Client unable to keep up with pending messages. Stayed over %s for %s seconds",
             PENDING_MSG_PEAK,
@@ -184,7 +258,7 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -12,6 +12,7 @@ import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
 from types import MappingProxyType
@@ -77,6 +78,7 @@ from homeassistant.util.async_ import (
     shutdown_run_callback_threadsafe,
 )
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json_encoder import json_dumps
 from homeassistant.util.timeout import TimeoutManager
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
 import homeassistant.util.uuid as uuid_util
@@ -116,6 +118,9 @@ SOURCE_YAML = "yaml"
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Shared by all states without attributes
+EMPTY_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({})
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -663,6 +668,9 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: Dict[str, List[Tuple[HassJob, Optional[Callable]]]] = {}
+        # Per event type snapshot of the MATCH_ALL and event type listeners,
+        # rebuilt on the next fire after the listeners of the type change
+        self._dispatch: Dict[str, Tuple[Tuple[HassJob, Optional[Callable]], ...]] = {}
         self._hass = hass
 
     @callback
@@ -703,12 +711,9 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        listeners = self._dispatch.get(event_type)
+        if listeners is None:
+            listeners = self._async_build_dispatch(event_type)
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
@@ -728,6 +733,39 @@ class EventBus:
                     continue
             self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_build_dispatch(
+        self, event_type: str
+    ) -> Tuple[Tuple[HassJob, Optional[Callable]], ...]:
+        """Build and cache the listeners to call for an event type.
+
+        Event types without listeners are not cached, so firing arbitrary
+        event types doesn't grow the cache.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._listeners.get(event_type, [])
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            listeners = self._listeners.get(MATCH_ALL, []) + listeners
+
+        dispatch = tuple(listeners)
+        if dispatch:
+            self._dispatch[event_type] = dispatch
+        return dispatch
+
+    @callback
+    def _async_invalidate_dispatch(self, event_type: str) -> None:
+        """Drop the cached listeners affected by a change to event_type.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -773,6 +811,7 @@ class EventBus:
         self, event_type: str, filterable_job: Tuple[HassJob, Optional[Callable]]
     ) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(filterable_job)
+        self._async_invalidate_dispatch(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -845,6 +884,8 @@ class EventBus:
             # delete event_type list if empty
             if not self._listeners[event_type]:
                 self._listeners.pop(event_type)
+
+            self._async_invalidate_dispatch(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
@@ -864,6 +905,9 @@ class State:
     context: Context in which it was created
     domain: Domain of this state.
     object_id: Object id of this state.
+
+    The domain, object id and dict representation are only computed when
+    they are first used.
     """
 
     __slots__ = [
@@ -873,9 +917,9 @@ class State:
         "last_changed",
         "last_updated",
         "context",
-        "domain",
-        "object_id",
+        "_domain",
         "_as_dict",
+        "_as_json",
     ]
 
     def __init__(
@@ -905,12 +949,29 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        self.attributes = (
+            MappingProxyType(attributes) if attributes else EMPTY_ATTRIBUTES
+        )
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
-        self.domain, self.object_id = split_entity_id(self.entity_id)
+        self._domain: Optional[str] = None
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_json: Optional[str] = None
+
+    @property
+    def domain(self) -> str:
+        """Domain of this state."""
+        domain = self._domain
+        if domain is None:
+            # Interned so all states of a domain share the same string
+            domain = self._domain = sys.intern(split_entity_id(self.entity_id)[0])
+        return domain
+
+    @property
+    def object_id(self) -> str:
+        """Object id of this state."""
+        return split_entity_id(self.entity_id)[1]
 
     @property
     def name(self) -> str:
@@ -943,6 +1004,19 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        States are immutable, so the encoded string is cached and can be
+        spliced directly into larger JSON payloads.
+        Raises ValueError or TypeError if the attributes are not serializable.
+        """
+        if self._as_json is None:
+            self._as_json = json_dumps(self.as_dict())
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -1193,19 +1267,14 @@ class StateMachine:
         """
         entity_id = entity_id.lower()
         new_state = str(new_state)
-        attributes = attributes or {}
         old_state = self._states.get(entity_id)
-        if old_state is None:
-            same_state = False
-            same_attr = False
+        if old_state is None or old_state.state != new_state or force_update:
+            # The attributes only need to be compared when the state is the same
             last_changed = None
-        else:
-            same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
-            last_changed = old_state.last_changed if same_state else None
-
-        if same_state and same_attr:
+        elif old_state.attributes == (attributes or EMPTY_ATTRIBUTES):
             return
+        else:
+            last_changed = old_state.last_changed
 
         if context is None:
             context = Context()
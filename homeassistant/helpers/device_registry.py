@@ -132,6 +132,10 @@ class DeviceRegistry:
     devices: Dict[str, DeviceEntry]
     deleted_devices: Dict[str, DeletedDeviceEntry]
     _devices_index: Dict[str, Dict[str, Dict[Tuple[str, str], str]]]
+    # Registered device ids by area and config entry. The inner dicts are used
+    # as ordered sets.
+    _area_index: Dict[str, Dict[str, None]]
+    _config_entry_index: Dict[str, Dict[str, None]]
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -197,6 +201,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices[device.id] = device
+            self._add_device_to_secondary_index(device)
 
         _add_device_to_index(devices_index, device)
 
@@ -208,6 +213,7 @@ class DeviceRegistry:
         else:
             devices_index = self._devices_index[REGISTERED_DEVICE]
             self.devices.pop(device.id)
+            self._remove_device_from_secondary_index(device)
 
         _remove_device_from_index(devices_index, device)
 
@@ -218,6 +224,27 @@ class DeviceRegistry:
         devices_index = self._devices_index[REGISTERED_DEVICE]
         _remove_device_from_index(devices_index, old_device)
         _add_device_to_index(devices_index, new_device)
+        self._remove_device_from_secondary_index(old_device)
+        self._add_device_to_secondary_index(new_device)
+
+    def _add_device_to_secondary_index(self, device: DeviceEntry) -> None:
+        """Add a registered device to the area and config entry index."""
+        if device.area_id is not None:
+            self._area_index.setdefault(device.area_id, {})[device.id] = None
+        for config_entry_id in device.config_entries:
+            self._config_entry_index.setdefault(config_entry_id, {})[device.id] = None
+
+    def _remove_device_from_secondary_index(self, device: DeviceEntry) -> None:
+        """Remove a registered device from the area and config entry index."""
+        for index, keys in (
+            (self._area_index, () if device.area_id is None else (device.area_id,)),
+            (self._config_entry_index, device.config_entries),
+        ):
+            for key in keys:
+                device_ids = index[key]
+                del device_ids[device.id]
+                if not device_ids:
+                    del index[key]
 
     def _clear_index(self) -> None:
         """Clear the index."""
@@ -225,12 +252,15 @@ class DeviceRegistry:
             REGISTERED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
             DELETED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
         }
+        self._area_index = {}
+        self._config_entry_index = {}
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
         self._clear_index()
         for device in self.devices.values():
             _add_device_to_index(self._devices_index[REGISTERED_DEVICE], device)
+            self._add_device_to_secondary_index(device)
         for deleted_device in self.deleted_devices.values():
             _add_device_to_index(self._devices_index[DELETED_DEVICE], deleted_device)
 
@@ -564,8 +594,8 @@ class DeviceRegistry:
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
         now_time = time.time()
-        for device in list(self.devices.values()):
-            self._async_update_device(device.id, remove_config_entry_id=config_entry_id)
+        for device_id in list(self._config_entry_index.get(config_entry_id, ())):
+            self._async_update_device(device_id, remove_config_entry_id=config_entry_id)
         for deleted_device in list(self.deleted_devices.values()):
             config_entries = deleted_device.config_entries
             if config_entry_id not in config_entries:
@@ -605,9 +635,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for dev_id in list(self._area_index.get(area_id, ())):
+            self._async_update_device(dev_id, area_id=None)
 
 
 @callback
@@ -635,7 +664,9 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    # pylint: disable=protected-access
+    devices = registry.devices
+    return [devices[device_id] for device_id in registry._area_index.get(area_id, ())]
 
 
 @callback
@@ -643,10 +674,11 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> List[DeviceEntry]:
     """Return entries that match a config entry."""
+    # pylint: disable=protected-access
+    devices = registry.devices
     return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
+        devices[device_id]
+        for device_id in registry._config_entry_index.get(config_entry_id, ())
     ]
 
 
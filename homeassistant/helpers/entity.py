@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 from timeit import default_timer as timer
-from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple
 
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import (
@@ -122,6 +122,17 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # Registry entry and customization the static attributes were built with,
+    # followed by the capability and descriptive attributes
+    _static_attributes_cache: Optional[
+        Tuple[
+            Optional[RegistryEntry],
+            Any,
+            Optional[Dict[str, Any]],
+            Dict[str, Any],
+        ]
+    ] = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -226,6 +237,16 @@ class Entity(ABC):
         """Flag supported features."""
         return None
 
+    @property
+    def static_attributes(self) -> bool:
+        """Return True if the attributes describing the entity never change.
+
+        The capability attributes, unit of measurement, name, icon, entity
+        picture, assumed state, supported features and device class are then
+        only evaluated again when the registry entry or customization changes.
+        """
+        return False
+
     @property
     def context_recent_time(self) -> timedelta:
         """Time that a context is considered recent."""
@@ -295,31 +316,9 @@ class Entity(ABC):
         self._async_write_ha_state()
 
     @callback
-    def _async_write_ha_state(self) -> None:
-        """Write the state to the state machine."""
-        if self.registry_entry and self.registry_entry.disabled_by:
-            if not self._disabled_reported:
-                self._disabled_reported = True
-                assert self.platform is not None
-                _LOGGER.warning(
-                    "Entity %s is incorrectly being triggered for updates while it is disabled. This is a bug in the %s integration",
-                    self.entity_id,
-                    self.platform.platform_name,
-                )
-            return
-
-        start = timer()
-
-        attr = self.capability_attributes
-        attr = dict(attr) if attr else {}
-
-        if not self.available:
-            state = STATE_UNAVAILABLE
-        else:
-            sstate = self.state
-            state = STATE_UNKNOWN if sstate is None else str(sstate)
-            attr.update(self.state_attributes or {})
-            attr.update(self.device_state_attributes or {})
+    def _async_descriptive_attributes(self) -> Dict[str, Any]:
+        """Return the attributes describing the entity, customization applied."""
+        attr: Dict[str, Any] = {}
 
         unit_of_measurement = self.unit_of_measurement
         if unit_of_measurement is not None:
@@ -351,6 +350,74 @@ class Entity(ABC):
         if device_class is not None:
             attr[ATTR_DEVICE_CLASS] = str(device_class)
 
+        # Overwrite properties that have been set in the config file.
+        assert self.hass is not None
+        if DATA_CUSTOMIZE in self.hass.data:
+            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+
+        return attr
+
+    @callback
+    def _async_static_attributes(
+        self,
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Return the cached capability and descriptive attributes.
+
+        The registry entry and customization are replaced, not mutated, when
+        they are updated, so they are compared by identity.
+        """
+        assert self.hass is not None
+        customize = self.hass.data.get(DATA_CUSTOMIZE)
+        cache = self._static_attributes_cache
+        if (
+            cache is None
+            or cache[0] is not self.registry_entry
+            or cache[1] is not customize
+        ):
+            cache = self._static_attributes_cache = (
+                self.registry_entry,
+                customize,
+                self.capability_attributes,
+                self._async_descriptive_attributes(),
+            )
+        return cache[2], cache[3]
+
+    @callback
+    def _async_write_ha_state(self) -> None:
+        """Write the state to the state machine."""
+        if self.registry_entry and self.registry_entry.disabled_by:
+            if not self._disabled_reported:
+                self._disabled_reported = True
+                assert self.platform is not None
+                _LOGGER.warning(
+                    "Entity %s is incorrectly being triggered for updates while it is disabled. This is a bug in the %s integration",
+                    self.entity_id,
+                    self.platform.platform_name,
+                )
+            return
+
+        start = timer()
+
+        if self.static_attributes:
+            capability_attr, descriptive_attr = self._async_static_attributes()
+        else:
+            capability_attr = self.capability_attributes
+            descriptive_attr = None
+
+        attr = dict(capability_attr) if capability_attr else {}
+
+        if not self.available:
+            state = STATE_UNAVAILABLE
+        else:
+            sstate = self.state
+            state = STATE_UNKNOWN if sstate is None else str(sstate)
+            attr.update(self.state_attributes or {})
+            attr.update(self.device_state_attributes or {})
+
+        if descriptive_attr is None:
+            descriptive_attr = self._async_descriptive_attributes()
+        attr.update(descriptive_attr)
+
         end = timer()
 
         if end - start > 0.4 and not self._slow_reported:
@@ -376,12 +443,8 @@ class Entity(ABC):
                 extra,
             )
 
-        # Overwrite properties that have been set in the config file.
-        assert self.hass is not None
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
-
         # Convert temperature if we detect one
+        assert self.hass is not None
         try:
             unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
             units = self.hass.config.units
@@ -465,7 +528,11 @@ class Entity(ABC):
                 await task
                 return
 
-            finished, _ = await asyncio.wait([task], timeout=SLOW_UPDATE_WARNING)
+            try:
+                finished, _ = await asyncio.wait([task], timeout=SLOW_UPDATE_WARNING)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
 
             for done in finished:
                 exc = done.exception()
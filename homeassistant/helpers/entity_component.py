@@ -78,6 +78,9 @@ class EntityComponent:
 
         self.config: Optional[ConfigType] = None
 
+        # Entities of all platforms by entity id
+        self._entities: Dict[str, entity.Entity] = {}
+
         self._platforms: Dict[
             Union[str, Tuple[str, Optional[timedelta], Optional[str]]], EntityPlatform
         ] = {domain: self._async_init_entity_platform(domain, None)}
@@ -95,11 +98,7 @@ class EntityComponent:
 
     def get_entity(self, entity_id: str) -> Optional[entity.Entity]:
         """Get an entity."""
-        for platform in self._platforms.values():
-            entity_obj = platform.entities.get(entity_id)
-            if entity_obj is not None:
-                return entity_obj
-        return None
+        return self._entities.get(entity_id)
 
     def setup(self, config: ConfigType) -> None:
         """Set up a full entity component.
@@ -202,7 +201,7 @@ class EntityComponent:
         async def handle_service(call: Callable) -> None:
             """Handle the service."""
             await self.hass.helpers.service.entity_service_call(
-                self._platforms.values(), func, call, required_features
+                self._entities, func, call, required_features
             )
 
         self.hass.services.async_register(self.domain, name, handle_service, schema)
@@ -262,15 +261,10 @@ class EntityComponent:
 
     async def async_remove_entity(self, entity_id: str) -> None:
         """Remove an entity managed by one of the platforms."""
-        found = None
-
-        for platform in self._platforms.values():
-            if entity_id in platform.entities:
-                found = platform
-                break
+        entity_obj = self._entities.get(entity_id)
 
-        if found:
-            await found.async_remove_entity(entity_id)
+        if entity_obj is not None:
+            await entity_obj.async_remove()
 
     async def async_prepare_reload(
         self, *, skip_reset: bool = False
@@ -311,7 +305,7 @@ class EntityComponent:
         if scan_interval is None:
             scan_interval = self.scan_interval
 
-        return EntityPlatform(
+        entity_platform = EntityPlatform(
             hass=self.hass,
             logger=self.logger,
             domain=self.domain,
@@ -320,3 +314,5 @@ class EntityComponent:
             scan_interval=scan_interval,
             entity_namespace=entity_namespace,
         )
+        entity_platform.domain_entities = self._entities
+        return entity_platform
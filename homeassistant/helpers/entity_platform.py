@@ -3,10 +3,24 @@ from __future__ import annotations
 
 import asyncio
 from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from logging import Logger
+import math
+from time import monotonic
 from types import ModuleType
-from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+import zlib
 
 from homeassistant import config_entries
 from homeassistant.const import ATTR_RESTORED, DEVICE_DEFAULT_NAME
@@ -38,6 +52,109 @@ PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
+DATA_POLL_SCHEDULER = "entity_platform_poll_scheduler"
+POLL_SLOTS = 10
+MAX_POLL_STRIDE = 10
+POLL_OVERRUN_WARNING_INTERVAL = 600  # seconds
+
+
+@dataclass
+class PollStatistics:
+    """Poll statistics of an entity platform."""
+
+    polls: int = 0
+    overruns: int = 0
+    skipped: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Return the mean latency of a poll in seconds."""
+        return self.total_latency / self.polls if self.polls else 0.0
+
+    @callback
+    def async_record_poll(self, latency: float) -> None:
+        """Record a finished poll."""
+        self.polls += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+
+
+class _PollScheduler:
+    """Spread the polling of entities of all platforms over their interval.
+
+    Entities get a deterministic slot based on their entity ID. All entities
+    sharing a scan interval and slot are polled by a single timer. Higher
+    slots start earlier, spreading the polls over the second half of the
+    interval instead of polling every entity at the same tick.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the poll scheduler."""
+        self.hass = hass
+        self._groups: Dict[Tuple[timedelta, int], Dict[str, CALLBACK_TYPE]] = {}
+        self._unsubs: Dict[Tuple[timedelta, int], CALLBACK_TYPE] = {}
+
+    @callback
+    def async_add(
+        self, entity_id: str, interval: timedelta, poll: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Poll an entity every interval until the returned callback is called."""
+        key = (interval, zlib.crc32(entity_id.encode()) % POLL_SLOTS)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {}
+            self._async_start_group(key, group)
+        group[entity_id] = poll
+
+        @callback
+        def remove_entity() -> None:
+            """Stop polling the entity."""
+            if group.get(entity_id) is poll:
+                del group[entity_id]
+            if group or self._groups.get(key) is not group:
+                return
+            del self._groups[key]
+            self._unsubs.pop(key)()
+
+        return remove_entity
+
+    @callback
+    def _async_start_group(
+        self, key: Tuple[timedelta, int], group: Dict[str, CALLBACK_TYPE]
+    ) -> None:
+        """Start the timer of a poll group."""
+        interval, slot = key
+
+        @callback
+        def poll_group(now: datetime) -> None:
+            """Poll all entities of the group."""
+            for poll in list(group.values()):
+                poll()
+
+        @callback
+        def start_interval(now: datetime) -> None:
+            """Poll the group every interval from now on."""
+            self._unsubs[key] = async_track_time_interval(
+                self.hass, poll_group, interval
+            )
+            poll_group(now)
+
+        delay = interval.total_seconds() * (1 - slot / (2 * POLL_SLOTS))
+        self._unsubs[key] = async_call_later(self.hass, delay, start_interval)
+
+
+@callback
+def _async_poll_scheduler(hass: HomeAssistantType) -> _PollScheduler:
+    """Return the poll scheduler of this instance."""
+    scheduler: Optional[_PollScheduler] = hass.data.get(DATA_POLL_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = _PollScheduler(hass)
+    return scheduler
+
 
 class EntityPlatform:
     """Manage the entities for a single platform."""
@@ -63,14 +180,22 @@ class EntityPlatform:
         self.entity_namespace = entity_namespace
         self.config_entry: Optional[config_entries.ConfigEntry] = None
         self.entities: Dict[str, Entity] = {}  # pylint: disable=used-before-assignment
+        # Entities of all platforms of the entity component this platform
+        # belongs to, by entity id. Set by the entity component.
+        self.domain_entities: Dict[str, Entity] = {}
         self._tasks: List[asyncio.Future] = []
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
-        # Method to cancel the state change listener
-        self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
+        # Update tasks of the entities that are being polled, by entity ID
+        self._polling: Dict[str, asyncio.Future] = {}
+        # Scan intervals between polls of entities slower than the interval
+        self._poll_strides: Dict[str, int] = {}
+        # Polls left to skip before polling a slow entity again
+        self._poll_skips: Dict[str, int] = {}
+        self._last_overrun_warning: Optional[float] = None
+        self.poll_statistics = PollStatistics()
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
-        self._process_updates: Optional[asyncio.Lock] = None
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -290,31 +415,27 @@ class EntityPlatform:
     ) -> None:
         """Add entities for a single platform async.
 
+        The registry entries and entity ids of the whole batch are resolved in
+        a single pass before the entities are added to Home Assistant.
+
         This method must be run in the event loop.
         """
         # handle empty list from component/platform
         if not new_entities:
             return
 
+        entities = list(new_entities)
         hass = self.hass
 
         device_registry = await hass.helpers.device_registry.async_get_registry()
         entity_registry = await hass.helpers.entity_registry.async_get_registry()
-        tasks = [
-            self._async_add_entity(  # type: ignore
-                entity, update_before_add, entity_registry, device_registry
-            )
-            for entity in new_entities
-        ]
 
-        # No entities for processing
-        if not tasks:
-            return
-
-        timeout = max(SLOW_ADD_ENTITY_MAX_WAIT * len(tasks), SLOW_ADD_MIN_TIMEOUT)
+        timeout = max(SLOW_ADD_ENTITY_MAX_WAIT * len(entities), SLOW_ADD_MIN_TIMEOUT)
         try:
             async with self.hass.timeout.async_timeout(timeout, self.domain):
-                await asyncio.gather(*tasks)
+                await self._async_add_entities_bulk(
+                    entities, update_before_add, entity_registry, device_registry
+                )
         except asyncio.TimeoutError:
             self.logger.warning(
                 "Timed out adding entities for domain %s with platform %s after %ds",
@@ -330,39 +451,139 @@ class EntityPlatform:
             )
             raise
 
-        if self._async_unsub_polling is not None or not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            return
+    async def _async_add_entities_bulk(  # type: ignore[no-untyped-def]
+        self, entities, update_before_add, entity_registry, device_registry
+    ):
+        """Add a batch of entities to the platform."""
+        for entity in entities:
+            if entity is None:
+                raise ValueError("Entity cannot be None")
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
-        )
+        for entity in entities:
+            entity.add_to_platform_start(
+                self.hass,
+                self,
+                self._get_parallel_updates_semaphore(hasattr(entity, "async_update")),
+            )
 
-    async def _async_add_entity(  # type: ignore[no-untyped-def]
-        self, entity, update_before_add, entity_registry, device_registry
-    ):
-        """Add an entity to the platform."""
-        if entity is None:
-            raise ValueError("Entity cannot be None")
-
-        entity.add_to_platform_start(
-            self.hass,
-            self,
-            self._get_parallel_updates_semaphore(hasattr(entity, "async_update")),
-        )
+        device_ids: Dict[Any, Optional[str]] = {}
 
-        # Update properties before we generate the entity_id
         if update_before_add:
-            try:
-                await entity.async_device_update(warning=False)
-            except Exception:  # pylint: disable=broad-except
-                self.logger.exception("%s: Error on device update!", self.platform_name)
-                entity.add_to_platform_abort()
-                return
+            # Register each entity as soon as its own update is done, so a
+            # slow update doesn't delay adding the rest of the batch
+            results = await asyncio.gather(
+                *(
+                    self._async_add_entity_after_update(
+                        entity, entity_registry, device_registry, device_ids
+                    )
+                    for entity in entities
+                ),
+                return_exceptions=True,
+            )
+        else:
+            # Resolve the registry entries and entity ids of the whole batch
+            # without yielding to the event loop, so the entity ids picked
+            # for the batch can't conflict with each other.
+            to_finish = []
+            results = []
+
+            for entity in entities:
+                try:
+                    if self._async_register_entity(
+                        entity, entity_registry, device_registry, device_ids
+                    ):
+                        to_finish.append(entity)
+                except Exception as err:  # pylint: disable=broad-except
+                    # Add the rest of the batch before raising
+                    results.append(err)
+
+            results.extend(
+                await asyncio.gather(
+                    *(self._async_finish_add_entity(entity) for entity in to_finish),
+                    return_exceptions=True,
+                )
+            )
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _async_add_entity_after_update(  # type: ignore[no-untyped-def]
+        self, entity, entity_registry, device_registry, device_ids
+    ) -> None:
+        """Update an entity, then register it and add it to Home Assistant."""
+        if not await self._async_update_before_add(entity):
+            return
 
+        # Registering doesn't yield to the event loop, so the entity id
+        # picked can't conflict with the ids of the other entities
+        if self._async_register_entity(
+            entity, entity_registry, device_registry, device_ids
+        ):
+            await self._async_finish_add_entity(entity)
+
+    async def _async_update_before_add(self, entity: Entity) -> bool:
+        """Update an entity before it is added and return if it succeeded."""
+        try:
+            await entity.async_device_update(warning=False)
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception("%s: Error on device update!", self.platform_name)
+            entity.add_to_platform_abort()
+            return False
+        return True
+
+    @callback
+    def _async_get_or_create_device(  # type: ignore[no-untyped-def]
+        self, device_registry, config_entry_id, device_info, device_ids
+    ) -> Optional[str]:
+        """Return the device id of the device of an entity, cached per batch."""
+        processed_dev_info = {"config_entry_id": config_entry_id}
+        for key in (
+            "connections",
+            "identifiers",
+            "manufacturer",
+            "model",
+            "name",
+            "default_manufacturer",
+            "default_model",
+            "default_name",
+            "sw_version",
+            "entry_type",
+            "via_device",
+            "suggested_area",
+        ):
+            if key in device_info:
+                processed_dev_info[key] = device_info[key]
+
+        # Entities of the same device usually share their device info
+        try:
+            cache_key: Any = tuple(
+                (key, frozenset(value) if isinstance(value, set) else value)
+                for key, value in processed_dev_info.items()
+            )
+            hash(cache_key)
+        except TypeError:
+            cache_key = None
+
+        if cache_key is not None and cache_key in device_ids:
+            return device_ids[cache_key]
+
+        device = device_registry.async_get_or_create(**processed_dev_info)
+        device_id = device.id if device else None
+
+        if cache_key is not None:
+            device_ids[cache_key] = device_id
+
+        return device_id
+
+    @callback
+    def _async_register_entity(  # type: ignore[no-untyped-def]
+        self, entity, entity_registry, device_registry, device_ids
+    ) -> bool:
+        """Resolve the registry entry and entity id of an entity.
+
+        Returns if the entity should be added.
+        """
         requested_entity_id = None
         suggested_object_id: Optional[str] = None
 
@@ -386,27 +607,9 @@ class EntityPlatform:
             device_id = None
 
             if config_entry_id is not None and device_info is not None:
-                processed_dev_info = {"config_entry_id": config_entry_id}
-                for key in (
-                    "connections",
-                    "identifiers",
-                    "manufacturer",
-                    "model",
-                    "name",
-                    "default_manufacturer",
-                    "default_model",
-                    "default_name",
-                    "sw_version",
-                    "entry_type",
-                    "via_device",
-                    "suggested_area",
-                ):
-                    if key in device_info:
-                        processed_dev_info[key] = device_info[key]
-
-                device = device_registry.async_get_or_create(**processed_dev_info)
-                if device:
-                    device_id = device.id
+                device_id = self._async_get_or_create_device(
+                    device_registry, config_entry_id, device_info, device_ids
+                )
 
             disabled_by: Optional[str] = None
             if not entity.entity_registry_enabled_default:
@@ -440,7 +643,7 @@ class EntityPlatform:
                     or f'"{self.platform_name} {entity.unique_id}"',
                 )
                 entity.add_to_platform_abort()
-                return
+                return False
 
         # We won't generate an entity ID if the platform has already set one
         # We will however make sure that platform cannot pick a registered ID
@@ -491,23 +694,45 @@ class EntityPlatform:
                 msg = f"Entity id already exists - ignoring: {entity.entity_id}"
             self.logger.error(msg)
             entity.add_to_platform_abort()
-            return
+            return False
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
+        self.domain_entities[entity_id] = entity
 
         if not restored:
             # Reserve the state in the state machine
-            # because as soon as we return control to the event
-            # loop below, another entity could be added
-            # with the same id before `entity.add_to_platform_finish()`
-            # has a chance to finish.
+            # because another entity could be added with the same id
+            # before `entity.add_to_platform_finish()` has a chance to finish.
             self.hass.states.async_reserve(entity.entity_id)
 
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        @callback
+        def remove_entity_cb() -> None:
+            """Remove entity from the platform and the domain entities."""
+            self.entities.pop(entity_id)
+            self._poll_strides.pop(entity_id, None)
+            self._poll_skips.pop(entity_id, None)
+            if self.domain_entities.get(entity_id) is entity:
+                del self.domain_entities[entity_id]
+
+        entity.async_on_remove(remove_entity_cb)
+        return True
+
+    async def _async_finish_add_entity(self, entity: Entity) -> None:
+        """Add a registered entity to Home Assistant."""
+        entity_id = entity.entity_id
 
         await entity.add_to_platform_finish()
 
+        if entity.should_poll and self.entities.get(entity_id) is entity:
+            entity.async_on_remove(
+                _async_poll_scheduler(self.hass).async_add(
+                    entity_id,
+                    self.scan_interval,
+                    lambda: self._async_poll_entity(entity),
+                )
+            )
+
     async def async_reset(self) -> None:
         """Remove all entities and reset data.
 
@@ -520,13 +745,15 @@ class EntityPlatform:
         if not self.entities:
             return
 
+        polling = list(self._polling.values())
+        for task in polling:
+            task.cancel()
+        await asyncio.gather(*polling, return_exceptions=True)
+
         tasks = [entity.async_remove() for entity in self.entities.values()]
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
         self._setup_complete = False
 
     async def async_destroy(self) -> None:
@@ -541,13 +768,6 @@ class EntityPlatform:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if self._async_unsub_polling is not None and not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_extract_from_service(
         self, service_call: ServiceCall, expand_group: bool = True
     ) -> List[Entity]:
@@ -591,34 +811,69 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
-
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+    @callback
+    def _async_poll_entity(self, entity: Entity) -> None:
+        """Poll an entity unless it is slow or its last update still runs.
 
-        This method must be run in the event loop.
+        Entities whose last update took longer than the scan interval are
+        polled every as many scan intervals as that update took.
         """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
-            )
+        if not entity.should_poll:
             return
 
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
+        entity_id = entity.entity_id
+        skips = self._poll_skips.get(entity_id)
+        if skips:
+            self._poll_skips[entity_id] = skips - 1
+            self.poll_statistics.skipped += 1
+            return
+
+        if entity_id in self._polling:
+            self.poll_statistics.overruns += 1
+            now = monotonic()
+            if (
+                self._last_overrun_warning is None
+                or now - self._last_overrun_warning >= POLL_OVERRUN_WARNING_INTERVAL
+            ):
+                self._last_overrun_warning = now
+                self.logger.warning(
+                    "Updating %s %s took longer than the scheduled update interval %s",
+                    self.platform_name,
+                    entity_id,
+                    self.scan_interval,
+                )
+            return
+
+        stride = self._poll_strides.get(entity_id)
+        if stride is not None:
+            self._poll_skips[entity_id] = stride - 1
+        self._polling[entity_id] = self.hass.async_create_task(
+            self._async_update_entity(entity)
+        )
 
-            if tasks:
-                await asyncio.gather(*tasks)
+    async def _async_update_entity(self, entity: Entity) -> None:
+        """Update the state of a polling entity."""
+        entity_id = entity.entity_id
+        start = monotonic()
+        try:
+            await entity.async_update_ha_state(True)
+        finally:
+            self._polling.pop(entity_id, None)
+            latency = monotonic() - start
+            self.poll_statistics.async_record_poll(latency)
+            if self.entities.get(entity_id) is entity:
+                self._async_adapt_poll_stride(entity_id, latency)
+
+    @callback
+    def _async_adapt_poll_stride(self, entity_id: str, latency: float) -> None:
+        """Poll an entity every as many scan intervals as its update took."""
+        stride = min(
+            math.ceil(latency / self.scan_interval.total_seconds()), MAX_POLL_STRIDE
+        )
+        if stride > 1:
+            self._poll_strides[entity_id] = stride
+        elif self._poll_strides.pop(entity_id, None) is not None:
+            self._poll_skips.pop(entity_id, None)
 
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
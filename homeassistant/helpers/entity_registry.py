@@ -153,6 +153,11 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
+        # Entity ids by device, area and config entry. The inner dicts are
+        # used as ordered sets.
+        self._device_index: Dict[str, Dict[str, None]] = {}
+        self._area_index: Dict[str, Dict[str, None]] = {}
+        self._config_entry_index: Dict[str, Dict[str, None]] = {}
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
@@ -249,6 +254,17 @@ class EntityRegistry:
         entity_id = self.async_get_entity_id(domain, platform, unique_id)
 
         if entity_id:
+            # When we changed our slugify algorithm, we invalidated some
+            # stored entity IDs with either a __ or ending in _.
+            # Fix introduced in 0.86 (Jan 23, 2019). Valid entity IDs are
+            # already slugified. Can be removed when we release 1.0 or in 2020.
+            if valid_entity_id(entity_id):
+                new_entity_id: Union[str, UndefinedType] = UNDEFINED
+            else:
+                new_entity_id = ".".join(
+                    slugify(part) for part in entity_id.split(".", 1)
+                )
+
             return self._async_update_entity(
                 entity_id,
                 config_entry_id=config_entry_id or UNDEFINED,
@@ -260,13 +276,7 @@ class EntityRegistry:
                 unit_of_measurement=unit_of_measurement or UNDEFINED,
                 original_name=original_name or UNDEFINED,
                 original_icon=original_icon or UNDEFINED,
-                # When we changed our slugify algorithm, we invalidated some
-                # stored entity IDs with either a __ or ending in _.
-                # Fix introduced in 0.86 (Jan 23, 2019). Next line can be
-                # removed when we release 1.0 or in 2020.
-                new_entity_id=".".join(
-                    slugify(part) for part in entity_id.split(".", 1)
-                ),
+                new_entity_id=new_entity_id,
             )
 
         entity_id = self.async_generate_entity_id(
@@ -537,19 +547,14 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
+        for entity_id in list(self._config_entry_index.get(config_entry, ())):
             self.async_remove(entity_id)
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if area_id == entry.area_id:
-                self._async_update_entity(entity_id, area_id=None)
+        for entity_id in list(self._area_index.get(area_id, ())):
+            self._async_update_entity(entity_id, area_id=None)
 
     def _register_entry(self, entry: RegistryEntry) -> None:
         self.entities[entry.entity_id] = entry
@@ -557,6 +562,13 @@ class EntityRegistry:
 
     def _add_index(self, entry: RegistryEntry) -> None:
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        for index, key in (
+            (self._device_index, entry.device_id),
+            (self._area_index, entry.area_id),
+            (self._config_entry_index, entry.config_entry_id),
+        ):
+            if key is not None:
+                index.setdefault(key, {})[entry.entity_id] = None
 
     def _unregister_entry(self, entry: RegistryEntry) -> None:
         self._remove_index(entry)
@@ -564,9 +576,23 @@ class EntityRegistry:
 
     def _remove_index(self, entry: RegistryEntry) -> None:
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        for index, key in (
+            (self._device_index, entry.device_id),
+            (self._area_index, entry.area_id),
+            (self._config_entry_index, entry.config_entry_id),
+        ):
+            if key is None:
+                continue
+            entity_ids = index[key]
+            del entity_ids[entry.entity_id]
+            if not entity_ids:
+                del index[key]
 
     def _rebuild_index(self) -> None:
         self._index = {}
+        self._device_index = {}
+        self._area_index = {}
+        self._config_entry_index = {}
         for entry in self.entities.values():
             self._add_index(entry)
 
@@ -598,11 +624,12 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str, include_disabled_entities: bool = False
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
+    # pylint: disable=protected-access
+    entries = registry.entities
     return [
-        entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
+        entries[entity_id]
+        for entity_id in registry._device_index.get(device_id, ())
+        if include_disabled_entities or not entries[entity_id].disabled_by
     ]
 
 
@@ -611,7 +638,9 @@ def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    # pylint: disable=protected-access
+    entries = registry.entities
+    return [entries[entity_id] for entity_id in registry._area_index.get(area_id, ())]
 
 
 @callback
@@ -619,10 +648,11 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
+    # pylint: disable=protected-access
+    entries = registry.entities
     return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
+        entries[entity_id]
+        for entity_id in registry._config_entry_index.get(config_entry_id, ())
     ]
 
 
@@ -2,8 +2,10 @@
 import asyncio
 import copy
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, tzinfo
 import functools as ft
+import heapq
+import itertools
 import logging
 import time
 from typing import (
@@ -53,6 +55,9 @@ from homeassistant.util.async_ import run_callback_threadsafe
 TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
 TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
 
+TRACK_STATE_CHANGE_DOMAIN_CALLBACKS = "track_state_change_domain_callbacks"
+TRACK_STATE_CHANGE_DOMAIN_LISTENER = "track_state_change_domain_listener"
+
 TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
 TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
 
@@ -62,6 +67,8 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TIME_SCHEDULER = "track_time_scheduler"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -258,6 +265,28 @@ def async_track_state_change_event(
     if not entity_ids:
         return _remove_empty_listener
 
+    job = HassJob(action)
+    _async_add_state_change_event_jobs(hass, entity_ids, job)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state change listener."""
+        _async_remove_indexed_listeners(
+            hass,
+            TRACK_STATE_CHANGE_CALLBACKS,
+            TRACK_STATE_CHANGE_LISTENER,
+            entity_ids,
+            job,
+        )
+
+    return remove_listener
+
+
+@callback
+def _async_add_state_change_event_jobs(
+    hass: HomeAssistant, entity_ids: Iterable[str], job: HassJob
+) -> None:
+    """Add a job to the state change listeners indexed by entity_id."""
     entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
 
     if TRACK_STATE_CHANGE_LISTENER not in hass.data:
@@ -289,23 +318,43 @@ def async_track_state_change_event(
             event_filter=_async_state_change_filter,
         )
 
-    job = HassJob(action)
-
     for entity_id in entity_ids:
         entity_callbacks.setdefault(entity_id, []).append(job)
 
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            job,
+
+@callback
+def _async_add_state_change_domain_jobs(
+    hass: HomeAssistant, domains: Iterable[str], job: HassJob
+) -> None:
+    """Add a job to the state change listeners indexed by domain.
+
+    The MATCH_ALL domain receives the state changes of all domains.
+    """
+    domain_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_DOMAIN_CALLBACKS, {})
+
+    if TRACK_STATE_CHANGE_DOMAIN_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_change_filter(event: Event) -> bool:
+            """Filter state changes by domain."""
+            return (
+                MATCH_ALL in domain_callbacks
+                or split_entity_id(event.data["entity_id"])[0] in domain_callbacks
+            )
+
+        @callback
+        def _async_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes by domain."""
+            _async_dispatch_domain_event(hass, event, domain_callbacks)
+
+        hass.data[TRACK_STATE_CHANGE_DOMAIN_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            _async_state_change_dispatcher,
+            event_filter=_async_state_change_filter,
         )
 
-    return remove_listener
+    for domain in domains:
+        domain_callbacks.setdefault(domain, []).append(job)
 
 
 @callback
@@ -535,7 +584,12 @@ def _async_string_to_lower_list(instr: Union[str, Iterable[str]]) -> List[str]:
 
 
 class _TrackStateChangeFiltered:
-    """Handle removal / refresh of tracker."""
+    """Handle removal / refresh of tracker.
+
+    Tracked domains and entities are kept in the shared state change
+    indexes, which are updated incrementally when the tracked states
+    change.
+    """
 
     def __init__(
         self,
@@ -545,28 +599,15 @@ class _TrackStateChangeFiltered:
     ):
         """Handle removal / refresh of tracker init."""
         self.hass = hass
-        self._action = action
-        self._listeners: Dict[str, Callable] = {}
+        self._job = HassJob(action)
         self._last_track_states: TrackStates = track_states
+        self._domains: Set[str] = set()
+        self._entities: Set[str] = set()
 
     @callback
     def async_setup(self) -> None:
         """Create listeners to track states."""
-        track_states = self._last_track_states
-
-        if (
-            not track_states.all_states
-            and not track_states.domains
-            and not track_states.entities
-        ):
-            return
-
-        if track_states.all_states:
-            self._setup_all_listener()
-            return
-
-        self._setup_domains_listener(track_states.domains)
-        self._setup_entities_listener(track_states.domains, track_states.entities)
+        self._async_update_indexes(self._last_track_states)
 
     @property
     def listeners(self) -> Dict:
@@ -584,77 +625,59 @@ class _TrackStateChangeFiltered:
         last_track_states = self._last_track_states
         self._last_track_states = new_track_states
 
-        had_all_listener = last_track_states.all_states
-
-        if new_track_states.all_states:
-            if had_all_listener:
-                return
-            self._cancel_listener(_DOMAINS_LISTENER)
-            self._cancel_listener(_ENTITIES_LISTENER)
-            self._setup_all_listener()
-            return
-
-        if had_all_listener:
-            self._cancel_listener(_ALL_LISTENER)
-
-        domains_changed = new_track_states.domains != last_track_states.domains
-
-        if had_all_listener or domains_changed:
-            domains_changed = True
-            self._cancel_listener(_DOMAINS_LISTENER)
-            self._setup_domains_listener(new_track_states.domains)
-
-        if (
-            had_all_listener
-            or domains_changed
-            or new_track_states.entities != last_track_states.entities
-        ):
-            self._cancel_listener(_ENTITIES_LISTENER)
-            self._setup_entities_listener(
-                new_track_states.domains, new_track_states.entities
-            )
+        if new_track_states != last_track_states:
+            self._async_update_indexes(new_track_states)
 
     @callback
     def async_remove(self) -> None:
         """Cancel the listeners."""
-        for key in list(self._listeners):
-            self._listeners.pop(key)()
-
-    @callback
-    def _cancel_listener(self, listener_name: str) -> None:
-        if listener_name not in self._listeners:
-            return
-
-        self._listeners.pop(listener_name)()
-
-    @callback
-    def _setup_entities_listener(self, domains: Set, entities: Set) -> None:
-        if domains:
-            entities = entities.copy()
-            entities.update(self.hass.states.async_entity_ids(domains))
-
-        # Entities has changed to none
-        if not entities:
-            return
-
-        self._listeners[_ENTITIES_LISTENER] = async_track_state_change_event(
-            self.hass, entities, self._action
-        )
+        self._async_update_indexes(TrackStates(False, set(), set()))
 
     @callback
-    def _setup_domains_listener(self, domains: Set) -> None:
-        if not domains:
-            return
-
-        self._listeners[_DOMAINS_LISTENER] = async_track_state_added_domain(
-            self.hass, domains, self._action
-        )
+    def _async_update_indexes(self, track_states: TrackStates) -> None:
+        """Add and remove the changed domains and entities in the indexes."""
+        if track_states.all_states:
+            domains = {MATCH_ALL}
+            entities: Set[str] = set()
+        else:
+            domains = set(track_states.domains or ())
+            entities = set(track_states.entities or ())
+            if domains:
+                # State changes of these are already routed by domain
+                entities = {
+                    entity_id
+                    for entity_id in entities
+                    if split_entity_id(entity_id)[0] not in domains
+                }
+
+        # Add before removing so the index listeners are not recreated
+        if domains - self._domains:
+            _async_add_state_change_domain_jobs(
+                self.hass, domains - self._domains, self._job
+            )
+        if entities - self._entities:
+            _async_add_state_change_event_jobs(
+                self.hass, entities - self._entities, self._job
+            )
+        if self._domains - domains:
+            _async_remove_indexed_listeners(
+                self.hass,
+                TRACK_STATE_CHANGE_DOMAIN_CALLBACKS,
+                TRACK_STATE_CHANGE_DOMAIN_LISTENER,
+                self._domains - domains,
+                self._job,
+            )
+        if self._entities - entities:
+            _async_remove_indexed_listeners(
+                self.hass,
+                TRACK_STATE_CHANGE_CALLBACKS,
+                TRACK_STATE_CHANGE_LISTENER,
+                self._entities - entities,
+                self._job,
+            )
 
-    @callback
-    def _setup_all_listener(self) -> None:
-        self._listeners[_ALL_LISTENER] = self.hass.bus.async_listen(
-            EVENT_STATE_CHANGED, self._action
-        )
+        self._domains = domains
+        self._entities = entities
 
 
 @callback
@@ -1228,6 +1251,117 @@ def async_call_later(
 call_later = threaded_listener_factory(async_call_later)
 
 
+class _TimeScheduler:
+    """Schedule repeating time listeners on a single event loop timer.
+
+    Listeners that are due at the same point in time share a bucket and
+    are dispatched as one batch. Only the earliest bucket is armed as a
+    point in time listener.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._buckets: Dict[datetime, Dict[int, Callable[[datetime], None]]] = {}
+        self._times: List[datetime] = []
+        self._ids = itertools.count()
+        self._fire_job = HassJob(self._async_fire)
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self._timer_time: Optional[datetime] = None
+
+    @callback
+    def async_schedule(
+        self, point_in_time: datetime, action: Callable[[datetime], None]
+    ) -> CALLBACK_TYPE:
+        """Call action once with point_in_time when it has been reached."""
+        point_in_time = dt_util.as_utc(point_in_time)
+        bucket = self._buckets.get(point_in_time)
+        if bucket is None:
+            bucket = self._buckets[point_in_time] = {}
+            heapq.heappush(self._times, point_in_time)
+
+        key = next(self._ids)
+        bucket[key] = action
+
+        if self._timer_time is None or point_in_time < self._timer_time:
+            self._async_arm()
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the scheduled action."""
+            bucket.pop(key, None)
+            if bucket or self._buckets.get(point_in_time) is not bucket:
+                return
+            del self._buckets[point_in_time]
+            if not self._buckets and self._unsub_timer is not None:
+                self._unsub_timer()
+                self._unsub_timer = self._timer_time = None
+
+        return remove_listener
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest bucket."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = self._timer_time = None
+
+        times = self._times
+        # Drop times of buckets that have been emptied
+        while times and times[0] not in self._buckets:
+            heapq.heappop(times)
+        if not times:
+            return
+
+        self._timer_time = times[0]
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._fire_job, self._timer_time
+        )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Dispatch all buckets that are due."""
+        self._unsub_timer = self._timer_time = None
+
+        # Other buckets can be due by now as well
+        due_time = max(now, time_tracker_utcnow())
+        times = self._times
+        due = []
+        while times and times[0] <= due_time:
+            point_in_time = heapq.heappop(times)
+            bucket = self._buckets.pop(point_in_time, None)
+            if bucket:
+                due.append((point_in_time, bucket))
+
+        for point_in_time, bucket in due:
+            # Listeners get their point in time, unless the timer
+            # was fired with a later time
+            point_in_time = max(point_in_time, now)
+            for key in list(bucket):
+                # Listeners can be removed by earlier listeners in the batch
+                action = bucket.pop(key, None)
+                if action is None:
+                    continue
+                try:
+                    action(point_in_time)
+                except Exception as err:  # pylint: disable=broad-except
+                    self.hass.loop.call_exception_handler(
+                        {"message": "Error running time listener", "exception": err}
+                    )
+
+        if self._unsub_timer is None:
+            self._async_arm()
+
+
+@callback
+def _async_time_scheduler(hass: HomeAssistant) -> _TimeScheduler:
+    """Return the time scheduler of this instance."""
+    scheduler: Optional[_TimeScheduler] = hass.data.get(TRACK_TIME_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[TRACK_TIME_SCHEDULER] = _TimeScheduler(hass)
+    return scheduler
+
+
 @callback
 @bind_hass
 def async_track_time_interval(
@@ -1236,8 +1370,8 @@ def async_track_time_interval(
     interval: timedelta,
 ) -> CALLBACK_TYPE:
     """Add a listener that fires repetitively at every timedelta interval."""
-    remove = None
-    interval_listener_job = None
+    scheduler = _async_time_scheduler(hass)
+    remove: Optional[CALLBACK_TYPE] = None
 
     job = HassJob(action)
 
@@ -1249,19 +1383,16 @@ def async_track_time_interval(
     def interval_listener(now: datetime) -> None:
         """Handle elapsed intervals."""
         nonlocal remove
-        nonlocal interval_listener_job
 
-        remove = async_track_point_in_utc_time(
-            hass, interval_listener_job, next_interval()  # type: ignore
-        )
+        remove = scheduler.async_schedule(next_interval(), interval_listener)
         hass.async_run_hass_job(job, now)
 
-    interval_listener_job = HassJob(interval_listener)
-    remove = async_track_point_in_utc_time(hass, interval_listener_job, next_interval())
+    remove = scheduler.async_schedule(next_interval(), interval_listener)
 
     def remove_listener() -> None:
         """Remove interval listener."""
-        remove()  # type: ignore
+        assert remove is not None
+        remove()
 
     return remove_listener
 
@@ -1360,6 +1491,25 @@ track_sunset = threaded_listener_factory(async_track_sunset)
 time_tracker_utcnow = dt_util.utcnow
 
 
+@ft.lru_cache(maxsize=1024)
+def _find_next_time_pattern_time(
+    now: datetime,
+    time_zone: Optional[tzinfo],
+    seconds: Tuple[int, ...],
+    minutes: Tuple[int, ...],
+    hours: Tuple[int, ...],
+) -> datetime:
+    """Return the next time matching a time pattern.
+
+    Listeners sharing a pattern fire together, so the result is cached.
+    """
+    if time_zone is not None:
+        now = now.astimezone(time_zone)
+    return dt_util.find_next_time_expression_time(
+        now, list(seconds), list(minutes), list(hours)
+    )
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -1383,15 +1533,19 @@ def async_track_utc_time_change(
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
-    matching_seconds = dt_util.parse_time_expression(second, 0, 59)
-    matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
-    matching_hours = dt_util.parse_time_expression(hour, 0, 23)
+    matching_seconds = tuple(dt_util.parse_time_expression(second, 0, 59))
+    matching_minutes = tuple(dt_util.parse_time_expression(minute, 0, 59))
+    matching_hours = tuple(dt_util.parse_time_expression(hour, 0, 23))
+    scheduler = _async_time_scheduler(hass)
 
     def calculate_next(now: datetime) -> datetime:
         """Calculate and set the next time the trigger should fire."""
-        localized_now = dt_util.as_local(now) if local else now
-        return dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
+        return _find_next_time_pattern_time(
+            now.replace(microsecond=0),
+            dt_util.DEFAULT_TIME_ZONE if local else None,
+            matching_seconds,
+            matching_minutes,
+            matching_hours,
         )
 
     time_listener: Optional[CALLBACK_TYPE] = None
@@ -1404,14 +1558,12 @@ def async_track_utc_time_change(
         now = time_tracker_utcnow()
         hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
 
-        time_listener = async_track_point_in_utc_time(
-            hass,
-            pattern_time_change_listener,
-            calculate_next(now + timedelta(seconds=1)),
+        time_listener = scheduler.async_schedule(
+            calculate_next(now + timedelta(seconds=1)), pattern_time_change_listener
         )
 
-    time_listener = async_track_point_in_utc_time(
-        hass, pattern_time_change_listener, calculate_next(dt_util.utcnow())
+    time_listener = scheduler.async_schedule(
+        calculate_next(dt_util.utcnow()), pattern_time_change_listener
     )
 
     @callback
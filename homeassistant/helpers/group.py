@@ -0,0 +1,105 @@
+"""Helper to expand groups into their member entities."""
+from typing import Any, Dict, Iterable, List, Tuple
+
+from homeassistant.const import ATTR_ENTITY_ID, ENTITY_MATCH_ALL, ENTITY_MATCH_NONE
+from homeassistant.core import split_entity_id
+from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.loader import bind_hass
+
+DATA_GROUP_MEMBERS = "group_members"
+
+GROUP_DOMAIN = "group"
+
+# Group entity id -> (members attribute of every group visited while
+# flattening it, flattened members)
+_GroupMembersEntry = Tuple[Tuple[Tuple[str, Any], ...], Tuple[str, ...]]
+
+
+@bind_hass
+def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> List[str]:
+    """Return entity_ids with group entity ids replaced by their members.
+
+    Async friendly.
+    """
+    found_ids: Dict[str, None] = {}
+    for entity_id in entity_ids:
+        if not isinstance(entity_id, str) or entity_id in (
+            ENTITY_MATCH_NONE,
+            ENTITY_MATCH_ALL,
+        ):
+            continue
+
+        entity_id = entity_id.lower()
+
+        # If entity_id points at a group, expand it
+        if split_entity_id(entity_id)[0] == GROUP_DOMAIN:
+            found_ids.update(dict.fromkeys(get_group_members(hass, entity_id)))
+        else:
+            found_ids[entity_id] = None
+
+    return list(found_ids)
+
+
+@bind_hass
+def get_group_members(hass: HomeAssistantType, entity_id: str) -> Tuple[str, ...]:
+    """Return the members of a group with nested groups flattened.
+
+    The result is cached until the membership of the group, or of any group
+    nested in it, changes.
+
+    Async friendly.
+    """
+    cache: Dict[str, _GroupMembersEntry] = hass.data.setdefault(DATA_GROUP_MEMBERS, {})
+    entry = cache.get(entity_id)
+
+    if entry is not None:
+        visited, members = entry
+        if all(
+            _members_attribute(hass, group_id) is group_members
+            for group_id, group_members in visited
+        ):
+            return members
+
+    visited_groups: Dict[str, Any] = {}
+    found_ids: Dict[str, None] = {}
+    _flatten_group(hass, entity_id, visited_groups, found_ids)
+    members = tuple(found_ids)
+    cache[entity_id] = (tuple(visited_groups.items()), members)
+    return members
+
+
+def _members_attribute(hass: HomeAssistantType, entity_id: str) -> Any:
+    """Return the raw members attribute of a group."""
+    state = hass.states.get(entity_id)
+
+    if state is None:
+        return None
+
+    return state.attributes.get(ATTR_ENTITY_ID)
+
+
+def _flatten_group(
+    hass: HomeAssistantType,
+    entity_id: str,
+    visited_groups: Dict[str, Any],
+    found_ids: Dict[str, None],
+) -> None:
+    """Add the members of a group and its nested groups to found_ids."""
+    members = visited_groups[entity_id] = _members_attribute(hass, entity_id)
+
+    if not members:
+        return
+
+    for member_id in members:
+        if not isinstance(member_id, str) or member_id in (
+            ENTITY_MATCH_NONE,
+            ENTITY_MATCH_ALL,
+        ):
+            continue
+
+        member_id = member_id.lower()
+
+        if split_entity_id(member_id)[0] != GROUP_DOMAIN:
+            found_ids[member_id] = None
+        elif member_id not in visited_groups:
+            _flatten_group(hass, member_id, visited_groups, found_ids)
@@ -49,6 +49,7 @@ from homeassistant.helpers import (
     entity_registry,
     template,
 )
+from homeassistant.helpers.group import expand_entity_ids
 from homeassistant.helpers.typing import ConfigType, HomeAssistantType, TemplateVarsType
 from homeassistant.loader import (
     MAX_LOAD_CONCURRENTLY,
@@ -308,7 +309,7 @@ async def async_extract_referenced_entity_ids(
             entity_ids = [entity_ids]
 
         if expand_group:
-            entity_ids = hass.components.group.expand_entity_ids(entity_ids)
+            entity_ids = expand_entity_ids(hass, entity_ids)
 
         selected.referenced.update(entity_ids)
 
@@ -354,22 +355,28 @@ async def async_extract_referenced_entity_ids(
                 selected.missing_areas.add(area_id)
                 continue
 
-        # Find entities tied to an area
-        for entity_entry in ent_reg.entities.values():
-            if entity_entry.area_id in area_lookup:
+        for area_id in area_lookup:
+            # Find entities tied to an area
+            for entity_entry in entity_registry.async_entries_for_area(
+                ent_reg, area_id
+            ):
                 selected.indirectly_referenced.add(entity_entry.entity_id)
 
-        # Find devices for this area
-        for device_entry in dev_reg.devices.values():
-            if device_entry.area_id in area_lookup:
+            # Find devices for this area
+            for device_entry in device_registry.async_entries_for_area(
+                dev_reg, area_id
+            ):
                 picked_devices.add(device_entry.id)
 
     if not picked_devices:
         return selected
 
-    for entity_entry in ent_reg.entities.values():
-        if not entity_entry.area_id and entity_entry.device_id in picked_devices:
-            selected.indirectly_referenced.add(entity_entry.entity_id)
+    for device_id in picked_devices:
+        for entity_entry in entity_registry.async_entries_for_device(
+            ent_reg, device_id, include_disabled_entities=True
+        ):
+            if not entity_entry.area_id:
+                selected.indirectly_referenced.add(entity_entry.entity_id)
 
     return selected
 
@@ -482,22 +489,26 @@ def async_set_service_schema(
 @bind_hass
 async def entity_service_call(
     hass: HomeAssistantType,
-    platforms: Iterable["EntityPlatform"],
+    platforms: Union[Iterable["EntityPlatform"], Dict[str, "Entity"]],
     func: Union[str, Callable[..., Any]],
     call: ha.ServiceCall,
     required_features: Optional[Iterable[int]] = None,
 ) -> None:
     """Handle an entity service call.
 
+    The entities to call are taken from the platforms or from a dict of all
+    entities of the domain by entity id.
+
     Calls all platforms simultaneously.
     """
     if call.context.user_id:
         user = await hass.auth.async_get_user(call.context.user_id)
         if user is None:
             raise UnknownUser(context=call.context)
-        entity_perms: Optional[
-            Callable[[str, str], bool]
-        ] = user.permissions.check_entity
+        if user.permissions.access_all_entities(POLICY_CONTROL):
+            entity_perms: Optional[Callable[[str, str], bool]] = None
+        else:
+            entity_perms = user.permissions.check_entity
     else:
         entity_perms = None
 
@@ -522,47 +533,41 @@ async def entity_service_call(
     else:
         data = call
 
-    # Check the permissions
+    if isinstance(platforms, dict):
+        entity_lookups: List[Dict[str, "Entity"]] = [platforms]
+    else:
+        entity_lookups = [platform.entities for platform in platforms]
 
     # A list with entities to call the service on.
     entity_candidates: List["Entity"] = []
 
-    if entity_perms is None:
-        for platform in platforms:
-            if target_all_entities:
-                entity_candidates.extend(platform.entities.values())
-            else:
-                assert all_referenced is not None
-                entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in all_referenced
-                    ]
-                )
-
-    elif target_all_entities:
-        # If we target all entities, we will select all entities the user
-        # is allowed to control.
-        for platform in platforms:
-            entity_candidates.extend(
-                [
-                    entity
-                    for entity in platform.entities.values()
-                    if entity_perms(entity.entity_id, POLICY_CONTROL)
-                ]
-            )
-
+    if target_all_entities:
+        for entity_lookup in entity_lookups:
+            entity_candidates.extend(entity_lookup.values())
     else:
         assert all_referenced is not None
 
-        for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in all_referenced:
-                    continue
+        # Only look up the targeted entities, sorted so the calls happen in
+        # the same order every time
+        for entity_id in sorted(all_referenced):
+            for entity_lookup in entity_lookups:
+                entity = entity_lookup.get(entity_id)
+                if entity is not None:
+                    entity_candidates.append(entity)
+                    break
 
+    # Check the permissions
+    if entity_perms is not None:
+        if target_all_entities:
+            # If we target all entities, we will select all entities the user
+            # is allowed to control.
+            entity_candidates = [
+                entity
+                for entity in entity_candidates
+                if entity_perms(entity.entity_id, POLICY_CONTROL)
+            ]
+        else:
+            for entity in entity_candidates:
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
                         context=call.context,
@@ -570,10 +575,6 @@ async def entity_service_call(
                         permission=POLICY_CONTROL,
                     )
 
-                platform_entities.append(entity)
-
-            entity_candidates.extend(platform_entities)
-
     if not target_all_entities:
         assert referenced is not None
 
@@ -1,5 +1,9 @@
 """Helper to help store data."""
 import asyncio
+from copy import deepcopy
+from functools import partial
+import hashlib
+import json
 from json import JSONEncoder
 import logging
 import os
@@ -7,7 +11,8 @@ from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
-from homeassistant.helpers.event import async_call_later
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import json as json_helper
 from homeassistant.loader import bind_hass
 from homeassistant.util import json as json_util
 
@@ -15,6 +20,7 @@ from homeassistant.util import json as json_util
 # mypy: no-check-untyped-defs
 
 STORAGE_DIR = ".storage"
+JOURNAL_SUFFIX = ".journal"
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -72,8 +78,20 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        journal: bool = False,
+        compact: bool = False,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        Compact files are written without indentation.
+
+        Journaling is off by default. With journal enabled, saves of
+        dictionaries append the changed top level values and list items to a
+        journal next to the file. Changes are found by comparing the data to
+        a copy of what was written, so only changed values are encoded. The
+        journal is folded into the file once it outgrows it, on the first
+        save after a restart and when Home Assistant shuts down.
+        """
         self.version = version
         self.key = key
         self.hass = hass
@@ -84,12 +102,25 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self._compact = compact
+        self._journal = journal
+        # Copy of the data as it is on disk. None until the next compaction.
+        self._journal_snapshot: Optional[Dict[str, Any]] = None
+        self._journal_token: Optional[str] = None
+        self._journal_size = 0
+        self._journal_document_size = 0
+        self._journal_compact = False
 
     @property
     def path(self):
         """Return the config path."""
         return self.hass.config.path(STORAGE_DIR, self.key)
 
+    @property
+    def journal_path(self):
+        """Return the journal path."""
+        return self.path + JOURNAL_SUFFIX
+
     async def async_load(self) -> Union[Dict, List, None]:
         """Load data.
 
@@ -121,9 +152,7 @@ class Store:
             if "data_func" in data:
                 data["data"] = data.pop("data_func")()
         else:
-            data = await self.hass.async_add_executor_job(
-                json_util.load_json, self.path
-            )
+            data = await self.hass.async_add_executor_job(self._load_data, self.path)
 
             if data == {}:
                 return None
@@ -140,6 +169,72 @@ class Store:
 
         return stored
 
+    def _load_data(self, path: str) -> Dict:
+        """Load the data and apply the changes recorded in the journal."""
+        journal_path = path + JOURNAL_SUFFIX
+        if not os.path.exists(journal_path):
+            return json_util.load_json(path)
+
+        try:
+            with open(path, encoding="utf-8") as fdesc:
+                document = fdesc.read()
+        except FileNotFoundError:
+            _LOGGER.debug("JSON file not found: %s", path)
+            return {}
+        except OSError as error:
+            _LOGGER.exception("JSON file reading failed: %s", path)
+            raise HomeAssistantError(error) from error
+
+        try:
+            data = json.loads(document)
+        except ValueError as error:
+            _LOGGER.exception("Could not parse JSON content: %s", path)
+            raise HomeAssistantError(error) from error
+
+        self._replay_journal(journal_path, _journal_token(document), data["data"])
+        return data
+
+    def _replay_journal(self, path: str, token: str, stored: Dict) -> None:
+        """Apply the changes recorded in the journal to the stored data."""
+        try:
+            with open(path, encoding="utf-8") as fdesc:
+                lines = fdesc.read().splitlines()
+        except FileNotFoundError:
+            return
+        except OSError as error:
+            _LOGGER.exception("Journal file reading failed: %s", path)
+            raise HomeAssistantError(error) from error
+
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            header = None
+
+        # The journal was started for an earlier version of the file. That
+        # version was replaced when the journal was folded into the file.
+        if not isinstance(header, dict) or header.get("journal") != token:
+            return
+
+        for line in lines[1:]:
+            try:
+                changes = json.loads(line)
+            except ValueError:
+                # Writing the record was interrupted, it's the last one
+                _LOGGER.warning("Ignoring incomplete record in journal %s", path)
+                return
+
+            for change in changes:
+                key = change["key"]
+                operation = change["op"]
+
+                if operation == "splice":
+                    index = change["index"]
+                    stored[key][index : index + change["delete"]] = change["items"]
+                elif operation == "set":
+                    stored[key] = change["value"]
+                else:
+                    stored.pop(key, None)
+
     async def async_save(self, data: Union[Dict, List]) -> None:
         """Save data."""
         self._data = {"version": self.version, "key": self.key, "data": data}
@@ -161,9 +256,11 @@ class Store:
         if self.hass.state == CoreState.stopping:
             return
 
-        self._unsub_delay_listener = async_call_later(
-            self.hass, delay, self._async_callback_delayed_write
-        )
+        # Saves are often requested in bursts, e.g. when an integration adds
+        # many entities, so re-arm a plain loop timer for each request.
+        self._unsub_delay_listener = self.hass.loop.call_later(
+            delay, self._async_callback_delayed_write
+        ).cancel
 
     @callback
     def _async_ensure_final_write_listener(self):
@@ -187,17 +284,20 @@ class Store:
             self._unsub_delay_listener()
             self._unsub_delay_listener = None
 
-    async def _async_callback_delayed_write(self, _now):
+    @callback
+    def _async_callback_delayed_write(self):
         """Handle a delayed write callback."""
         # catch the case where a call is scheduled and then we stop Home Assistant
         if self.hass.state == CoreState.stopping:
             self._async_ensure_final_write_listener()
             return
-        await self._async_handle_write_data()
+        self.hass.async_create_task(self._async_handle_write_data())
 
     async def _async_callback_final_write(self, _event):
         """Handle a write because Home Assistant is in final write state."""
         self._unsub_final_write_listener = None
+        # Leave a single file behind when shutting down
+        self._journal_compact = True
         await self._async_handle_write_data()
 
     async def _async_handle_write_data(self, *_args):
@@ -208,6 +308,11 @@ class Store:
 
             if self._data is None:
                 # Another write already consumed the data
+                if self._journal_compact and self._journal_size:
+                    await self._async_write_executor_job(
+                        self._compact_journal, self.path
+                    )
+                self._journal_compact = False
                 return
 
             data = self._data
@@ -217,20 +322,131 @@ class Store:
 
             self._data = None
 
-            try:
-                await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data
-                )
-            except (json_util.SerializationError, json_util.WriteError) as err:
-                _LOGGER.error("Error writing config for %s: %s", self.key, err)
+            await self._async_write_executor_job(self._write_data, self.path, data)
+
+            if self._journal_size:
+                self._async_ensure_final_write_listener()
+
+    async def _async_write_executor_job(self, target: Callable, *args: Any) -> None:
+        """Run a write in the executor and log errors."""
+        try:
+            await self.hass.async_add_executor_job(target, *args)
+        except (json_util.SerializationError, json_util.WriteError) as err:
+            _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
     def _write_data(self, path: str, data: Dict) -> None:
         """Write the data."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
+        stored = data["data"]
+        if (
+            self._journal
+            and isinstance(stored, dict)
+            and all(isinstance(key, str) for key in stored)
+        ):
+            self._write_journal_data(path, data)
+            return
+
+        # The file written here is not based on the journal
+        self._journal_snapshot = None
+        self._journal_size = 0
+        self._journal_compact = False
+
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        json_util.save_json(
+            path, data, self._private, encoder=self._encoder, compact=self._compact
+        )
+
+    def _write_journal_data(self, path: str, data: Dict) -> None:
+        """Append the changes to the journal or fold it into the file."""
+        compact, self._journal_compact = self._journal_compact, False
+
+        if compact or self._journal_snapshot is None:
+            self._compact_journal(path, data)
+            return
+
+        if self._encoder in (None, json_helper.JSONEncoder):
+            encode = partial(json_helper.json_dumps, allow_nan=True)
+        else:
+            encode = self._encoder(separators=(",", ":")).encode
+
+        try:
+            changes = _journal_changes(self._journal_snapshot, data["data"], encode)
+        except (ValueError, TypeError) as error:
+            # The snapshot may be partly updated, start over from the file
+            self._journal_snapshot = None
+            msg = f"Failed to serialize to JSON: {path}. Bad data at {json_util.format_unserializable_data(json_util.find_paths_unserializable_data(data))}"
+            _LOGGER.error(msg)
+            raise json_util.SerializationError(msg) from error
+
+        if not changes:
+            return
+
+        record = f"[{','.join(changes)}]\n"
+
+        if not self._journal_size:
+            record = json.dumps({"journal": self._journal_token}) + "\n" + record
+
+        if self._journal_size + len(record) > self._journal_document_size:
+            self._compact_journal(path, data)
+            return
+
+        _LOGGER.debug("Writing journal for %s to %s", self.key, path)
+
+        try:
+            fdesc = os.open(
+                path + JOURNAL_SUFFIX,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                0o600 if self._private else 0o644,
+            )
+            with open(fdesc, "w", encoding="utf-8") as journal:
+                journal.write(record)
+        except OSError as error:
+            # Start over from a complete file on the next write
+            self._journal_snapshot = None
+            _LOGGER.exception("Writing journal failed: %s", path)
+            raise json_util.WriteError(error) from error
+
+        self._journal_size += len(record)
+
+    def _compact_journal(self, path: str, data: Optional[Dict] = None) -> None:
+        """Write the data to the file and empty the journal.
+
+        Without data, the snapshot of the data on disk is written.
+        """
+        if data is None:
+            assert self._journal_snapshot is not None
+            data = {
+                "version": self.version,
+                "key": self.key,
+                "data": self._journal_snapshot,
+            }
+
+        self._journal_snapshot = None
+
+        try:
+            document = json_util.encode_json(
+                data, encoder=self._encoder, compact=self._compact
+            )
+        except TypeError as error:
+            msg = f"Failed to serialize to JSON: {path}. Bad data at {json_util.format_unserializable_data(json_util.find_paths_unserializable_data(data))}"
+            _LOGGER.error(msg)
+            raise json_util.SerializationError(msg) from error
+
+        _LOGGER.debug("Writing data for %s to %s", self.key, path)
+        json_util.write_utf8_file(path, document, self._private)
+
+        # The journal refers to this version of the file by its hash
+        self._journal_snapshot = deepcopy(data["data"])
+        self._journal_token = _journal_token(document)
+        self._journal_size = 0
+        self._journal_document_size = len(document)
+
+        try:
+            os.unlink(path + JOURNAL_SUFFIX)
+        except FileNotFoundError:
+            pass
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -240,8 +456,65 @@ class Store:
         """Remove all data."""
         self._async_cleanup_delay_listener()
         self._async_cleanup_final_write_listener()
+        self._journal_snapshot = None
+        self._journal_size = 0
 
-        try:
-            await self.hass.async_add_executor_job(os.unlink, self.path)
-        except FileNotFoundError:
-            pass
+        for path in (self.path, self.journal_path):
+            try:
+                await self.hass.async_add_executor_job(os.unlink, path)
+            except FileNotFoundError:
+                pass
+
+
+def _journal_token(document: str) -> str:
+    """Return the token a journal uses to refer to a version of the file."""
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def _journal_changes(
+    snapshot: Dict[str, Any], new: Dict[str, Any], encode: Callable[[Any], str]
+) -> List[str]:
+    """Return the encoded changes that turn snapshot into new.
+
+    The snapshot is updated to a copy of new. Only changed values are encoded.
+    """
+    changes = []
+
+    for key in [key for key in snapshot if key not in new]:
+        changes.append(f'{{"op":"remove","key":{json.dumps(key)}}}')
+        del snapshot[key]
+
+    for key, value in new.items():
+        old_value = snapshot.get(key)
+
+        if not isinstance(value, list) or not isinstance(old_value, list):
+            if key not in snapshot or value != old_value:
+                changes.append(
+                    f'{{"op":"set","key":{json.dumps(key)},"value":{encode(value)}}}'
+                )
+                snapshot[key] = deepcopy(value)
+            continue
+
+        # Replace the items between the unchanged head and tail of the list
+        start = 0
+        common = min(len(value), len(old_value))
+        while start < common and value[start] == old_value[start]:
+            start += 1
+
+        end = 0
+        common -= start
+        while end < common and value[-1 - end] == old_value[-1 - end]:
+            end += 1
+
+        if start + end == len(value) == len(old_value):
+            continue
+
+        items = value[start : len(value) - end]
+        changes.append(
+            f'{{"op":"splice","key":{json.dumps(key)},"index":{start},'
+            f'"delete":{len(old_value) - start - end},'
+            f'"items":[{",".join(encode(item) for item in items)}]}}'
+        )
+        old_value[start : len(old_value) - end] = deepcopy(items)
+
+    return changes
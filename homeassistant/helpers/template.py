@@ -6,14 +6,27 @@ import asyncio
 import base64
 import collections.abc
 from datetime import datetime, timedelta
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 import json
 import logging
 import math
 from operator import attrgetter
 import random
 import re
-from typing import Any, Dict, Generator, Iterable, Optional, Type, Union, cast
+import time
+from types import CodeType
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -28,10 +41,18 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
     LENGTH_METERS,
     STATE_UNKNOWN,
 )
-from homeassistant.core import State, callback, split_entity_id, valid_entity_id
+from homeassistant.core import (
+    CoreState,
+    State,
+    callback,
+    split_entity_id,
+    valid_entity_id,
+)
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import entity_registry, location as loc_helper
 from homeassistant.helpers.typing import HomeAssistantType, TemplateVarsType
@@ -49,11 +70,18 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
+DATA_BYTECODE_CACHE = "template.bytecode_cache"
+BYTECODE_CACHE_SIZE = 10000
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
 
+# Number of compiled patterns and parsed values kept by the filter caches.
+# The caches are shared by all environments and instances in the process,
+# which is safe as the cached functions only depend on their arguments.
+FILTER_CACHE_SIZE = 256
+
 _RESERVED_NAMES = {"contextfunction", "evalcontextfunction", "environmentfunction"}
 
 _GROUP_DOMAIN_PREFIX = "group."
@@ -218,7 +246,7 @@ class RenderInfo:
     def _filter_domains_and_entities(self, entity_id: str) -> bool:
         """Template should re-render if the entity state changes when we match specific domains or entities."""
         return (
-            split_entity_id(entity_id)[0] in self.domains or entity_id in self.entities
+            entity_id in self.entities or split_entity_id(entity_id)[0] in self.domains
         )
 
     def _filter_entities(self, entity_id: str) -> bool:
@@ -1148,17 +1176,25 @@ def square_root(value):
 def timestamp_custom(value, date_format=DATE_STR_FORMAT, local=True):
     """Filter to convert given timestamp to format."""
     try:
-        date = dt_util.utc_from_timestamp(value)
-
-        if local:
-            date = dt_util.as_local(date)
-
-        return date.strftime(date_format)
+        return _format_timestamp(
+            value, date_format, dt_util.DEFAULT_TIME_ZONE if local else None
+        )
     except (ValueError, TypeError):
         # If timestamp can't be converted
         return value
 
 
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _format_timestamp(value, date_format, time_zone):
+    """Format a timestamp, in the given time zone if set."""
+    date = dt_util.utc_from_timestamp(value)
+
+    if time_zone is not None:
+        date = date.astimezone(time_zone)
+
+    return date.strftime(date_format)
+
+
 def timestamp_local(value):
     """Filter to convert given timestamp to local date/time."""
     try:
@@ -1190,11 +1226,17 @@ def forgiving_as_timestamp(value):
 def strptime(string, fmt):
     """Parse a time string to datetime."""
     try:
-        return datetime.strptime(string, fmt)
+        return _parse_time(string, fmt)
     except (ValueError, AttributeError, TypeError):
         return string
 
 
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _parse_time(string, fmt):
+    """Parse a time string to datetime, the result is immutable."""
+    return datetime.strptime(string, fmt)
+
+
 def fail_when_undefined(value):
     """Filter to force a failure when the value is undefined."""
     if isinstance(value, jinja2.Undefined):
@@ -1210,12 +1252,18 @@ def forgiving_float(value):
         return value
 
 
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _compile_regex(pattern, flags):
+    """Compile a regular expression."""
+    return re.compile(pattern, flags)
+
+
 def regex_match(value, find="", ignorecase=False):
     """Match value using regex."""
     if not isinstance(value, str):
         value = str(value)
     flags = re.I if ignorecase else 0
-    return bool(re.match(find, value, flags))
+    return bool(_compile_regex(find, flags).match(value))
 
 
 def regex_replace(value="", find="", replace="", ignorecase=False):
@@ -1223,8 +1271,7 @@ def regex_replace(value="", find="", replace="", ignorecase=False):
     if not isinstance(value, str):
         value = str(value)
     flags = re.I if ignorecase else 0
-    regex = re.compile(find, flags)
-    return regex.sub(replace, value)
+    return _compile_regex(find, flags).sub(replace, value)
 
 
 def regex_search(value, find="", ignorecase=False):
@@ -1232,7 +1279,7 @@ def regex_search(value, find="", ignorecase=False):
     if not isinstance(value, str):
         value = str(value)
     flags = re.I if ignorecase else 0
-    return bool(re.search(find, value, flags))
+    return bool(_compile_regex(find, flags).search(value))
 
 
 def regex_findall_index(value, find="", index=0, ignorecase=False):
@@ -1240,7 +1287,7 @@ def regex_findall_index(value, find="", index=0, ignorecase=False):
     if not isinstance(value, str):
         value = str(value)
     flags = re.I if ignorecase else 0
-    return re.findall(find, value, flags)[index]
+    return _compile_regex(find, flags).findall(value)[index]
 
 
 def bitwise_and(first_value, second_value):
@@ -1317,6 +1364,102 @@ def urlencode(value):
     return urllib_urlencode(value).encode("utf-8")
 
 
+class FilterCacheInfo(NamedTuple):
+    """Statistics of a template filter cache."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+def filter_cache_info() -> Dict[str, FilterCacheInfo]:
+    """Return the hit and miss counters of the filter caches.
+
+    The caches are process wide, so the counters cover the templates of all
+    environments and instances.
+    """
+    return {
+        name: FilterCacheInfo(*cached.cache_info())
+        for name, cached in (
+            ("regex", _compile_regex),
+            ("strptime", _parse_time),
+            ("timestamp_custom", _format_timestamp),
+        )
+    }
+
+
+class TemplateBytecodeCache:
+    """In memory cache of the compiled code of the configured templates.
+
+    Only templates compiled while Home Assistant starts, which are the
+    templates of the configuration, are added. They are kept for the life
+    of the instance, so reloading an integration does not compile its
+    templates again. Templates rendered on demand later, like through the
+    API, are not kept.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the bytecode cache."""
+        self.hass = hass
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+        self.saved_time = 0.0
+        self._code: Dict[Tuple[bool, str], Tuple[CodeType, float]] = {}
+
+    def get(self, source: str, limited: bool = False) -> Optional[CodeType]:
+        """Return the compiled code of a template source if it is cached."""
+        cached = self._code.get((limited, source))
+        if cached is None:
+            return None
+
+        code, compile_time = cached
+        self.hits += 1
+        self.saved_time += compile_time
+        return code
+
+    def set(
+        self, source: str, code: CodeType, compile_time: float, limited: bool = False
+    ) -> None:
+        """Add freshly compiled code for a template source."""
+        self.misses += 1
+        self.compile_time += compile_time
+
+        if (
+            self.hass.state not in (CoreState.not_running, CoreState.starting)
+            or len(self._code) >= BYTECODE_CACHE_SIZE
+        ):
+            return
+
+        self._code[(limited, source)] = (code, compile_time)
+
+
+@callback
+def async_setup_bytecode_cache(hass: HomeAssistantType) -> None:
+    """Set up the template bytecode cache for this instance."""
+    bytecode_cache = TemplateBytecodeCache(hass)
+    hass.data[DATA_BYTECODE_CACHE] = bytecode_cache
+
+    @callback
+    def _async_started(_event):
+        """Report the time spent compiling templates while starting."""
+        _LOGGER.info(
+            "Compiled %d templates in %.2fs while starting",
+            bytecode_cache.misses,
+            bytecode_cache.compile_time,
+        )
+
+    @callback
+    def _async_stop(_event):
+        """Release the compiled templates."""
+        if hass.data.get(DATA_BYTECODE_CACHE) is bytecode_cache:
+            hass.data.pop(DATA_BYTECODE_CACHE)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_started)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1324,6 +1467,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__()
         self.hass = hass
+        self.limited = limited
         self.template_cache = weakref.WeakValueDictionary()
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
@@ -1465,9 +1609,24 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         cached = self.template_cache.get(source)
 
+        if cached is not None:
+            return cached
+
+        bytecode_cache = (
+            self.hass.data.get(DATA_BYTECODE_CACHE) if self.hass is not None else None
+        )
+        if bytecode_cache is not None:
+            cached = bytecode_cache.get(source, self.limited)
+
         if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+            start = time.perf_counter()
+            cached = super().compile(source)
+            if bytecode_cache is not None:
+                bytecode_cache.set(
+                    source, cached, time.perf_counter() - start, self.limited
+                )
 
+        self.template_cache[source] = cached
         return cached
 
 
@@ -3,17 +3,26 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
+import os
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_NOW,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+    MATCH_ALL,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_array
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -116,6 +125,57 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_few_listeners(hass):
+    """Fire events with a single MATCH_ALL and event listener."""
+    return await _fire_events_with_listeners(hass, 1, 1)
+
+
+@benchmark
+async def fire_events_many_listeners(hass):
+    """Fire events with 10 MATCH_ALL and 50 event listeners."""
+    return await _fire_events_with_listeners(hass, 10, 50)
+
+
+async def _fire_events_with_listeners(hass, match_all_listeners, event_listeners):
+    """Fire 100k events and run the listeners.
+
+    Listeners for unrelated event types are registered as well, so the
+    bus holds more than the event types being fired.
+    """
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10 ** 5
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for _ in range(match_all_listeners):
+        hass.bus.async_listen(MATCH_ALL, listener)
+    for idx in range(event_listeners):
+        hass.bus.async_listen(event_name, listener)
+        hass.bus.async_listen(f"{event_name}_{idx}", listener)
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    fired = timer()
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire * (match_all_listeners + event_listeners)
+
+    end = timer()
+    print(f"Fired {events_to_fire / (fired - start):.0f} events/s")
+
+    return end - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -144,6 +204,61 @@ async def time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def time_pattern_listeners(hass):
+    """Dispatch 10k time pattern listeners firing every second."""
+    return await _time_listeners(
+        hass,
+        lambda listener: hass.helpers.event.async_track_utc_time_change(
+            listener, second="*"
+        ),
+    )
+
+
+@benchmark
+async def time_interval_listeners(hass):
+    """Dispatch 10k time interval listeners firing every second."""
+    return await _time_listeners(
+        hass,
+        lambda listener: hass.helpers.event.async_track_time_interval(
+            listener, timedelta(seconds=1)
+        ),
+    )
+
+
+async def _time_listeners(hass, track):
+    """Run 10k listeners for three rounds and return the CPU time used."""
+    # pylint: disable=import-outside-toplevel
+    import time
+
+    listener_count = 10 ** 4
+    rounds = 3
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle time listener."""
+        nonlocal count
+        count += 1
+
+        if count == listener_count * rounds:
+            event.set()
+
+    start = time.process_time()
+
+    unsubs = [track(listener) for _ in range(listener_count)]
+    await event.wait()
+
+    runtime = time.process_time() - start
+    print(f"Dispatched {count / runtime:.0f} listener calls per CPU second")
+
+    for unsub in unsubs:
+        unsub()
+
+    return runtime
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -388,6 +503,874 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def mqtt_subscription_matching(hass):
+    """Match 100k topics against 10,002 discovery style subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt import Subscription, SubscriptionTrie
+
+    devices = 5000
+    topics_to_match = 10 ** 5
+
+    trie = SubscriptionTrie()
+    for idx in range(devices):
+        trie.add(Subscription(f"zigbee2mqtt/device_{idx}", None))
+        trie.add(Subscription(f"tele/tasmota_{idx}/+", None))
+    trie.add(Subscription("homeassistant/#", None))
+    trie.add(Subscription("zigbee2mqtt/bridge/#", None))
+
+    topics = [
+        f"zigbee2mqtt/device_{idx % devices}"
+        if idx % 2
+        else f"tele/tasmota_{idx % devices}/SENSOR"
+        for idx in range(topics_to_match)
+    ]
+
+    start = timer()
+
+    for topic in topics:
+        assert len(trie.matches(topic)) == 1
+
+    runtime = timer() - start
+    print(f"Matched {topics_to_match / runtime:.0f} topics/s")
+
+    return runtime
+
+
+@benchmark
+async def state_machine_set_unchanged(hass):
+    """Set the same state and attributes for 10k entities 10 times."""
+    return await _state_machine_set(hass, False)
+
+
+@benchmark
+async def state_machine_set_changed(hass):
+    """Set a new state for 10k entities 10 times."""
+    return await _state_machine_set(hass, True)
+
+
+async def _state_machine_set(hass, change_state):
+    """Write 10k entities with polling like attributes."""
+    entity_count = 10 ** 4
+    rounds = 10
+    entity_ids = [f"sensor.power_{idx}" for idx in range(entity_count)]
+
+    def attributes():
+        """Return a fresh attributes dict, as an entity write would."""
+        return {
+            "unit_of_measurement": "W",
+            "friendly_name": "Power",
+            "device_class": "power",
+            "icon": "mdi:flash",
+            "voltage": 230,
+        }
+
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "0", attributes())
+    await hass.async_block_till_done()
+
+    start = timer()
+
+    for round_ in range(1, rounds + 1):
+        state = str(round_) if change_state else "0"
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, state, attributes())
+
+    runtime = timer() - start
+    print(f"Set {entity_count * rounds / runtime:.0f} states/s")
+
+    await hass.async_block_till_done()
+
+    return runtime
+
+
+@benchmark
+async def state_memory(hass):
+    """Measure the memory used by 10k states with attributes."""
+    # pylint: disable=import-outside-toplevel
+    import tracemalloc
+
+    entity_count = 10 ** 4
+    attributes = {
+        "unit_of_measurement": "W",
+        "friendly_name": "Power",
+        "device_class": "power",
+    }
+
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start = timer()
+
+    states = [
+        core.State(f"sensor.power_{idx}", str(idx), attributes)
+        for idx in range(entity_count)
+    ]
+
+    runtime = timer() - start
+    used_memory = tracemalloc.get_traced_memory()[0] - start_memory
+    tracemalloc.stop()
+
+    assert len(states) == entity_count
+    print(f"Used {used_memory / entity_count:.0f} bytes per state")
+
+    return runtime
+
+
+@benchmark
+async def get_states_json(hass):
+    """Serialize 10k states 10 times using the cached state JSON."""
+    return await _get_states_json(
+        hass,
+        lambda states: json_array(state.as_json() for state in states),
+    )
+
+
+@benchmark
+async def get_states_json_uncached(hass):
+    """Serialize 10k states 10 times as a whole."""
+    return await _get_states_json(hass, JSON_DUMP)
+
+
+async def _get_states_json(hass, serialize):
+    """Serialize all states while 10% of them change between rounds."""
+    entity_count = 10 ** 4
+    rounds = 10
+    entity_ids = [f"sensor.power_{idx}" for idx in range(entity_count)]
+    attributes = {
+        "unit_of_measurement": "W",
+        "friendly_name": "Power",
+        "device_class": "power",
+        "icon": "mdi:flash",
+    }
+
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "0", attributes)
+    await hass.async_block_till_done()
+
+    start = timer()
+
+    for round_ in range(1, rounds + 1):
+        for entity_id in entity_ids[::rounds]:
+            hass.states.async_set(entity_id, str(round_), attributes)
+        serialize(hass.states.async_all())
+
+    runtime = timer() - start
+    print(f"Serialized {entity_count * rounds / runtime:.0f} states/s")
+
+    await hass.async_block_till_done()
+
+    return runtime
+
+
+@benchmark
+async def template_state_changes(hass):
+    """Change states watched by 800 template trackers."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+    from homeassistant.helpers.template import Template
+
+    sensor_count = 600
+    light_count = 200
+    rounds = 10
+    updates = 0
+
+    @core.callback
+    def listener(event, template_updates):
+        """Handle template updates."""
+        nonlocal updates
+        updates += len(template_updates)
+
+    for idx in range(sensor_count):
+        hass.states.async_set(f"sensor.temperature_{idx}", "0")
+    for idx in range(light_count):
+        hass.states.async_set(f"light.room_{idx}", "off")
+
+    templates = [
+        f"{{{{ states('sensor.temperature_{idx}') }}}}" for idx in range(sensor_count)
+    ]
+    templates += [
+        "{{ states.light | selectattr('state', 'eq', 'on') | list | count }}"
+    ] * 100
+    templates += ["{{ states | count }}"] * 100
+
+    start = timer()
+
+    for template in templates:
+        async_track_template_result(
+            hass, [TrackTemplate(Template(template, hass), None)], listener
+        )
+
+    for round_ in range(1, rounds + 1):
+        for idx in range(sensor_count):
+            hass.states.async_set(f"sensor.temperature_{idx}", str(round_))
+        hass.states.async_set(f"light.new_{round_}", "on")
+        await hass.async_block_till_done()
+
+    runtime = timer() - start
+    print(f"Handled {updates} template updates")
+
+    return runtime
+
+
+@benchmark
+async def add_entities(hass):
+    """Add 1k and 5k entities with registry entries to a platform."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers import device_registry, entity_registry
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_platform import EntityPlatform
+
+    class BenchmarkEntity(Entity):
+        """Entity with a unique id and a device shared with 3 other entities."""
+
+        should_poll = False
+
+        def __init__(self, idx):
+            """Initialize the entity."""
+            self._idx = idx
+
+        @property
+        def unique_id(self):
+            """Return the unique id."""
+            return f"sensor_{self._idx}"
+
+        @property
+        def name(self):
+            """Return the name."""
+            return f"Sensor {self._idx}"
+
+        @property
+        def device_info(self):
+            """Return the device info."""
+            device = self._idx // 4
+            return {"identifiers": {("benchmark", device)}, "name": f"Device {device}"}
+
+        @property
+        def state(self):
+            """Return the state."""
+            return self._idx
+
+    total = 0
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        # The registries are written concurrently when the benchmark ends
+        os.makedirs(hass.config.path(".storage"))
+        await device_registry.async_load(hass)
+        await entity_registry.async_load(hass)
+
+        for count in (10 ** 3, 5 * 10 ** 3):
+            config_entry = ConfigEntry(
+                1, "benchmark", "Benchmark", {}, "user", "local_push", {}
+            )
+            # Add the entities twice, the second time like after a restart
+            for run in ("new", "registered"):
+                platform = EntityPlatform(
+                    hass=hass,
+                    logger=logging.getLogger(__name__),
+                    domain="sensor",
+                    platform_name="benchmark",
+                    platform=None,
+                    scan_interval=timedelta(seconds=30),
+                    entity_namespace=None,
+                )
+                platform.config_entry = config_entry
+                entities = [BenchmarkEntity(idx) for idx in range(count)]
+
+                start = timer()
+                await platform.async_add_entities(entities)
+                await hass.async_block_till_done()
+                runtime = timer() - start
+                total += runtime
+                print(f"Added {count} {run} entities in {runtime:.3f}s")
+
+                await platform.async_reset()
+                for entity_id in hass.states.async_entity_ids():
+                    hass.states.async_remove(entity_id)
+                await hass.async_block_till_done()
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+
+    return total
+
+
+@benchmark
+async def service_target_resolution(hass):
+    """Resolve area and device targets of 1k service calls with 8k entities."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import (
+        area_registry,
+        device_registry,
+        entity_registry,
+        service,
+    )
+
+    area_count = 100
+    device_count = 2 * 10 ** 3
+    entity_count = 8 * 10 ** 3
+    call_count = 10 ** 3
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        # The registries are written concurrently when the benchmark ends
+        os.makedirs(hass.config.path(".storage"))
+        await area_registry.async_load(hass)
+        await device_registry.async_load(hass)
+        await entity_registry.async_load(hass)
+        area_reg = area_registry.async_get(hass)
+        dev_reg = device_registry.async_get(hass)
+        ent_reg = entity_registry.async_get(hass)
+
+        area_ids = [
+            area_reg.async_create(f"Area {idx}").id for idx in range(area_count)
+        ]
+        device_ids = []
+        for idx in range(device_count):
+            device = dev_reg.async_get_or_create(
+                config_entry_id="benchmark", identifiers={("benchmark", str(idx))}
+            )
+            dev_reg.async_update_device(device.id, area_id=area_ids[idx % area_count])
+            device_ids.append(device.id)
+        for idx in range(entity_count):
+            # Every 8th entity overrides the area of its device
+            ent_reg.async_get_or_create(
+                "light",
+                "benchmark",
+                str(idx),
+                device_id=device_ids[idx % device_count],
+                area_id=area_ids[idx % area_count] if idx % 8 == 0 else None,
+            )
+
+        calls = [
+            core.ServiceCall(
+                "light",
+                "turn_on",
+                {
+                    "area_id": area_ids[idx % area_count],
+                    "device_id": device_ids[idx % device_count],
+                },
+            )
+            for idx in range(call_count)
+        ]
+
+        start = timer()
+
+        for call in calls:
+            await service.async_extract_referenced_entity_ids(hass, call)
+
+        runtime = timer() - start
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+
+    print(f"Resolved {call_count / runtime:.0f} service call targets/s")
+
+    return runtime
+
+
+@benchmark
+async def expand_group_tree(hass):
+    """Resolve service calls targeting groups in a deep tree of groups."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import service
+
+    depth = 5
+    fanout = 4
+    call_count = 10 ** 3
+
+    def add_group(entity_id, level):
+        """Add a group with nested groups or lights as members."""
+        if level == depth:
+            members = tuple(f"light.{entity_id[6:]}_{idx}" for idx in range(fanout))
+        else:
+            members = tuple(f"{entity_id}_{idx}" for idx in range(fanout))
+            for member in members:
+                add_group(member, level + 1)
+        hass.states.async_set(entity_id, "on", {ATTR_ENTITY_ID: members})
+
+    add_group("group.tree", 1)
+
+    calls = [
+        core.ServiceCall(
+            "light",
+            "turn_on",
+            {ATTR_ENTITY_ID: ["group.tree", f"group.tree_{idx % fanout}"]},
+        )
+        for idx in range(call_count)
+    ]
+
+    start = timer()
+
+    for call in calls:
+        await service.async_extract_referenced_entity_ids(hass, call)
+
+    runtime = timer() - start
+
+    print(
+        f"Expanded {fanout ** depth} lights in {call_count / runtime:.0f} "
+        "service calls/s"
+    )
+
+    return runtime
+
+
+@benchmark
+async def entity_service_call(hass):
+    """Call an entity service targeting one entity in domains of growing size."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import device_registry, entity_registry
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_component import EntityComponent
+
+    class BenchmarkEntity(Entity):
+        """Entity with a turn on method."""
+
+        should_poll = False
+
+        def __init__(self, entity_id):
+            """Initialize the entity."""
+            self.entity_id = entity_id
+
+        async def async_turn_on(self):
+            """Turn the entity on."""
+
+    call_count = 10 ** 3
+    total = 0
+
+    with TemporaryDirectory() as config_dir:
+        # Entities without a unique id don't write to the registries
+        hass.config.config_dir = config_dir
+        await device_registry.async_load(hass)
+        await entity_registry.async_load(hass)
+
+        for entity_count in (10 ** 2, 10 ** 3, 10 ** 4):
+            domain = f"benchmark_{entity_count}"
+            component = EntityComponent(logging.getLogger(__name__), domain, hass)
+            component.async_register_entity_service("turn_on", {}, "async_turn_on")
+            await component.async_add_entities(
+                [
+                    BenchmarkEntity(f"{domain}.entity_{idx}")
+                    for idx in range(entity_count)
+                ]
+            )
+
+            start = timer()
+
+            for idx in range(call_count):
+                await hass.services.async_call(
+                    domain,
+                    "turn_on",
+                    {"entity_id": f"{domain}.entity_{idx % entity_count}"},
+                    blocking=True,
+                )
+
+            runtime = timer() - start
+            total += runtime
+            print(
+                f"Called a service on 1 of {entity_count} entities "
+                f"in {runtime / call_count * 10 ** 6:.0f}us"
+            )
+
+    return total
+
+
+@benchmark
+async def storage_journal(hass):
+    """Save 100 single entity changes of a 5k entity registry."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import storage
+
+    entity_count = 5 * 10 ** 3
+    save_count = 100
+    total = 0
+
+    def file_state(path):
+        """Return the inode and size of a file."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def written_bytes(before, after):
+        """Return the bytes written to turn file state before into after."""
+        if after is None:
+            return 0
+        if before is None or before[0] != after[0]:
+            return after[1]
+        return after[1] - before[1]
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+
+        for journal in (False, True):
+            entities = [
+                {
+                    "entity_id": f"sensor.benchmark_{idx}",
+                    "config_entry_id": "0123456789abcdef0123456789abcdef",
+                    "device_id": f"{idx:032x}",
+                    "area_id": None,
+                    "unique_id": f"benchmark-{idx}",
+                    "platform": "benchmark",
+                    "name": None,
+                    "icon": None,
+                    "disabled_by": None,
+                    "capabilities": {"state_class": "measurement"},
+                    "supported_features": 0,
+                    "device_class": "temperature",
+                    "unit_of_measurement": "°C",
+                    "original_name": f"Benchmark {idx}",
+                    "original_icon": None,
+                }
+                for idx in range(entity_count)
+            ]
+            store = storage.Store(
+                hass, 1, f"benchmark_{journal}", journal=journal, encoder=JSONEncoder
+            )
+            await store.async_save({"entities": entities})
+
+            runtime = 0
+            written = 0
+            for idx in range(save_count):
+                entities[idx * 37 % entity_count]["name"] = f"Renamed {idx}"
+                paths = (store.path, store.journal_path)
+                before = [file_state(path) for path in paths]
+
+                start = timer()
+                await store.async_save({"entities": entities})
+                runtime += timer() - start
+
+                written += sum(
+                    written_bytes(old, file_state(path))
+                    for old, path in zip(before, paths)
+                )
+
+            total += runtime
+            print(
+                f"{'Journal' if journal else 'Full file'}: "
+                f"{written / save_count / 1024:.1f} KiB written and "
+                f"{runtime / save_count * 1000:.1f} ms per save"
+            )
+
+    return total
+
+
+@benchmark
+async def json_serialize_registries(hass):
+    """Serialize registries of 5k entities and their 10k states 10 times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import device_registry, entity_registry
+    from homeassistant.util import json_encoder
+
+    device_count = 10 ** 3
+    entity_count = 5 * 10 ** 3
+    rounds = 10
+    total = 0
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        # The registries are written concurrently when the benchmark ends
+        os.makedirs(hass.config.path(".storage"))
+        await device_registry.async_load(hass)
+        await entity_registry.async_load(hass)
+        dev_reg = device_registry.async_get(hass)
+        ent_reg = entity_registry.async_get(hass)
+
+        for idx in range(device_count):
+            dev_reg.async_get_or_create(
+                config_entry_id="benchmark",
+                identifiers={("benchmark", str(idx))},
+                manufacturer="Benchmark",
+                model="Sensor",
+                name=f"Device {idx}",
+                sw_version="1.0",
+            )
+        device_ids = list(dev_reg.devices)
+        for idx in range(entity_count):
+            entry = ent_reg.async_get_or_create(
+                "sensor",
+                "benchmark",
+                str(idx),
+                device_id=device_ids[idx % device_count],
+                capabilities={"state_class": "measurement"},
+                device_class="temperature",
+                unit_of_measurement="°C",
+                original_name=f"Temperature {idx}",
+            )
+            hass.states.async_set(
+                entry.entity_id,
+                str(idx / 10),
+                {
+                    "unit_of_measurement": "°C",
+                    "friendly_name": f"Temperature {idx}",
+                    "device_class": "temperature",
+                },
+            )
+
+        payloads = {
+            "entity registry": ent_reg._data_to_save(),  # pylint: disable=protected-access
+            "device registry": dev_reg._data_to_save(),  # pylint: disable=protected-access
+            "states": hass.states.async_all(),
+        }
+        backend = "orjson" if json_encoder.orjson is not None else "json"
+
+        for name, payload in payloads.items():
+            start = timer()
+            for _ in range(rounds):
+                json.dumps(payload, indent=4, cls=JSONEncoder)
+            indented = timer() - start
+
+            start = timer()
+            for _ in range(rounds):
+                json_encoder.json_dumps(payload, allow_nan=True)
+            compact = timer() - start
+
+            total += compact
+            print(
+                f"{name}: {indented / rounds * 1000:.1f} ms indented, "
+                f"{compact / rounds * 1000:.1f} ms compact with {backend}"
+            )
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+
+    return total
+
+
+@benchmark
+async def template_regex_filters(hass):
+    """Render a template using the regex filters 10k times."""
+    return await _render_template(
+        hass,
+        "{{ value | regex_match('^Flight') }}"
+        "{{ value | regex_search('to [A-Z]{3}$', ignorecase=True) }}"
+        "{{ value | regex_replace('[0-9]+', '#') }}"
+        "{{ value | regex_findall_index('([A-Z]{3})', 1) }}",
+        {"value": "Flight 123 from JFK to LHR"},
+    )
+
+
+@benchmark
+async def template_time_filters(hass):
+    """Render a template using the time filters 10k times."""
+    return await _render_template(
+        hass,
+        "{{ strptime(value, '%Y-%m-%d %H:%M:%S').hour }}"
+        "{{ timestamp | timestamp_custom('%H:%M') }}"
+        "{{ timestamp | timestamp_custom('%d %b', False) }}"
+        "{{ timestamp | timestamp_local }}",
+        {"value": "2021-03-01 15:22:05", "timestamp": 1614612125},
+    )
+
+
+@benchmark
+async def template_state_filters(hass):
+    """Render a template using the state functions and filters 10k times."""
+    hass.states.async_set("sensor.temperature", "21.456", {"unit": "C"})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 180})
+    return await _render_template(
+        hass,
+        "{{ states('sensor.temperature') | float | round(1) }}"
+        "{{ is_state('light.kitchen', 'on') }}"
+        "{{ state_attr('light.kitchen', 'brightness') | multiply(0.39) | int }}"
+        "{{ states.light | selectattr('state', 'eq', 'on') | list | count }}",
+        {},
+    )
+
+
+@benchmark
+async def template_compile(hass):
+    """Compile 1k templates without and with the bytecode cache."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import template
+
+    template_count = 10 ** 3
+    sources = [
+        f"{{{{ states('sensor.temperature_{idx}') | float | round(1) }}}}"
+        f"{{% if is_state('light.kitchen_{idx}', 'on') %}}"
+        f"{{{{ state_attr('light.kitchen_{idx}', 'brightness') }}}}{{% endif %}}"
+        for idx in range(template_count)
+    ]
+
+    template.async_setup_bytecode_cache(hass)
+    start = timer()
+    for source in sources:
+        template.Template(source, hass).ensure_valid()
+    cold = timer() - start
+
+    # Start over with a fresh environment like reloading the templates
+    hass.data.pop("template.environment")
+
+    start = timer()
+    for source in sources:
+        template.Template(source, hass).ensure_valid()
+    warm = timer() - start
+
+    print(
+        f"Compiled {template_count} templates in {cold:.3f}s, "
+        f"reused them from the bytecode cache in {warm:.3f}s"
+    )
+
+    return warm
+
+
+async def _render_template(hass, source, variables):
+    """Render a template 10k times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.template import Template
+
+    render_count = 10 ** 4
+    template = Template(source, hass)
+    template.ensure_valid()
+
+    start = timer()
+
+    for _ in range(render_count):
+        template.async_render(variables)
+
+    runtime = timer() - start
+    print(f"Rendered {render_count / runtime:.0f} templates/s")
+
+    return runtime
+
+
+@benchmark
+async def entity_write_state(hass):
+    """Write entity state 100k times."""
+    return await _entity_write_state(hass, False)
+
+
+@benchmark
+async def entity_write_state_static_attributes(hass):
+    """Write entity state 100k times with cached static attributes."""
+    return await _entity_write_state(hass, True)
+
+
+async def _entity_write_state(hass, static_attributes):
+    """Write the state of 100 power meter like entities.
+
+    A customize glob is configured, as that is matched on each write.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.config import DATA_CUSTOMIZE
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_values import EntityValues
+
+    entity_count = 100
+    writes = 10 ** 5
+
+    class PowerSensor(Entity):
+        """Power meter entity."""
+
+        def __init__(self, idx):
+            """Initialize the entity."""
+            self.entity_id = f"sensor.power_{idx}"
+            self.hass = hass
+            self.value = 0
+
+        name = "Power"
+        icon = "mdi:flash"
+        unit_of_measurement = "W"
+        device_class = "power"
+        capability_attributes = {"min": 0, "max": 10000}
+
+        @property
+        def state(self):
+            """Return the state of the entity."""
+            return self.value
+
+        @property
+        def device_state_attributes(self):
+            """Return device specific state attributes."""
+            return {"voltage": 230}
+
+    PowerSensor.static_attributes = static_attributes
+    hass.data[DATA_CUSTOMIZE] = EntityValues(glob={"sensor.energy_*": {"hidden": True}})
+    entities = [PowerSensor(idx) for idx in range(entity_count)]
+
+    start = timer()
+
+    for idx in range(writes):
+        entity = entities[idx % entity_count]
+        entity.value = idx
+        entity.async_write_ha_state()
+
+    runtime = timer() - start
+    print(f"Wrote {writes / runtime:.0f} states/s")
+
+    await hass.async_block_till_done()
+
+    return runtime
+
+
+@benchmark
+async def recorder_insert_states(hass):
+    """Write 10k state changes to the recorder database one row at a time."""
+    return await _recorder_insert_states(hass, 0)
+
+
+@benchmark
+async def recorder_bulk_insert_states(hass):
+    """Write 10k state changes to the recorder database with batched inserts."""
+    return await _recorder_insert_states(hass, 1000)
+
+
+async def _recorder_insert_states(hass, batch_size):
+    """Write state changes through the recorder.
+
+    Set BENCHMARK_RECORDER_DB_URL to run against another database,
+    for example postgresql://localhost/benchmark.
+    """
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components import recorder
+
+    db_url = os.environ.get("BENCHMARK_RECORDER_DB_URL", "sqlite://")
+    events_to_write = 10 ** 4
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=10,
+        commit_interval=1,
+        batch_size=batch_size,
+        batch_max_latency=1,
+        uri=db_url,
+        db_max_retries=1,
+        db_retry_wait=0,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        db_integrity_check=False,
+    )
+    events = []
+    for idx in range(events_to_write):
+        entity_id = f"sensor.power_{idx % 1000}"
+        new_state = core.State(entity_id, str(idx), {"unit_of_measurement": "W"})
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED, {"entity_id": entity_id, "new_state": new_state}
+            )
+        )
+
+    def _write():
+        instance._setup_connection()
+        instance._setup_run()
+        instance._open_event_session()
+        start = timer()
+        if batch_size:
+            for idx in range(0, events_to_write, batch_size):
+                instance._process_event_batch(events[idx : idx + batch_size])
+        else:
+            for event in events:
+                instance._process_one_event(event)
+        instance._shutdown()
+        return timer() - start
+
+    runtime = await hass.async_add_executor_job(_write)
+    print(f"Wrote {int(2 * events_to_write / runtime)} rows/s to {db_url}")
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
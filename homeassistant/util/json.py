@@ -8,6 +8,7 @@ from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.json_encoder import JSONEncoder, json_dumps
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,24 +43,50 @@ def load_json(
     return {} if default is None else default
 
 
+def encode_json(
+    data: Union[List, Dict],
+    *,
+    encoder: Optional[Type[json.JSONEncoder]] = None,
+    compact: bool = False,
+) -> str:
+    """Encode JSON data the way save_json writes it to a file."""
+    if not compact:
+        return json.dumps(data, indent=4, cls=encoder)
+    if encoder in (None, JSONEncoder):
+        return json_dumps(data, allow_nan=True)
+    return json.dumps(data, cls=encoder, separators=(",", ":"))
+
+
 def save_json(
     filename: str,
     data: Union[List, Dict],
     private: bool = False,
     *,
     encoder: Optional[Type[json.JSONEncoder]] = None,
+    compact: bool = False,
 ) -> None:
     """Save JSON data to a file.
 
+    Compact files without a custom encoder are written with json_dumps of
+    the JSON encoder utilities.
+
     Returns True on success.
     """
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        json_data = encode_json(data, encoder=encoder, compact=compact)
     except TypeError as error:
         msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
+    write_utf8_file(filename, json_data, private)
+
+
+def write_utf8_file(filename: str, utf8_data: str, private: bool = False) -> None:
+    """Write a file and rename it into place.
+
+    Writes all or nothing.
+    """
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
@@ -67,7 +94,7 @@ def save_json(
         with tempfile.NamedTemporaryFile(
             mode="w", encoding="utf-8", dir=tmp_path, delete=False
         ) as fdesc:
-            fdesc.write(json_data)
+            fdesc.write(utf8_data)
             tmp_filename = fdesc.name
         if not private:
             os.chmod(tmp_filename, 0o644)
@@ -0,0 +1,117 @@
+"""Encode Home Assistant objects as JSON."""
+from datetime import date, datetime, time
+from enum import Enum
+import json
+import math
+from typing import Any, Iterable
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    ORJSON_OPTIONS = 0
+else:
+    # Hand datetimes and dataclasses to json_encoder_default,
+    # so orjson encodes them like the standard library
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+JSON_ENCODE_EXCEPTIONS = (TypeError, ValueError)
+
+# Types that never hold NaN or infinity
+_LEAF_TYPES = {str, int, bool, datetime}
+
+
+class JSONEncoder(json.JSONEncoder):
+    """JSONEncoder that supports Home Assistant objects."""
+
+    def default(self, o: Any) -> Any:
+        """Convert Home Assistant objects.
+
+        Hand other objects to the original method.
+        """
+        try:
+            return json_encoder_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Used by both backends, so they accept and encode the same types.
+    UUIDs and enums are converted the way orjson encodes them natively.
+    """
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _contains_non_finite(data: Any) -> bool:
+    """Return if data contains NaN or infinity."""
+    to_process = [data]
+
+    while to_process:
+        obj = to_process.pop()
+        obj_type = type(obj)
+
+        if obj_type is dict:
+            to_process.extend(obj.values())
+        elif obj_type is float:
+            if not math.isfinite(obj):
+                return True
+        elif obj is None or obj_type in _LEAF_TYPES:
+            continue
+        elif isinstance(obj, (dict, list, tuple, set)):
+            to_process.extend(obj.values() if isinstance(obj, dict) else obj)
+        elif isinstance(obj, float):
+            if not math.isfinite(obj):
+                return True
+        elif hasattr(obj, "as_dict"):
+            to_process.append(obj.as_dict())
+
+    return False
+
+
+def json_bytes(data: Any, *, allow_nan: bool = False) -> bytes:
+    """Encode data as compact JSON.
+
+    Uses orjson when it's installed. NaN and infinity are rejected unless
+    allow_nan is set, with either backend.
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(
+                data, default=json_encoder_default, option=ORJSON_OPTIONS
+            )
+        except TypeError:
+            # Non string keys and integers over 64 bit are left to the
+            # standard library
+            pass
+        else:
+            # orjson encodes NaN and infinity as null, data that holds them
+            # is left to the standard library
+            if b"null" not in encoded or not _contains_non_finite(data):
+                return encoded
+
+    return json.dumps(
+        data, cls=JSONEncoder, allow_nan=allow_nan, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_dumps(data: Any, *, allow_nan: bool = False) -> str:
+    """Encode data as a compact JSON string."""
+    return json_bytes(data, allow_nan=allow_nan).decode("utf-8")
+
+
+def json_array(encoded_items: Iterable[str]) -> str:
+    """Join already encoded JSON values into a JSON array."""
+    return "[" + ",".join(encoded_items) + "]"
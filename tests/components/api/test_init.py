@@ -55,6 +55,26 @@ async def test_api_get_non_existing_state(hass, mock_api_client):
     assert resp.status == const.HTTP_NOT_FOUND
 
 
+async def test_api_get_states(hass, mock_api_client):
+    """Test if the debug interface allows us to get all states."""
+    hass.states.async_set("hello.world", "nice", {"attr": 1})
+    hass.states.async_set("hello.there", "good")
+
+    resp = await mock_api_client.get(const.URL_API_STATES)
+    assert resp.status == 200
+    data = [ha.State.from_dict(item) for item in await resp.json()]
+
+    assert data == hass.states.async_all()
+
+
+async def test_api_get_states_not_serializable(hass, mock_api_client):
+    """Test getting all states with unserializable attributes."""
+    hass.states.async_set("hello.world", "nice", {"attr": float("NaN")})
+
+    resp = await mock_api_client.get(const.URL_API_STATES)
+    assert resp.status == 500
+
+
 async def test_api_state_change(hass, mock_api_client):
     """Test if we can change the state of an entity that exists."""
     hass.states.async_set("test.test", "not_to_be_set")
@@ -4,7 +4,7 @@ from copy import copy
 from datetime import timedelta
 import json
 import unittest
-from unittest.mock import patch, sentinel
+from unittest.mock import Mock, patch, sentinel
 
 from homeassistant.components import history, recorder
 from homeassistant.components.recorder.models import process_timestamp
@@ -1008,3 +1008,121 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_columns_during_period_via_websocket(hass, hass_ws_client):
+    """Test fetching history as parallel arrays over the websocket api."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    await async_setup_component(hass, "websocket_api", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.power", "10")
+    hass.states.async_set("sensor.power", "12.5")
+    hass.states.async_set("sensor.power", "unavailable")
+    hass.states.async_set("sensor.mode", "eco")
+    hass.states.async_set("sensor.nomatch", "1")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/columns_during_period",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power", "sensor.mode", "sensor.missing"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert list(result) == ["sensor.power", "sensor.mode"]
+    assert result["sensor.power"]["states"] == [10.0, 12.5, "unavailable"]
+    assert result["sensor.mode"]["states"] == ["eco"]
+    timestamps = result["sensor.power"]["timestamps"]
+    assert len(timestamps) == 3
+    assert timestamps == sorted(timestamps)
+    assert timestamps[0] > start.timestamp()
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/columns_during_period",
+            "start_time": "not a date",
+            "entity_ids": ["sensor.power"],
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_get_state_columns_downsampled(hass):
+    """Test downsampling numeric history into min/max/mean buckets."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {"history": {}})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow().replace(microsecond=0)
+    end = start + timedelta(minutes=10)
+    for minute, state in enumerate(["1", "3", "unavailable", "5", "8", "2"]):
+        with patch(
+            "homeassistant.core.dt_util.utcnow",
+            return_value=start + timedelta(minutes=minute, seconds=30),
+        ):
+            hass.states.async_set("sensor.power", state)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    result = await hass.async_add_executor_job(
+        history.get_state_columns_during_period,
+        hass,
+        start,
+        end,
+        ["sensor.power"],
+        2,
+    )
+    assert result == {
+        "sensor.power": {
+            "timestamps": [
+                start.timestamp(),
+                (start + timedelta(minutes=5)).timestamp(),
+            ],
+            "min": [1.0, 2.0],
+            "max": [8.0, 2.0],
+            "mean": [4.25, 2.0],
+        }
+    }
+
+    result = await hass.async_add_executor_job(
+        history.get_state_columns_during_period,
+        hass,
+        start,
+        end,
+        ["sensor.power"],
+        10,
+    )
+    assert result["sensor.power"]["states"] == [1.0, 3.0, "unavailable", 5.0, 8.0, 2.0]
+
+
+def test_lazy_state_as_json():
+    """Test the JSON representation of a LazyState is encoded once."""
+    now = dt_util.utcnow().replace(tzinfo=None)
+    row = Mock(
+        entity_id="sensor.power",
+        state="on",
+        attributes='{"unit_of_measurement": "W"}',
+        last_changed=now,
+        last_updated=now,
+    )
+    state = history.LazyState(row)
+
+    as_json = state.as_json()
+    assert json.loads(as_json) == json.loads(json.dumps(state.as_dict()))
+    assert state.as_json() is as_json
@@ -13,6 +13,7 @@ from homeassistant.components.http.view import (
     HomeAssistantView,
     request_handler_factory,
 )
+from homeassistant.const import CONTENT_TYPE_JSON
 from homeassistant.exceptions import ServiceNotFound, Unauthorized
 
 
@@ -38,6 +39,15 @@ async def test_invalid_json(caplog):
     assert str(float("NaN")) in caplog.text
 
 
+async def test_json_encoded():
+    """Test returning JSON that is already encoded."""
+    response = HomeAssistantView.json_encoded(b'{"hello":"world"}', 201)
+
+    assert response.status == 201
+    assert response.content_type == CONTENT_TYPE_JSON
+    assert response.body == b'{"hello":"world"}'
+
+
 async def test_handling_unauthorized(mock_request):
     """Test handling unauth exceptions."""
     with pytest.raises(HTTPUnauthorized):
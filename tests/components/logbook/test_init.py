@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 import json
 from unittest.mock import Mock, patch
 
+import aiohttp
 import pytest
+from sqlalchemy.exc import SQLAlchemyError
 import voluptuous as vol
 
 from homeassistant.components import logbook, recorder
@@ -317,6 +319,160 @@ async def test_logbook_view(hass, hass_client):
     assert response.status == 200
 
 
+async def test_logbook_view_stream(hass, hass_client):
+    """Test the logbook view streams the same entries in chunks."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    for idx in range(5):
+        hass.states.async_set(f"switch.test_{idx}", STATE_OFF)
+        hass.states.async_set(f"switch.test_{idx}", STATE_ON)
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    response = await client.get(f"/api/logbook/{start_date.isoformat()}")
+    expected = await response.json()
+    assert len(expected) == 5
+
+    with patch.object(logbook, "STREAM_PAGE_SIZE", 2), patch.object(
+        logbook, "_write_json_pages", wraps=logbook._write_json_pages
+    ) as write_json_pages:
+        response = await client.get(f"/api/logbook/{start_date.isoformat()}?stream")
+        assert response.status == 200
+        assert await response.json() == expected
+
+    assert write_json_pages.call_args[0][2] == 2
+
+    # Test no entries
+    start = (dt_util.utcnow() + timedelta(days=1)).date()
+    start_date = datetime(start.year, start.month, start.day)
+    response = await client.get(f"/api/logbook/{start_date.isoformat()}?stream")
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_logbook_view_stream_error(hass, hass_client, caplog):
+    """Test an error while streaming closes the connection and is logged."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+
+    def iter_events(*args):
+        yield {"message": "first"}
+        raise SQLAlchemyError("database is locked")
+
+    with patch.object(logbook, "STREAM_PAGE_SIZE", 1), patch.object(
+        logbook, "_iter_events", iter_events
+    ):
+        response = await client.get(
+            f"/api/logbook/{dt_util.utcnow().isoformat()}?stream"
+        )
+        assert response.status == 200
+        with pytest.raises(aiohttp.ClientPayloadError):
+            await response.read()
+
+    assert "Error streaming the logbook" in caplog.text
+    assert "database is locked" in caplog.text
+
+
+async def test_logbook_ws_get_events(hass, hass_client, hass_ws_client):
+    """Test the websocket command sends the entries of the view in pages."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    for idx in range(5):
+        hass.states.async_set(f"switch.test_{idx}", STATE_OFF)
+        hass.states.async_set(f"switch.test_{idx}", STATE_ON)
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    client = await hass_client()
+    response = await client.get(f"/api/logbook/{start_date.isoformat()}")
+    expected = await response.json()
+    assert len(expected) == 5
+
+    ws_client = await hass_ws_client()
+    await ws_client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/get_events",
+            "start_time": dt_util.as_utc(start_date).isoformat(),
+            "page_size": 2,
+        }
+    )
+    response = await ws_client.receive_json()
+    assert response["success"]
+
+    pages = []
+    while True:
+        response = await ws_client.receive_json()
+        assert response["id"] == 1
+        assert response["type"] == "event"
+        pages.append(response["event"]["events"])
+        if response["event"]["done"]:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [entry for page in pages for entry in page] == expected
+
+    await ws_client.send_json(
+        {"id": 2, "type": "logbook/get_events", "start_time": "not a time"}
+    )
+    response = await ws_client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+def test_context_lookup_window(hass_):
+    """Test contexts are only looked up within the window."""
+    hass = hass_
+    hass.states.set("switch.trigger", STATE_OFF)
+    hass.states.set("light.kitchen", STATE_OFF)
+    context = ha.Context()
+    hass.states.set("switch.trigger", STATE_ON, context=context)
+    hass.states.set("light.kitchen", STATE_ON, context=context)
+    hass.block_till_done()
+    trigger_db_commit(hass)
+    hass.block_till_done()
+    hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+    start = dt_util.utcnow() - timedelta(hours=1)
+    end = dt_util.utcnow() + timedelta(hours=1)
+
+    entries = list(logbook._iter_events(hass, start, end))
+    assert entries[-1]["context_entity_id"] == "switch.trigger"
+
+    with patch.object(logbook, "CONTEXT_LOOKUP_WINDOW", timedelta(0)):
+        entries = list(logbook._iter_events(hass, start, end))
+    assert "context_entity_id" not in entries[-1]
+
+
+def test_write_json_pages():
+    """Test writing entries as JSON in pages."""
+    chunks = []
+    entries = ({"idx": idx} for idx in range(5))
+    logbook._write_json_pages(entries, chunks.append, 2)
+    assert len(chunks) == 4
+    assert json.loads(b"".join(chunks)) == [{"idx": idx} for idx in range(5)]
+
+    chunks = []
+    logbook._write_json_pages([], chunks.append, 2)
+    assert chunks == [b"[]"]
+
+
 async def test_logbook_view_period_entity(hass, hass_client):
     """Test the logbook view with period and entity."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -475,6 +475,7 @@ ABBREVIATIONS_WHITE_LIST = [
     "CONF_DISCOVERY_PREFIX",
     "CONF_EMBEDDED",
     "CONF_KEEPALIVE",
+    "CONF_MESSAGE_BATCH_SIZE",
     "CONF_TLS_INSECURE",
     "CONF_TLS_VERSION",
     "CONF_WILL_MESSAGE",
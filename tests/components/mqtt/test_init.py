@@ -313,6 +313,108 @@ async def test_all_subscriptions_run_when_decode_fails(
     assert len(calls) == 1
 
 
+async def test_received_messages_handled_in_batches(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test messages received by the client are buffered and handled in batches."""
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+    mqtt_mock().conf[mqtt.CONF_MESSAGE_BATCH_SIZE] = 2
+
+    for idx in range(5):
+        mqtt_mock()._mqtt_on_message(
+            None, None, mqtt.Message(f"test-topic/{idx}", b"payload", 0, False)
+        )
+
+    assert mqtt_mock().message_stats() == {
+        "received": 5,
+        "handled": 0,
+        "batches": 0,
+        "pending": 5,
+        "max_pending": 5,
+    }
+
+    # Each batch is handled in its own event loop iteration
+    for _ in range(3):
+        await asyncio.sleep(0)
+    await hass.async_block_till_done()
+
+    assert [call[0].topic for call in calls] == [
+        f"test-topic/{idx}" for idx in range(5)
+    ]
+    assert mqtt_mock().message_stats() == {
+        "received": 5,
+        "handled": 5,
+        "batches": 3,
+        "pending": 0,
+        "max_pending": 5,
+    }
+
+
+async def test_received_messages_handled_after_callback_error(
+    hass, mqtt_mock, calls, record_calls, caplog
+):
+    """Test an error in a subscription callback doesn't stop message handling."""
+
+    @callback
+    def raise_on_bad(msg):
+        """Raise for the bad topic."""
+        if msg.topic == "test-topic/bad":
+            raise ValueError("Bad message")
+
+    await mqtt.async_subscribe(hass, "test-topic/#", raise_on_bad)
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+
+    for topic in ("test-topic/1", "test-topic/bad", "test-topic/2"):
+        mqtt_mock()._mqtt_on_message(
+            None, None, mqtt.Message(topic, b"payload", 0, False)
+        )
+    await hass.async_block_till_done()
+
+    mqtt_mock()._mqtt_on_message(
+        None, None, mqtt.Message("test-topic/3", b"payload", 0, False)
+    )
+    await hass.async_block_till_done()
+
+    assert [call[0].topic for call in calls] == [
+        "test-topic/1",
+        "test-topic/2",
+        "test-topic/3",
+    ]
+    assert "Error handling MQTT message on test-topic/bad" in caplog.text
+
+
+async def test_received_messages_keep_receive_time(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test messages handled in one batch keep the time they were received."""
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+    first = utcnow()
+    second = first + timedelta(seconds=1)
+
+    for idx, now in enumerate((first, second)):
+        with patch("homeassistant.util.dt.utcnow", return_value=now):
+            mqtt_mock()._mqtt_on_message(
+                None, None, mqtt.Message(f"test-topic/{idx}", b"payload", 0, False)
+            )
+    await hass.async_block_till_done()
+
+    assert mqtt_mock().message_stats()["batches"] == 1
+    assert [call[0].timestamp for call in calls] == [first, second]
+
+
+async def test_received_messages_backlog_warning(hass, mqtt_mock, caplog):
+    """Test a warning is logged once when the message backlog grows too large."""
+    with patch("homeassistant.components.mqtt.PENDING_MESSAGES_WARNING", 3):
+        for _ in range(5):
+            mqtt_mock()._mqtt_on_message(
+                None, None, mqtt.Message("test-topic", b"payload", 0, False)
+            )
+    await hass.async_block_till_done()
+
+    assert caplog.text.count("3 MQTT messages are waiting to be handled") == 1
+    assert mqtt_mock().message_stats()["pending"] == 0
+
+
 async def test_subscribe_topic(hass, mqtt_mock, calls, record_calls):
     """Test the subscription of a topic."""
     unsub = await mqtt.async_subscribe(hass, "test-topic", record_calls)
@@ -575,6 +677,80 @@ async def test_subscribe_special_characters(hass, mqtt_mock, calls, record_calls
     assert calls[0][0].payload == payload
 
 
+def test_subscription_trie_matches():
+    """Test the subscription trie matches topics like the paho matcher."""
+    from paho.mqtt.matcher import MQTTMatcher
+
+    subscribed_topics = [
+        "#",
+        "+",
+        "a",
+        "a/#",
+        "a/+",
+        "a/b",
+        "a/+/c",
+        "a/b/#",
+        "+/b/c",
+        "/a",
+        "$SYS/#",
+        "$SYS/+/load",
+    ]
+    topics = ["a", "a/b", "a/b/c", "a/x/c", "a/b/c/d", "b/b/c", "/a", "$SYS/x/load"]
+
+    trie = mqtt.SubscriptionTrie()
+    for topic in subscribed_topics:
+        trie.add(mqtt.Subscription(topic, None))
+
+    for topic in topics:
+        matcher = MQTTMatcher()
+        for subscribed_topic in subscribed_topics:
+            matcher[subscribed_topic] = subscribed_topic
+        assert sorted(sub.topic for sub in trie.matches(topic)) == sorted(
+            matcher.iter_match(topic)
+        ), topic
+
+
+def test_subscription_trie_matches_in_order():
+    """Test the subscription trie returns matches in the order they were added."""
+    trie = mqtt.SubscriptionTrie()
+    subscriptions = [
+        mqtt.Subscription(topic, None) for topic in ("a/#", "a/b", "+/b", "#", "a/+")
+    ]
+    for sub in subscriptions:
+        trie.add(sub)
+
+    assert trie.matches("a/b") == subscriptions
+
+    trie.remove(subscriptions[1])
+    trie.add(subscriptions[1])
+    assert trie.matches("a/b") == subscriptions[:1] + subscriptions[2:] + [
+        subscriptions[1]
+    ]
+
+
+def test_subscription_trie_remove():
+    """Test removing subscriptions from the subscription trie."""
+    trie = mqtt.SubscriptionTrie()
+    sub_a = mqtt.Subscription("a/+/c", None)
+    sub_b = mqtt.Subscription("a/+/c", None)
+    sub_c = mqtt.Subscription("a/#", None)
+    for sub in (sub_a, sub_b, sub_c):
+        trie.add(sub)
+
+    assert trie.matches("a/b/c") == [sub_a, sub_b, sub_c]
+
+    trie.remove(sub_a)
+    assert trie.matches("a/b/c") == [sub_b, sub_c]
+
+    trie.remove(sub_b)
+    trie.remove(sub_c)
+    assert trie.matches("a/b/c") == []
+    assert trie._root.children == {}
+
+    with pytest.raises(KeyError):
+        trie.remove(sub_a)
+
+
 async def test_subscribe_same_topic(hass, mqtt_client_mock, mqtt_mock):
     """
     Test subscring to same topic twice and simulate retained messages.
@@ -1108,6 +1284,13 @@ async def test_mqtt_ws_get_device_debug_info(
             }
         ],
         "triggers": [],
+        "message_stats": {
+            "received": 0,
+            "handled": 1,
+            "batches": 0,
+            "pending": 0,
+            "max_pending": 0,
+        },
     }
     assert response["result"] == expected_result
 
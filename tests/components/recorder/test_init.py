@@ -15,7 +15,12 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE, SQLITE_URL_PREFIX
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
@@ -351,6 +356,8 @@ def test_recorder_setup_failure():
             auto_purge=True,
             keep_days=7,
             commit_interval=1,
+            batch_size=0,
+            batch_max_latency=1,
             uri="sqlite://",
             db_max_retries=10,
             db_retry_wait=3,
@@ -487,6 +494,113 @@ def test_saving_state_with_serializable_data(hass_recorder, caplog):
     assert "State is not JSON serializable" in caplog.text
 
 
+def test_saving_state_shares_attributes(hass_recorder):
+    """Test states with identical attributes share one attributes row."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.one", "off", {"attr": 1})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {"attr": 2})
+    wait_recording_done(hass)
+    hass.data[DATA_INSTANCE]._state_attributes_ids.clear()
+    hass.states.set("test.two", "off", {"attr": 2})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 5
+        assert all(state.attributes is None for state in states)
+        assert len({state.attributes_id for state in states}) == 2
+        assert session.query(StateAttributes).count() == 2
+        assert [state.to_native().attributes for state in states] == [
+            {"attr": 1},
+            {"attr": 1},
+            {"attr": 1},
+            {"attr": 2},
+            {"attr": 2},
+        ]
+
+
+def test_saving_batched_states(hass_recorder):
+    """Test saving states with batched inserts sets old state within a batch."""
+    hass = hass_recorder({"batch_size": 100, "batch_max_latency": 5})
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {})
+    hass.states.set("test.one", "off", {"attr": 2})
+    wait_recording_done(hass)
+    hass.states.set("test.two", "off", {})
+    hass.states.remove("test.one")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 5
+        events = {
+            event.event_id: event
+            for event in session.query(Events).filter_by(event_type="state_changed")
+        }
+        assert len(events) == 5
+
+        assert [state.entity_id for state in states] == [
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.two",
+            "test.one",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert states[4].old_state_id == states[2].state_id
+        assert states[4].state is None
+        assert all(state.event_id in events for state in states)
+
+        native = states[2].to_native()
+        assert native.state == "off"
+        assert native.attributes == {"attr": 2}
+        # Both states of test.two and the removed state share attributes
+        assert session.query(StateAttributes).count() == 3
+
+
+def test_saving_batched_states_after_external_insert(hass_recorder):
+    """Test batched inserts use the ids the database assigns."""
+    hass = hass_recorder({"batch_size": 100, "batch_max_latency": 5})
+
+    hass.states.set("test.one", "on", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        session.add(Events(event_type="external", event_data="{}", origin="LOCAL"))
+
+    hass.states.set("test.one", "off", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 2
+        assert states[1].old_state_id == states[0].state_id
+        assert session.query(Events).filter_by(event_type="external").count() == 1
+        assert session.query(Events).filter_by(event_type="state_changed").count() == 2
+
+
+def test_saving_batched_events(hass_recorder):
+    """Test saving events with batched inserts."""
+    hass = hass_recorder({"batch_size": 2, "batch_max_latency": 5})
+
+    for idx in range(5):
+        hass.bus.fire("test_event", {"idx": idx})
+    hass.bus.fire("test_event", {"fail": CannotSerializeMe()})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = list(session.query(Events).filter_by(event_type="test_event"))
+        assert [event.to_native().data["idx"] for event in events] == [0, 1, 2, 3, 4]
+
+
 def test_run_information(hass_recorder):
     """Ensure run_information returns expected data."""
     before_start_recording = dt_util.utcnow()
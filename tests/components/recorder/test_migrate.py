@@ -3,7 +3,7 @@
 from unittest.mock import Mock, PropertyMock, call, patch
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.exc import InternalError, OperationalError, ProgrammingError
 from sqlalchemy.pool import StaticPool
 
@@ -75,6 +75,60 @@ def test_forgiving_add_column():
     migration._add_columns(engine, "hello", ["context_id CHARACTER(36)"])
 
 
+def test_attributes_id_foreign_key():
+    """Test the attributes_id column is added with its foreign key."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models_original.Base.metadata.create_all(engine)
+    migration._apply_update(engine, 12, 11)
+
+    foreign_keys = inspect(engine).get_foreign_keys("states")
+    assert any(
+        foreign_key["constrained_columns"] == ["attributes_id"]
+        and foreign_key["referred_table"] == "state_attributes"
+        for foreign_key in foreign_keys
+    )
+
+
+def test_migrate_state_attributes():
+    """Test the attributes of existing states are moved to the shared table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models_original.Base.metadata.create_all(engine)
+    for idx, attributes in enumerate(('{"attr": 1}', '{"attr": 2}', '{"attr": 1}')):
+        engine.execute(
+            "INSERT INTO states (state_id, entity_id, state, attributes) "
+            "VALUES (?, 'test.one', 'on', ?)",
+            (idx + 1, attributes),
+        )
+
+    with patch.object(migration, "MIGRATE_ATTRIBUTES_BATCH_SIZE", 2):
+        migration._apply_update(engine, 12, 11)
+
+    rows = engine.execute(
+        "SELECT states.attributes, state_attributes.shared_attrs, "
+        "state_attributes.hash FROM states JOIN state_attributes "
+        "ON states.attributes_id = state_attributes.attributes_id "
+        "ORDER BY states.state_id"
+    ).fetchall()
+    assert [tuple(row[:2]) for row in rows] == [
+        (None, '{"attr": 1}'),
+        (None, '{"attr": 2}'),
+        (None, '{"attr": 1}'),
+    ]
+    assert rows[0][2] == models.StateAttributes.hash_shared_attrs('{"attr": 1}')
+    assert engine.execute("SELECT COUNT(*) FROM state_attributes").scalar() == 2
+
+
+def test_add_foreign_key_constraint_exists():
+    """Test a foreign key constraint is not added twice."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+
+    with patch.object(migration, "AddConstraint") as add_constraint:
+        migration._add_foreign_key_constraint(engine, "states", "attributes_id")
+
+    assert not add_constraint.called
+
+
 def test_forgiving_add_index():
     """Test that add index will continue if index exists."""
     engine = create_engine("sqlite://", poolclass=StaticPool)
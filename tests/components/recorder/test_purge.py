@@ -5,7 +5,12 @@ from unittest.mock import patch
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
@@ -25,16 +30,34 @@ def test_purge_old_states(hass, hass_recorder):
 
         # run purge_old_data()
         finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
-        assert not finished
-        assert states.count() == 4
+        assert finished
+        assert states.count() == 2
+
+        states_after_purge = list(session.query(States))
+        assert states_after_purge[0].old_state_id is None
+        assert states_after_purge[1].old_state_id == states_after_purge[0].state_id
+
+
+def test_purge_old_states_in_batches(hass, hass_recorder, caplog):
+    """Test deleting old states in batches of ids."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+
+    with session_scope(hass=hass) as session, patch(
+        "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 3
+    ):
+        states = session.query(States)
+        assert states.count() == 6
 
         finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
         assert not finished
-        assert states.count() == 2
+        assert states.count() == 3
+        assert "1 states and 0 events left to purge" in caplog.text
 
         finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
         assert finished
         assert states.count() == 2
+        assert {state.state for state in states} == {"dontpurgeme"}
 
 
 def test_purge_old_events(hass, hass_recorder):
@@ -48,16 +71,8 @@ def test_purge_old_events(hass, hass_recorder):
 
         # run purge_old_data()
         finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
-        assert not finished
-        assert events.count() == 4
-
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
-        assert not finished
-        assert events.count() == 2
-
-        # we should only have 2 events left
-        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
         assert finished
+        # we should only have 2 events left
         assert events.count() == 2
 
 
@@ -77,6 +92,36 @@ def test_purge_old_recorder_runs(hass, hass_recorder):
         assert recorder_runs.count() == 1
 
 
+def test_purge_unused_state_attributes(hass, hass_recorder):
+    """Test deleting state attributes no longer referenced by a state."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+
+    with recorder.session_scope(hass=hass) as session:
+        used_attributes = StateAttributes(shared_attrs='{"test_attr": 5}')
+        purged_attributes = StateAttributes(shared_attrs='{"test_attr": 10}')
+        session.add(used_attributes)
+        session.add(purged_attributes)
+        session.flush()
+        for state in session.query(States):
+            state.attributes = None
+            if state.state == "dontpurgeme":
+                state.attributes_id = used_attributes.attributes_id
+            else:
+                state.attributes_id = purged_attributes.attributes_id
+
+    with session_scope(hass=hass) as session:
+        state_attributes = session.query(StateAttributes)
+        assert state_attributes.count() == 2
+
+        finished = purge_old_data(hass.data[DATA_INSTANCE], 4, repack=False)
+        assert finished
+        assert session.query(States).count() == 2
+        assert [attributes.shared_attrs for attributes in state_attributes] == [
+            '{"test_attr": 5}'
+        ]
+
+
 def test_purge_method(hass, hass_recorder):
     """Test purge method."""
     hass = hass_recorder()
@@ -137,10 +182,7 @@ def test_purge_method(hass, hass_recorder):
             hass.block_till_done()
             hass.data[DATA_INSTANCE].block_till_done()
             wait_recording_done(hass)
-            assert (
-                mock_logger.debug.mock_calls[5][1][0]
-                == "Vacuuming SQL DB to free space"
-            )
+            mock_logger.debug.assert_any_call("Vacuuming SQL DB to free space")
 
 
 def _add_test_states(hass):
@@ -155,6 +197,7 @@ def _add_test_states(hass):
     wait_recording_done(hass)
 
     with recorder.session_scope(hass=hass) as session:
+        old_state_id = None
         for event_id in range(6):
             if event_id < 2:
                 timestamp = eleven_days_ago
@@ -166,18 +209,20 @@ def _add_test_states(hass):
                 timestamp = now
                 state = "dontpurgeme"
 
-            session.add(
-                States(
-                    entity_id="test.recorder2",
-                    domain="sensor",
-                    state=state,
-                    attributes=json.dumps(attributes),
-                    last_changed=timestamp,
-                    last_updated=timestamp,
-                    created=timestamp,
-                    event_id=event_id + 1000,
-                )
+            dbstate = States(
+                entity_id="test.recorder2",
+                domain="sensor",
+                state=state,
+                attributes=json.dumps(attributes),
+                last_changed=timestamp,
+                last_updated=timestamp,
+                created=timestamp,
+                event_id=event_id + 1000,
+                old_state_id=old_state_id,
             )
+            session.add(dbstate)
+            session.flush()
+            old_state_id = dbstate.state_id
 
 
 def _add_test_events(hass):
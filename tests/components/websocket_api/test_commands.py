@@ -301,6 +301,38 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_coalesced(hass, websocket_client):
+    """Test queued messages are sent in a single frame when supported."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    with timeout(3):
+        msgs = await websocket_client.receive_json()
+
+    assert isinstance(msgs, list)
+    assert [(msg["id"], msg["type"]) for msg in msgs] == [(6, "event")] * 3
+    assert [msg["event"]["data"] for msg in msgs] == [{"idx": idx} for idx in range(3)]
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
@@ -66,6 +66,83 @@ async def test_pending_msg_peak(hass, mock_low_peak, hass_ws_client, caplog):
     assert "Client unable to keep up with pending messages" in caplog.text
 
 
+async def test_pending_msg_peak_collapses_state_changes(
+    hass, mock_low_peak, websocket_client
+):
+    """Test superseded state changes are collapsed above the peak."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    for idx in range(5):
+        hass.states.async_set(f"sensor.test_{idx}", "on")
+    for idx in range(5):
+        hass.states.async_set("light.kitchen", str(idx))
+
+    msgs = await websocket_client.receive_json()
+    assert [msg["event"]["data"]["entity_id"] for msg in msgs] == [
+        *(f"sensor.test_{idx}" for idx in range(5)),
+        "light.kitchen",
+    ]
+    assert msgs[-1]["event"]["data"]["new_state"]["state"] == "4"
+
+
+async def test_pending_msg_peak_coalescing_client(
+    hass, mock_low_peak, hass_ws_client, caplog
+):
+    """Test clients accepting coalesced messages are not cancelled at the peak."""
+    orig_handler = http.WebSocketHandler
+    instance = None
+
+    def instantiate_handler(*args):
+        nonlocal instance
+        instance = orig_handler(*args)
+        return instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    # Kill writer task and fill queue past peak
+    for _ in range(5):
+        instance._to_write.put_nowait(None)
+
+    # Trigger the peak check
+    instance._send_message({})
+
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=const.PENDING_MSG_PEAK_TIME + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert not instance._handle_task.done()
+    assert "Client unable to keep up with pending messages" not in caplog.text
+
+
 async def test_non_json_message(hass, websocket_client, caplog):
     """Test trying to serialze non JSON objects."""
     bad_data = object()
@@ -384,6 +384,42 @@ async def test_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_for_indexes_follow_updates(registry):
+    """Test devices by area and config entry follow registry changes."""
+    device = registry.async_get_or_create(
+        config_entry_id="123",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+        identifiers={("bridgeid", "0123")},
+    )
+    device = registry.async_get_or_create(
+        config_entry_id="456", identifiers={("bridgeid", "0123")}
+    )
+    other = registry.async_get_or_create(
+        config_entry_id="456", identifiers={("bridgeid", "4567")}
+    )
+
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [device]
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [
+        device,
+        other,
+    ]
+
+    device = registry.async_update_device(device.id, area_id="area-1")
+    assert device_registry.async_entries_for_area(registry, "area-1") == [device]
+
+    registry.async_clear_config_entry("456")
+    device = registry.async_get(device.id)
+    assert device_registry.async_entries_for_config_entry(registry, "456") == []
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [device]
+    assert device_registry.async_entries_for_area(registry, "area-1") == [device]
+
+    registry.async_clear_area_id("area-1")
+    assert device_registry.async_entries_for_area(registry, "area-1") == []
+
+    registry.async_remove_device(device.id)
+    assert device_registry.async_entries_for_config_entry(registry, "123") == []
+
+
 async def test_deleted_device_removing_area_id(registry):
     """Make sure we can clear area id of deleted device."""
     entry = registry.async_get_or_create(
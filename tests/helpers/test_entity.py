@@ -7,9 +7,11 @@ from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 
+from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import ATTR_DEVICE_CLASS, STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import Context
 from homeassistant.helpers import entity, entity_registry
+from homeassistant.helpers.entity_values import EntityValues
 
 from tests.common import (
     MockConfigEntry,
@@ -650,6 +652,64 @@ async def test_capability_attrs(hass):
     assert state.attributes["always"] == "there"
 
 
+async def test_static_attributes_cached(hass):
+    """Test static attributes are evaluated again only when invalidated."""
+    calls = []
+
+    class StaticEntity(entity.Entity):
+        """Entity with static attributes."""
+
+        static_attributes = True
+        state = "on"
+
+        @property
+        def name(self):
+            """Return the name of the entity."""
+            calls.append("name")
+            return "Static"
+
+        @property
+        def device_state_attributes(self):
+            """Return device specific state attributes."""
+            return {"dynamic": len(calls)}
+
+    ent = StaticEntity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+
+    ent.async_write_ha_state()
+    ent.async_write_ha_state()
+    assert calls == ["name"]
+    assert hass.states.get("hello.world").attributes == {
+        "dynamic": 1,
+        "friendly_name": "Static",
+    }
+
+    hass.data[DATA_CUSTOMIZE] = EntityValues({"hello.world": {"icon": "mdi:test"}})
+    ent.async_write_ha_state()
+    assert calls == ["name", "name"]
+    assert hass.states.get("hello.world").attributes == {
+        "dynamic": 2,
+        "friendly_name": "Static",
+        "icon": "mdi:test",
+    }
+
+    ent.registry_entry = entity_registry.RegistryEntry(
+        entity_id="hello.world",
+        unique_id="test-unique-id",
+        platform="test-platform",
+        name="Renamed",
+    )
+    ent.async_write_ha_state()
+    ent.async_write_ha_state()
+    assert calls == ["name", "name"]
+    assert hass.states.get("hello.world").attributes == {
+        "dynamic": 2,
+        "friendly_name": "Renamed",
+        "icon": "mdi:test",
+    }
+
+
 async def test_warn_slow_write_state(hass, caplog):
     """Check that we log a warning if reading properties takes too long."""
     mock_entity = entity.Entity()
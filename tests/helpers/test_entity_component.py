@@ -116,6 +116,11 @@ async def test_set_scan_interval_via_config(mock_track, hass):
         {DOMAIN: {"platform": "platform", "scan_interval": timedelta(seconds=30)}}
     )
 
+    await hass.async_block_till_done()
+    assert not mock_track.called
+
+    # The interval starts with the first poll
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
     await hass.async_block_till_done()
     assert mock_track.called
     assert timedelta(seconds=30) == mock_track.call_args[0][2]
@@ -487,3 +492,51 @@ async def test_register_entity_service(hass):
         DOMAIN, "hello", {"area_id": ENTITY_MATCH_NONE, "some": "data"}, blocking=True
     )
     assert len(calls) == 2
+
+
+async def test_entity_service_targets_entities_of_all_platforms(hass):
+    """Test entity services look up the targeted entities of every platform."""
+    mock_setup_entry = AsyncMock(return_value=True)
+    mock_entity_platform(
+        hass,
+        "test_domain.entry_domain",
+        MockPlatform(async_setup_entry=mock_setup_entry),
+    )
+
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    entry = MockConfigEntry(domain="entry_domain")
+    assert await component.async_setup_entry(entry)
+
+    calls = []
+
+    @ha.callback
+    def appender(entity, call):
+        calls.append(entity.entity_id)
+
+    component.async_register_entity_service("hello", {}, appender)
+
+    await component.async_add_entities(
+        [MockEntity(entity_id=f"{DOMAIN}.domain_{idx}") for idx in range(3)]
+    )
+    add_entities = mock_setup_entry.mock_calls[0][1][2]
+    add_entities([MockEntity(entity_id=f"{DOMAIN}.entry_{idx}") for idx in range(3)])
+    await hass.async_block_till_done()
+
+    assert component.get_entity(f"{DOMAIN}.entry_1") is not None
+
+    await hass.services.async_call(
+        DOMAIN,
+        "hello",
+        {"entity_id": [f"{DOMAIN}.domain_2", f"{DOMAIN}.entry_1"]},
+        blocking=True,
+    )
+    assert sorted(calls) == [f"{DOMAIN}.domain_2", f"{DOMAIN}.entry_1"]
+
+    assert await component.async_unload_entry(entry)
+    assert component.get_entity(f"{DOMAIN}.entry_1") is None
+
+    calls.clear()
+    await hass.services.async_call(
+        DOMAIN, "hello", {"entity_id": ENTITY_MATCH_ALL}, blocking=True
+    )
+    assert sorted(calls) == [f"{DOMAIN}.domain_{idx}" for idx in range(3)]
@@ -1,8 +1,10 @@
 """Tests for the EntityPlatform helper."""
 import asyncio
 from datetime import timedelta
+import itertools
 import logging
 from unittest.mock import Mock, patch
+import zlib
 
 import pytest
 
@@ -53,6 +55,162 @@ async def test_polling_only_updates_entities_it_should_poll(hass):
     assert poll_ent.async_update.called
 
 
+async def test_polling_spread_over_interval(hass):
+    """Test polling entities is spread over the second half of the interval."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    entities = [
+        MockEntity(should_poll=True, entity_id=f"{DOMAIN}.test_{idx}")
+        for idx in range(20)
+    ]
+    for entity in entities:
+        entity.async_update = Mock()
+
+    await component.async_add_entities(entities)
+    now = dt_util.utcnow()
+
+    async_fire_time_changed(hass, now + timedelta(seconds=9))
+    await hass.async_block_till_done()
+    assert not any(entity.async_update.called for entity in entities)
+
+    # The entities in the last slot are polled first
+    async_fire_time_changed(hass, now + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    for entity in entities:
+        slot = zlib.crc32(entity.entity_id.encode()) % entity_platform.POLL_SLOTS
+        assert entity.async_update.called == (slot == 9)
+
+    async_fire_time_changed(hass, now + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert all(entity.async_update.call_count == 1 for entity in entities)
+
+    platform = component._platforms[DOMAIN]
+    assert platform.poll_statistics.polls == 20
+    assert platform.poll_statistics.overruns == 0
+
+
+async def test_polling_overrun_skips_poll(hass, caplog):
+    """Test polling skips entities that are still updating."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    updates = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def async_update():
+        updates.append(1)
+        started.set()
+        await release.wait()
+
+    entity = MockEntity(should_poll=True)
+    entity.async_update = async_update
+    await component.async_add_entities([entity])
+    platform = component._platforms[DOMAIN]
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=20))
+    await started.wait()
+    assert len(updates) == 1
+
+    async_fire_time_changed(hass, now + timedelta(seconds=40))
+    assert len(updates) == 1
+    assert platform.poll_statistics.overruns == 1
+    assert "took longer than the scheduled update interval" in caplog.text
+
+    release.set()
+    await hass.async_block_till_done()
+    assert platform.poll_statistics.polls == 1
+    assert platform.poll_statistics.max_latency > 0
+
+    async_fire_time_changed(hass, now + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert len(updates) == 2
+
+
+async def test_polling_overrun_warning_rate_limited(hass, caplog):
+    """Test the overrun warning is logged once per warning interval."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    release = asyncio.Event()
+
+    async def async_update():
+        await release.wait()
+
+    entity = MockEntity(should_poll=True)
+    entity.async_update = async_update
+    await component.async_add_entities([entity])
+    platform = component._platforms[DOMAIN]
+
+    now = dt_util.utcnow()
+    for seconds in (20, 40, 60, 80):
+        async_fire_time_changed(hass, now + timedelta(seconds=seconds))
+        await asyncio.sleep(0)
+
+    assert platform.poll_statistics.overruns == 3
+    assert caplog.text.count("took longer than the scheduled update interval") == 1
+
+    release.set()
+    await hass.async_block_till_done()
+
+
+async def test_polling_adapts_interval_of_slow_entities(hass):
+    """Test entities slower than the interval are polled less often."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    entity = MockEntity(should_poll=True)
+    entity.async_update = Mock()
+    await component.async_add_entities([entity])
+    platform = component._platforms[DOMAIN]
+    entity.async_update.reset_mock()
+    now = dt_util.utcnow()
+
+    # Every update takes 45 seconds, so the entity is polled every 3 intervals
+    with patch(
+        "homeassistant.helpers.entity_platform.monotonic",
+        side_effect=itertools.count(0, 45),
+    ):
+        for seconds in (20, 40, 60, 80, 100):
+            async_fire_time_changed(hass, now + timedelta(seconds=seconds))
+            await hass.async_block_till_done()
+
+    # Polled at 20 and 40, skipped at 60 and 80, polled at 100
+    assert entity.async_update.call_count == 3
+    assert platform.poll_statistics.skipped == 2
+    assert platform.poll_statistics.overruns == 0
+
+    # Skipped at 120 and 140, the fast update at 160 restores the interval
+    for seconds in (120, 140, 160, 180):
+        async_fire_time_changed(hass, now + timedelta(seconds=seconds))
+        await hass.async_block_till_done()
+    assert entity.async_update.call_count == 5
+
+
+async def test_reset_cancels_polling(hass):
+    """Test resetting a platform cancels the running polls."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    started = asyncio.Event()
+    cancelled = []
+
+    async def async_update():
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    entity = MockEntity(should_poll=True)
+    entity.async_update = async_update
+    await component.async_add_entities([entity])
+    platform = component._platforms[DOMAIN]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await started.wait()
+
+    await platform.async_reset()
+    assert cancelled == [1]
+    assert not platform._polling
+    assert not platform.entities
+
+
 async def test_polling_updates_entities_with_exception(hass):
     """Test the updated entities that not break with an exception."""
     component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
@@ -152,6 +310,11 @@ async def test_set_scan_interval_via_platform(mock_track, hass):
 
     component.setup({DOMAIN: {"platform": "platform"}})
 
+    await hass.async_block_till_done()
+    assert not mock_track.called
+
+    # The interval starts with the first poll
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
     await hass.async_block_till_done()
     assert mock_track.called
     assert timedelta(seconds=30) == mock_track.call_args[0][2]
@@ -941,6 +1104,89 @@ async def test_invalid_entity_id(hass):
     assert entity.platform is None
 
 
+async def test_invalid_entity_id_does_not_block_batch(hass):
+    """Test an invalid entity id does not prevent adding the rest of a batch."""
+    platform = MockEntityPlatform(hass)
+    invalid = MockEntity(entity_id="invalid_entity_id")
+    valid = MockEntity(name="valid")
+    with pytest.raises(HomeAssistantError):
+        await platform.async_add_entities([invalid, valid])
+    assert invalid.hass is None
+    assert hass.states.get("test_domain.valid") is not None
+
+
+async def test_slow_update_before_add_does_not_block_batch(hass):
+    """Test entities of a batch are added as soon as their own update is done."""
+    platform = MockEntityPlatform(hass)
+    release = asyncio.Event()
+
+    async def async_update():
+        await release.wait()
+
+    slow = MockEntity(name="slow")
+    slow.async_update = async_update
+    fast = MockEntity(name="fast")
+    fast.async_update = Mock()
+
+    add_task = hass.async_create_task(
+        platform.async_add_entities([slow, fast], update_before_add=True)
+    )
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert hass.states.get("test_domain.fast") is not None
+    assert hass.states.get("test_domain.slow") is None
+
+    release.set()
+    await add_task
+    assert hass.states.get("test_domain.slow") is not None
+
+
+async def test_add_entities_bulk_shares_device_lookup(hass):
+    """Test entities of the same device in a batch look up the device once."""
+    registry = await hass.helpers.device_registry.async_get_registry()
+    device_info = {"identifiers": {("hue", "1234")}, "name": "Hue bridge"}
+
+    async def async_setup_entry(hass, config_entry, async_add_entities):
+        """Mock setup entry method."""
+        async_add_entities(
+            [
+                MockEntity(unique_id=f"sensor_{idx}", device_info=dict(device_info))
+                for idx in range(5)
+            ]
+            + [
+                MockEntity(
+                    unique_id="other",
+                    device_info={"identifiers": {("hue", "5678")}},
+                )
+            ]
+        )
+        return True
+
+    platform = MockPlatform(async_setup_entry=async_setup_entry)
+    config_entry = MockConfigEntry(entry_id="super-mock-id")
+    mock_entity_platform = MockEntityPlatform(
+        hass, platform_name=config_entry.domain, platform=platform
+    )
+
+    with patch.object(
+        registry, "async_get_or_create", wraps=registry.async_get_or_create
+    ) as mock_get_or_create:
+        assert await mock_entity_platform.async_setup_entry(config_entry)
+        await hass.async_block_till_done()
+
+    assert len(mock_get_or_create.mock_calls) == 2
+    assert len(hass.states.async_entity_ids()) == 6
+
+    device = registry.async_get_device({("hue", "1234")})
+    entity_reg = await hass.helpers.entity_registry.async_get_registry()
+    assert {
+        entry.unique_id
+        for entry in entity_reg.entities.values()
+        if entry.device_id == device.id
+    } == {f"sensor_{idx}" for idx in range(5)}
+
+
 class MockBlockingEntity(MockEntity):
     """Class to mock an entity that will block adding entities."""
 
@@ -350,6 +350,43 @@ async def test_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_for_indexes_follow_updates(hass, registry):
+    """Test entries by device, area and config entry follow registry changes."""
+    mock_config = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    entry = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=mock_config, device_id="device-1"
+    )
+    other = registry.async_get_or_create("light", "hue", "1234", device_id="device-1")
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry,
+        other,
+    ]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry
+    ]
+    assert entity_registry.async_entries_for_area(registry, "area-1") == []
+
+    entry = registry.async_update_entity(
+        entry.entity_id, area_id="area-1", new_entity_id="light.renamed"
+    )
+    other = registry.async_get_or_create("light", "hue", "1234", device_id="device-2")
+
+    assert entity_registry.async_entries_for_area(registry, "area-1") == [entry]
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [entry]
+    assert entity_registry.async_entries_for_device(registry, "device-2") == [other]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry
+    ]
+
+    registry.async_clear_area_id("area-1")
+    assert entity_registry.async_entries_for_area(registry, "area-1") == []
+
+    registry.async_remove(entry.entity_id)
+    assert entity_registry.async_entries_for_device(registry, "device-1") == []
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == []
+
+
 @pytest.mark.parametrize("load_registries", [False])
 async def test_migration(hass):
     """Test migration from old data to new."""
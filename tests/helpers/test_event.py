@@ -15,6 +15,8 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_STATE_CHANGE_CALLBACKS,
+    TRACK_STATE_CHANGE_DOMAIN_CALLBACKS,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
@@ -289,6 +291,48 @@ async def test_track_state_change(hass):
     assert len(wildercard_runs) == 6
 
 
+async def test_async_track_state_change_filtered_indexes(hass):
+    """Test async_track_state_change_filtered updates the indexes incrementally."""
+    events = []
+
+    track = async_track_state_change_filtered(
+        hass,
+        TrackStates(False, {"light.bowl", "switch.one"}, {"switch"}),
+        callback(lambda event: events.append(event.data["entity_id"])),
+    )
+    entity_callbacks = hass.data[TRACK_STATE_CHANGE_CALLBACKS]
+    domain_callbacks = hass.data[TRACK_STATE_CHANGE_DOMAIN_CALLBACKS]
+    # switch.one is routed by its domain
+    assert set(entity_callbacks) == {"light.bowl"}
+    assert set(domain_callbacks) == {"switch"}
+    light_job = entity_callbacks["light.bowl"][0]
+
+    hass.states.async_set("switch.one", "on")
+    hass.states.async_set("switch.two", "on")
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.other", "on")
+    await hass.async_block_till_done()
+    assert events == ["switch.one", "switch.two", "light.bowl"]
+
+    track.async_update_listeners(
+        TrackStates(False, {"light.bowl", "light.other"}, {"switch"})
+    )
+    assert set(entity_callbacks) == {"light.bowl", "light.other"}
+    assert entity_callbacks["light.bowl"] == [light_job]
+
+    track.async_update_listeners(TrackStates(True, set(), set()))
+    assert not entity_callbacks
+    assert set(domain_callbacks) == {MATCH_ALL}
+
+    events.clear()
+    hass.states.async_set("light.other", "off")
+    await hass.async_block_till_done()
+    assert events == ["light.other"]
+
+    track.async_remove()
+    assert not domain_callbacks
+
+
 async def test_async_track_state_change_filtered(hass):
     """Test async_track_state_change_filtered."""
     single_entity_id_tracker = []
@@ -2421,6 +2465,49 @@ async def test_track_time_interval(hass):
     assert len(specific_runs) == 2
 
 
+async def test_time_listeners_share_loop_timer(hass):
+    """Test time listeners due at the same time are dispatched as a batch."""
+    specific_runs = []
+    now = dt_util.utcnow()
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    def scheduled_handles():
+        return [handle for handle in hass.loop._scheduled if not handle.cancelled()]
+
+    handles_before = len(scheduled_handles())
+
+    @callback
+    def remove_second(now):
+        specific_runs.append("first")
+        unsub_second()
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ):
+        unsub_first = async_track_utc_time_change(hass, remove_second, second=0)
+        unsub_second = async_track_utc_time_change(
+            hass, callback(lambda x: specific_runs.append("second")), second=0
+        )
+        unsub_interval = async_track_time_interval(
+            hass, callback(lambda x: specific_runs.append("interval")), timedelta(1)
+        )
+
+    assert len(scheduled_handles()) == handles_before + 1
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    # The second listener was removed by the first one in the same batch
+    assert specific_runs == ["first"]
+
+    unsub_first()
+    unsub_interval()
+    assert len(scheduled_handles()) == handles_before
+
+
 async def test_track_sunrise(hass, legacy_patchable_time):
     """Test track the sunrise."""
     latitude = 32.87336
@@ -0,0 +1,66 @@
+"""Test the group helper."""
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.helpers import group
+
+
+async def test_expand_entity_ids_nested_groups(hass):
+    """Test nested groups are flattened in order without duplicates."""
+    hass.states.async_set(
+        "group.inner", "on", {ATTR_ENTITY_ID: ["light.kitchen", "light.bowl"]}
+    )
+    hass.states.async_set(
+        "group.outer",
+        "on",
+        {ATTR_ENTITY_ID: ["switch.ac", "group.inner", "light.bowl", "group.missing"]},
+    )
+
+    assert group.expand_entity_ids(hass, ["light.Bowl", "group.outer"]) == [
+        "light.bowl",
+        "switch.ac",
+        "light.kitchen",
+    ]
+
+
+async def test_expand_entity_ids_group_cycle(hass):
+    """Test groups containing each other are expanded once."""
+    hass.states.async_set(
+        "group.first", "on", {ATTR_ENTITY_ID: ["light.first", "group.second"]}
+    )
+    hass.states.async_set(
+        "group.second", "on", {ATTR_ENTITY_ID: ["group.first", "light.second"]}
+    )
+
+    assert group.expand_entity_ids(hass, ["group.first"]) == [
+        "light.first",
+        "light.second",
+    ]
+
+
+async def test_get_group_members_follows_membership_changes(hass):
+    """Test cached members are refreshed when a nested group changes."""
+    inner_members = ["light.kitchen"]
+    hass.states.async_set("group.inner", "on", {ATTR_ENTITY_ID: inner_members})
+    hass.states.async_set("group.outer", "on", {ATTR_ENTITY_ID: ["group.inner"]})
+
+    assert group.get_group_members(hass, "group.outer") == ("light.kitchen",)
+
+    # A state change that keeps the membership keeps the cache entry
+    hass.states.async_set("group.inner", "off", {ATTR_ENTITY_ID: inner_members})
+    cached = hass.data[group.DATA_GROUP_MEMBERS]["group.outer"]
+    assert group.get_group_members(hass, "group.outer") == ("light.kitchen",)
+    assert hass.data[group.DATA_GROUP_MEMBERS]["group.outer"] is cached
+
+    # Changes to a nested group are visible without waiting for the event
+    hass.states.async_set(
+        "group.inner", "off", {ATTR_ENTITY_ID: ["light.kitchen", "light.bowl"]}
+    )
+    assert group.get_group_members(hass, "group.outer") == (
+        "light.kitchen",
+        "light.bowl",
+    )
+
+    hass.states.async_remove("group.inner")
+    assert group.get_group_members(hass, "group.outer") == ()
+
+    hass.states.async_set("group.inner", "on", {ATTR_ENTITY_ID: ["light.porch"]})
+    assert group.get_group_members(hass, "group.outer") == ("light.porch",)
@@ -2,7 +2,7 @@
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_array
 from homeassistant.util import dt as dt_util
 
 
@@ -19,3 +19,9 @@ def test_json_encoder(hass):
 
     now = dt_util.utcnow()
     assert ha_json_enc.default(now) == now.isoformat()
+
+
+def test_json_array():
+    """Test joining encoded JSON values into an array."""
+    assert json_array([]) == "[]"
+    assert json_array(['{"a":1}', "2", '"b"']) == '[{"a":1},2,"b"]'
@@ -600,6 +600,28 @@ async def test_call_no_context_target_specific(
     assert mock_handle_entity_call.mock_calls[0][1][1].entity_id == "light.kitchen"
 
 
+async def test_call_no_context_target_specific_order(
+    hass, mock_handle_entity_call, mock_entities
+):
+    """Check targeted entities are called in a stable order."""
+    await service.entity_service_call(
+        hass,
+        [Mock(entities=mock_entities)],
+        Mock(),
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.living_room", "light.bathroom", "light.kitchen"]},
+        ),
+    )
+
+    assert [call[1][1].entity_id for call in mock_handle_entity_call.mock_calls] == [
+        "light.bathroom",
+        "light.kitchen",
+        "light.living_room",
+    ]
+
+
 async def test_call_with_match_all(
     hass, mock_handle_entity_call, mock_entities, caplog
 ):
@@ -2,6 +2,7 @@
 import asyncio
 from datetime import timedelta
 import json
+import os
 from unittest.mock import Mock, patch
 
 import pytest
@@ -11,8 +12,8 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
 )
 from homeassistant.core import CoreState
-from homeassistant.helpers import storage
-from homeassistant.util import dt
+from homeassistant.helpers import json as json_helper, storage
+from homeassistant.util import dt, json as json_util
 
 from tests.common import async_fire_time_changed
 
@@ -21,6 +22,9 @@ MOCK_KEY = "storage-test"
 MOCK_DATA = {"hello": "world"}
 MOCK_DATA2 = {"goodbye": "cruel world"}
 
+# Captured before the storage mock replaces it
+ORIGINAL_WRITE_DATA = storage.Store._write_data
+
 
 @pytest.fixture
 def store(hass):
@@ -279,3 +283,144 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+def _journal_lines(path):
+    """Return the records of a journal."""
+    with open(f"{path}{storage.JOURNAL_SUFFIX}") as fdesc:
+        return [json.loads(line) for line in fdesc.read().splitlines()[1:]]
+
+
+def test_journal_write_and_load(hass, tmp_path):
+    """Test changes are appended to the journal and replayed on load."""
+    path = str(tmp_path / MOCK_KEY)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+    items = [{"id": idx, "name": f"item {idx}"} for idx in range(20)]
+    data = {"version": MOCK_VERSION, "key": MOCK_KEY, "data": {"items": items}}
+
+    store._write_journal_data(path, data)
+    assert not os.path.exists(f"{path}{storage.JOURNAL_SUFFIX}")
+    with open(path) as fdesc:
+        written = fdesc.read()
+    # The file is written like a store without journal
+    assert written == json.dumps(data, indent=4)
+
+    items[5]["name"] = "renamed"
+    del items[10]
+    store._write_journal_data(path, data)
+    items.append({"id": 20, "name": "item 20"})
+    data["data"]["extra"] = "value"
+    store._write_journal_data(path, data)
+    # Nothing changed
+    store._write_journal_data(path, data)
+
+    with open(path) as fdesc:
+        assert fdesc.read() == written
+    assert _journal_lines(path) == [
+        [
+            {
+                "op": "splice",
+                "key": "items",
+                "index": 5,
+                "delete": 6,
+                "items": items[5:10],
+            }
+        ],
+        [
+            {
+                "op": "splice",
+                "key": "items",
+                "index": 19,
+                "delete": 0,
+                "items": [{"id": 20, "name": "item 20"}],
+            },
+            {"op": "set", "key": "extra", "value": "value"},
+        ],
+    ]
+
+    del data["data"]["extra"]
+    store._write_journal_data(path, data)
+    assert _journal_lines(path)[-1] == [{"op": "remove", "key": "extra"}]
+
+    assert store._load_data(path)["data"] == {"items": items}
+
+
+def test_journal_changes_encode_changed_values(hass, tmp_path):
+    """Test only the changed values are encoded when appending to the journal."""
+    path = str(tmp_path / MOCK_KEY)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+    items = [{"id": idx} for idx in range(20)]
+    data = {"version": MOCK_VERSION, "key": MOCK_KEY, "data": {"items": items}}
+    store._write_journal_data(path, data)
+
+    items[3]["id"] = "changed"
+    with patch(
+        "homeassistant.helpers.json.json_dumps", wraps=json_helper.json_dumps
+    ) as json_dumps:
+        store._write_journal_data(path, data)
+
+    assert json_dumps.call_count == 1
+    assert store._load_data(path)["data"] == {"items": items}
+
+
+def test_journal_compacted_when_larger_than_file(hass, tmp_path):
+    """Test the journal is folded into the file when it outgrows it."""
+    path = str(tmp_path / MOCK_KEY)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+    data = {"version": MOCK_VERSION, "key": MOCK_KEY, "data": {"value": 0}}
+
+    for value in range(20):
+        data["data"]["value"] = value
+        store._write_journal_data(path, data)
+
+        journal_path = f"{path}{storage.JOURNAL_SUFFIX}"
+        if os.path.exists(journal_path):
+            assert os.path.getsize(journal_path) <= os.path.getsize(path)
+
+        assert store._load_data(path)["data"] == {"value": value}
+
+
+def test_journal_ignored_when_stale_or_incomplete(hass, tmp_path, caplog):
+    """Test stale journals and interrupted records are not replayed."""
+    path = str(tmp_path / MOCK_KEY)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+    items = list(range(50))
+    data = {"version": MOCK_VERSION, "key": MOCK_KEY, "data": {"items": items}}
+
+    store._write_journal_data(path, data)
+    items.append(50)
+    store._write_journal_data(path, data)
+
+    with open(f"{path}{storage.JOURNAL_SUFFIX}", "a") as fdesc:
+        fdesc.write('[{"op":"splice","key":"items"')
+
+    assert store._load_data(path)["data"] == {"items": list(range(51))}
+    assert "Ignoring incomplete record" in caplog.text
+
+    # Interrupted after replacing the file but before removing the journal
+    with open(f"{path}{storage.JOURNAL_SUFFIX}") as fdesc:
+        journal = fdesc.read()
+    store._journal_compact = True
+    store._write_journal_data(path, {**data, "data": {"items": []}})
+    with open(f"{path}{storage.JOURNAL_SUFFIX}", "w") as fdesc:
+        fdesc.write(journal)
+
+    assert store._load_data(path)["data"] == {"items": []}
+
+
+async def test_journal_compacted_on_final_write(hass, tmp_path):
+    """Test the journal is folded into the file when we quit Home Assistant."""
+    hass.config.config_dir = str(tmp_path)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+
+    with patch.object(storage.Store, "_write_data", ORIGINAL_WRITE_DATA):
+        await store.async_save({"items": list(range(50))})
+        await store.async_save({"items": list(range(51))})
+        assert os.path.exists(store.journal_path)
+
+        hass.state = CoreState.final_write
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+
+    assert not os.path.exists(store.journal_path)
+    assert json_util.load_json(store.path)["data"] == {"items": list(range(51))}
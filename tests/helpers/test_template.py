@@ -12,12 +12,15 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
     LENGTH_METERS,
     MASS_GRAMS,
     PRESSURE_PA,
     TEMP_CELSIUS,
     VOLUME_LITERS,
 )
+from homeassistant.core import CoreState
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import template
 from homeassistant.setup import async_setup_component
@@ -1065,6 +1068,113 @@ def test_regex_replace(hass):
     assert tpl.async_render() == ["Home Assistant test"]
 
 
+def test_filter_caches(hass):
+    """Test regex and strptime filters use the filter caches."""
+    tpl = template.Template(
+        "{{ flight | regex_findall_index('([A-Z]{3}) to') }}"
+        "{{ strptime(departure, '%Y-%m-%d %H:%M:%S').year }}",
+        hass,
+    )
+    variables = {
+        "flight": "Flight from JFK to LHR",
+        "departure": "2016-10-19 15:22:05",
+    }
+    assert tpl.async_render(variables) == "JFK2016"
+    before = template.filter_cache_info()
+
+    assert tpl.async_render(variables) == "JFK2016"
+    after = template.filter_cache_info()
+
+    assert after["regex"].hits == before["regex"].hits + 1
+    assert after["regex"].misses == before["regex"].misses
+    assert after["strptime"].hits == before["strptime"].hits + 1
+    assert after["regex"].maxsize == template.FILTER_CACHE_SIZE
+
+
+def test_filter_caches_shared_between_environments(hass):
+    """Test the filter caches are shared by all environments."""
+    source = "{{ 'JFK to LHR' | regex_findall_index('([A-Z]{3}) to ') }}"
+    assert template.Template(source, hass).async_render() == "JFK"
+    before = template.filter_cache_info()
+
+    # The limited environment and environments without hass
+    # hit the entry added by the default environment
+    for env in (
+        template.TemplateEnvironment(hass, limited=True),
+        template._NO_HASS_ENV,
+    ):
+        assert env.from_string(source).render() == "JFK"
+    after = template.filter_cache_info()
+
+    assert after["regex"].hits == before["regex"].hits + 2
+    assert after["regex"].misses == before["regex"].misses
+
+
+async def test_bytecode_cache_reused(hass, caplog):
+    """Test templates compiled while starting are reused by new environments."""
+    source = "{{ value | multiply(2) }} {{ states('sensor.bytecode') }}"
+    hass.state = CoreState.starting
+    template.async_setup_bytecode_cache(hass)
+    bytecode_cache = hass.data[template.DATA_BYTECODE_CACHE]
+    assert template.Template(source, hass).async_render({"value": 2}) == "4.0 unknown"
+    assert bytecode_cache.misses == 1
+
+    hass.state = CoreState.running
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+    assert "Compiled 1 templates" in caplog.text
+
+    # Start over with a fresh environment like a reload would
+    hass.data.pop("template.environment")
+
+    with patch.object(template.ImmutableSandboxedEnvironment, "compile") as compile:
+        assert (
+            template.Template(source, hass).async_render({"value": 3}) == "6.0 unknown"
+        )
+
+    assert not compile.called
+    assert bytecode_cache.hits == 1
+    assert bytecode_cache.misses == 1
+    assert bytecode_cache.saved_time == bytecode_cache.compile_time
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert template.DATA_BYTECODE_CACHE not in hass.data
+
+
+async def test_bytecode_cache_scoped_to_environment(hass):
+    """Test the limited environment does not reuse code of the default one."""
+    source = "{{ states('sensor.bytecode') }}"
+    hass.state = CoreState.starting
+    template.async_setup_bytecode_cache(hass)
+    bytecode_cache = hass.data[template.DATA_BYTECODE_CACHE]
+
+    assert template.Template(source, hass).async_render() == "unknown"
+    assert bytecode_cache.misses == 1
+
+    template.TemplateEnvironment(hass, limited=True).compile(source)
+    assert bytecode_cache.hits == 0
+    assert bytecode_cache.misses == 2
+
+    # Environments without hass do not use the cache
+    template.Template("{{ 1 + 1 }}").ensure_valid()
+    assert bytecode_cache.misses == 2
+
+
+async def test_bytecode_cache_skips_templates_after_start(hass):
+    """Test templates rendered after startup are not kept."""
+    template.async_setup_bytecode_cache(hass)
+    bytecode_cache = hass.data[template.DATA_BYTECODE_CACHE]
+
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert bytecode_cache.misses == 1
+
+    hass.data.pop("template.environment")
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert bytecode_cache.hits == 0
+    assert bytecode_cache.misses == 2
+
+
 def test_regex_findall_index(hass):
     """Test regex_findall_index method."""
     tpl = template.Template(
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -360,6 +361,18 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State as JSON."""
+    state = ha.State("happy.happy", "on", {"pig": "dog"})
+    assert json.loads(state.as_json()) == state.as_dict()
+    # 2nd time to verify cache
+    assert state.as_json() is state.as_json()
+
+    state = ha.State("happy.happy", "on", {"pig": float("NaN")})
+    with pytest.raises(ValueError):
+        state.as_json()
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -432,6 +445,50 @@ async def test_eventbus_unsubscribe_listener(hass):
     assert len(calls) == 1
 
 
+async def test_eventbus_listeners_changed_after_fire(hass):
+    """Test listeners added or removed after an event type was fired."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("test", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        """Mock MATCH_ALL listener."""
+        calls.append((MATCH_ALL, event.event_type))
+
+    hass.bus.async_fire("test")
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert calls == []
+    # Event types without listeners are not cached
+    assert "test" not in hass.bus._dispatch
+
+    unsub = hass.bus.async_listen("test", listener)
+    unsub_match_all = hass.bus.async_listen(MATCH_ALL, match_all_listener)
+
+    hass.bus.async_fire("test")
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert calls == [(MATCH_ALL, "test"), ("test", "test")]
+
+    calls.clear()
+    unsub_match_all()
+
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert calls == [("test", "test")]
+
+    calls.clear()
+    unsub()
+
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert calls == []
+
+
 async def test_eventbus_listen_once_event_with_callback(hass):
     """Test listen_once_event method."""
     runs = []
@@ -538,6 +595,10 @@ def test_state_domain():
     state = ha.State("some_domain.hello", "world")
     assert state.domain == "some_domain"
 
+    # The domain string is shared between states
+    other_state = ha.State("some_domain.other", "world")
+    assert other_state.domain is state.domain
+
 
 def test_state_object_id():
     """Test object ID."""
@@ -690,6 +751,31 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_attributes_change_detection(hass):
+    """Test state changes are detected with and without attributes."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.bowl", "on", {})
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    hass.states.async_set("light.bowl", "off")
+    await hass.async_block_till_done()
+
+    assert [
+        (event.data["new_state"].state, dict(event.data["new_state"].attributes))
+        for event in events
+    ] == [
+        ("on", {}),
+        ("on", {"brightness": 100}),
+        ("off", {"brightness": 100}),
+        ("off", {}),
+    ]
+    assert events[0].data["new_state"].attributes is ha.EMPTY_ATTRIBUTES
+    assert events[3].data["new_state"].attributes is ha.EMPTY_ATTRIBUTES
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -112,6 +112,23 @@ def test_custom_encoder():
     assert data == "9"
 
 
+def test_save_compact():
+    """Test saving compact files."""
+    fname = _path_for("test7")
+    data = {"state": State("light.kitchen", "on"), "members": {"a"}, "nan": math.nan}
+    save_json(fname, data, compact=True)
+
+    with open(fname) as fdesc:
+        written = fdesc.read()
+    assert "\n" not in written
+    assert ", " not in written
+
+    data = load_json(fname)
+    assert data["state"]["entity_id"] == "light.kitchen"
+    assert data["members"] == ["a"]
+    assert math.isnan(data["nan"])
+
+
 def test_find_unserializable_data():
     """Find unserializeable data."""
     assert find_paths_unserializable_data(1) == {}
@@ -0,0 +1,101 @@
+"""Test the JSON encoder utilities."""
+from dataclasses import dataclass
+from datetime import date, time
+from enum import Enum
+import json
+import math
+from unittest.mock import patch
+import uuid
+
+import pytest
+
+from homeassistant import core
+from homeassistant.util import dt as dt_util, json_encoder
+
+BACKENDS = [json_encoder.orjson, None]
+
+
+class Color(Enum):
+    """Enum for testing."""
+
+    RED = "red"
+
+
+@dataclass
+class Point:
+    """Dataclass for testing."""
+
+    x: int
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_json_bytes(backend):
+    """Test both backends encode Home Assistant objects the same way."""
+    now = dt_util.utcnow()
+    data = {
+        "state": core.State("test.test", "hello", {"members": {"a"}}),
+        "now": now,
+        "unicode": "°C",
+        "none": None,
+        1: 2 ** 70,
+    }
+
+    with patch("homeassistant.util.json_encoder.orjson", backend):
+        encoded = json_encoder.json_bytes(data)
+        assert json_encoder.json_dumps(data) == encoded.decode("utf-8")
+
+    assert json.loads(encoded) == json.loads(
+        json.dumps(data, cls=json_encoder.JSONEncoder)
+    )
+    assert b", " not in encoded
+
+    with patch("homeassistant.util.json_encoder.orjson", backend), pytest.raises(
+        json_encoder.JSON_ENCODE_EXCEPTIONS
+    ):
+        json_encoder.json_bytes({"hello": object()})
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("value", [math.nan, math.inf, -math.inf])
+def test_json_bytes_non_finite(backend, value):
+    """Test both backends reject NaN and infinity unless allowed."""
+    data = [
+        {"none": None},
+        core.State("test.test", "on", {"nested": {"value": value}}),
+    ]
+
+    with patch("homeassistant.util.json_encoder.orjson", backend):
+        with pytest.raises(ValueError):
+            json_encoder.json_bytes(data)
+
+        assert json_encoder.json_bytes(value, allow_nan=True) == json.dumps(
+            value
+        ).encode("utf-8")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_json_bytes_types(backend):
+    """Test both backends accept and encode the same types."""
+    now = dt_util.now()
+    identifier = uuid.uuid4()
+    data = {
+        "datetime": now,
+        "naive": now.replace(tzinfo=None),
+        "date": now.date(),
+        "time": time(12, 30, 5, 123),
+        "uuid": identifier,
+        "enum": Color.RED,
+    }
+
+    with patch("homeassistant.util.json_encoder.orjson", backend):
+        assert json.loads(json_encoder.json_bytes(data)) == {
+            "datetime": now.isoformat(),
+            "naive": now.replace(tzinfo=None).isoformat(),
+            "date": date.isoformat(now.date()),
+            "time": "12:30:05.000123",
+            "uuid": str(identifier),
+            "enum": "red",
+        }
+
+        with pytest.raises(json_encoder.JSON_ENCODE_EXCEPTIONS):
+            json_encoder.json_bytes({"point": Point(1)})